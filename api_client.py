@@ -4,32 +4,91 @@ Comprehensive API Client - Complete Cricket Statistics Database Population
 This script will recreate the entire database with all current data from scratch.
 """
 
+import argparse
 import mysql.connector
 import requests
 import json
 import time
+import random
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing
 from datetime import datetime, timedelta
 from config import DB_CONFIG, RAPIDAPI_KEY, RAPIDAPI_HOST
+from table_versions import ALL_TABLES, ensure_table_versions, bump_table_versions
+from materialize import SUMMARY_TABLES, ensure_summary_tables, refresh_summaries
+from migrate import migrate_up
+from batch_writer import BatchWriter
+from sync_state import (SCORECARDS, TOSS, SERIES, ensure_sync_state, synced_items, mark_synced,
+                        clear_sync_state)
+from response_archive import DEFAULT_ARCHIVE_DIR, ResponseArchive
+
+try:
+    from config import API_CLIENT_CONFIG
+except ImportError:
+    API_CLIENT_CONFIG = {}
 
 class ComprehensiveAPIClient:
-    def __init__(self):
+    def __init__(self, max_workers=None, replay=None, as_of=None, archive_dir=None):
         self.connection = None
         self.cursor = None
         self.api_calls_made = 0
         self.api_limit = 200  # Current API key limit
+        self.max_workers = max_workers or API_CLIENT_CONFIG.get('max_workers', 4)  # Concurrent API requests
+        self._calls_lock = threading.Lock()
+        self.max_retries = API_CLIENT_CONFIG.get('max_retries', 3)  # Retries of a 429 (rate limited) response
+        self.backoff_base = API_CLIENT_CONFIG.get('backoff_base', 1.0)  # Seconds; doubles per retry
+        self._fetch_executor = None
+        self._response_memo = {}  # (endpoint, params) -> Future of the response, for the current run
+        self.memo_hits = 0  # Calls answered from _response_memo instead of the API
+        # Raw responses are archived on disk only when an archive_dir is configured;
+        # in replay mode they are served from the archive instead of the API
+        self.replay = API_CLIENT_CONFIG.get('replay', False) if replay is None else replay
+        self.replay_as_of = as_of  # ISO time: replay the responses fetched at or before it
+        archive_dir = archive_dir or API_CLIENT_CONFIG.get('archive_dir')
+        if self.replay and not archive_dir:
+            archive_dir = DEFAULT_ARCHIVE_DIR
+        self.archive = ResponseArchive(archive_dir) if archive_dir else None
+        # Upserts are buffered and sent with executemany; flushed on every commit()
+        self.writer = BatchWriter(batch_size=API_CLIENT_CONFIG.get('batch_size', 500))
+        self.modified_tables = set()  # Written since the last commit (see commit())
+        self.dirty_matches = set()  # Matches whose scorecards/dates changed since the last commit
+        self.incremental = False  # Skip what sync_state says an earlier run already fetched
         
     def connect_database(self):
         """Connect to MySQL database"""
         try:
             self.connection = mysql.connector.connect(**DB_CONFIG)
             self.cursor = self.connection.cursor()
+            self.writer.cursor = self.cursor
+            ensure_table_versions(self.cursor)
+            ensure_summary_tables(self.cursor)
+            ensure_sync_state(self.cursor)
             print("Database connected successfully")
         except Exception as e:
             print(f"Database connection failed: {str(e)}")
             raise
     
-    def setup_database_tables(self):
-        """Create all required database tables"""
+    def flush_writes(self, table):
+        """Flush the buffered writes; returns the keys (first column) of table's rows that failed"""
+        return [params[0] for failed_table, params in self.writer.flush() if failed_table == table]
+    
+    def commit(self, *tables):
+        """Commit, refreshing the summaries of dirty matches and bumping table_versions for the tables written"""
+        self.writer.flush()
+        self.modified_tables.update(tables)
+        if self.dirty_matches:
+            players = refresh_summaries(self.cursor, self.dirty_matches)
+            print(f"Refreshed batting summaries for {players} players")
+            self.modified_tables.update(SUMMARY_TABLES)
+            self.dirty_matches.clear()
+        bump_table_versions(self.cursor, self.modified_tables)
+        self.connection.commit()
+        self.modified_tables.clear()
+    
+    def setup_database_tables(self, incremental=False):
+        """Create all required database tables (incremental keeps existing tables and their data)"""
         print("SETTING UP DATABASE TABLES")
         print("=" * 60)
         
@@ -37,9 +96,9 @@ class ComprehensiveAPIClient:
         self.cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
         
         # Drop existing tables if they exist
-        tables_to_drop = [
+        tables_to_drop = [] if incremental else [
             'match_scorecards', 'player_stats', 'matches', 'series', 
-            'players', 'teams', 'venues'
+            'players', 'teams', 'venues', *SUMMARY_TABLES
         ]
         
         for table in tables_to_drop:
@@ -51,7 +110,7 @@ class ComprehensiveAPIClient:
         
         # Create teams table
         self.cursor.execute("""
-            CREATE TABLE teams (
+            CREATE TABLE IF NOT EXISTS teams (
                 team_id INT PRIMARY KEY,
                 name VARCHAR(255) NOT NULL,
                 short_name VARCHAR(50),
@@ -65,7 +124,7 @@ class ComprehensiveAPIClient:
         
         # Create venues table
         self.cursor.execute("""
-            CREATE TABLE venues (
+            CREATE TABLE IF NOT EXISTS venues (
                 venue_id INT PRIMARY KEY,
                 name VARCHAR(255) NOT NULL,
                 city VARCHAR(100),
@@ -79,7 +138,7 @@ class ComprehensiveAPIClient:
         
         # Create players table
         self.cursor.execute("""
-            CREATE TABLE players (
+            CREATE TABLE IF NOT EXISTS players (
                 player_id INT PRIMARY KEY,
                 name VARCHAR(255) NOT NULL,
                 team_id INT,
@@ -95,7 +154,7 @@ class ComprehensiveAPIClient:
         
         # Create series table
         self.cursor.execute("""
-            CREATE TABLE series (
+            CREATE TABLE IF NOT EXISTS series (
                 series_id INT PRIMARY KEY,
                 name VARCHAR(500) NOT NULL,
                 host_country VARCHAR(100),
@@ -110,7 +169,7 @@ class ComprehensiveAPIClient:
         
         # Create matches table
         self.cursor.execute("""
-            CREATE TABLE matches (
+            CREATE TABLE IF NOT EXISTS matches (
                 match_id INT PRIMARY KEY,
                 series_id INT,
                 match_desc VARCHAR(255),
@@ -139,7 +198,7 @@ class ComprehensiveAPIClient:
         
         # Create player_stats table
         self.cursor.execute("""
-            CREATE TABLE player_stats (
+            CREATE TABLE IF NOT EXISTS player_stats (
                 stat_id INT AUTO_INCREMENT PRIMARY KEY,
                 player_id INT,
                 format VARCHAR(20),
@@ -162,7 +221,7 @@ class ComprehensiveAPIClient:
         
         # Create match_scorecards table
         self.cursor.execute("""
-            CREATE TABLE match_scorecards (
+            CREATE TABLE IF NOT EXISTS match_scorecards (
                 scorecard_id INT AUTO_INCREMENT PRIMARY KEY,
                 match_id INT,
                 innings_id INT,
@@ -184,15 +243,89 @@ class ComprehensiveAPIClient:
         """)
         print("Created table: match_scorecards")
         
+        # Create materialized summary tables (filled as scorecards are written)
+        ensure_summary_tables(self.cursor)
+        print("Created summary tables: " + ", ".join(SUMMARY_TABLES))
+        
         # Re-enable foreign key checks
         self.cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
         
-        self.connection.commit()
+        if incremental:
+            self.commit()
+            print("All database tables present")
+            migrate_up(self.cursor)
+            self.connection.commit()
+            return
+        
+        # Watermarks describe the dropped data
+        clear_sync_state(self.cursor)
+        self.commit(ALL_TABLES)
         print("All database tables created successfully")
+        
+        # The recreated tables have lost the migration indexes
+        migrate_up(self.cursor, reset=True)
+        self.connection.commit()
+    
+    def _reserve_call(self):
+        """Count one call against api_limit; False if the limit is reached (thread-safe)"""
+        with self._calls_lock:
+            if self.api_calls_made >= self.api_limit:
+                return False
+            self.api_calls_made += 1
+            return True
+    
+    def _release_call(self):
+        """Give back a reserved call whose request never reached the API"""
+        with self._calls_lock:
+            self.api_calls_made -= 1
+    
+    def clear_response_memo(self):
+        """Forget the responses fetched so far (start of a new run)"""
+        with self._calls_lock:
+            self._response_memo = {}
+            self.memo_hits = 0
     
     def make_api_call(self, endpoint, params=None):
-        """Make API call with rate limiting"""
-        if self.api_calls_made >= self.api_limit:
+        """Make API call with rate limiting (safe to call from fetch_all worker threads)
+        
+        Each endpoint/params pair is fetched once per run: repeats wait for and
+        share the first response without using another call. Failed calls are
+        not remembered, so they can be retried.
+        """
+        key = (endpoint, tuple(sorted((params or {}).items())))
+        with self._calls_lock:
+            pending = self._response_memo.get(key)
+            first = pending is None
+            if first:
+                pending = self._response_memo[key] = Future()
+            else:
+                self.memo_hits += 1
+        if not first:
+            return pending.result()
+        
+        try:
+            result = self._request(endpoint, params)
+        except BaseException as e:
+            # Waiters get the same error; later calls try again
+            with self._calls_lock:
+                self._response_memo.pop(key, None)
+            pending.set_exception(e)
+            raise
+        if result is None:
+            with self._calls_lock:
+                self._response_memo.pop(key, None)
+        pending.set_result(result)
+        return result
+    
+    def _request(self, endpoint, params=None):
+        """One rate-limited request to the API (or the archive, in replay mode)"""
+        if self.replay:
+            data = self.archive.load(endpoint, params, self.replay_as_of)
+            if data is None:
+                print(f"Not in response archive: {endpoint}" + (f" {params}" if params else ""))
+            return data
+        
+        if not self._reserve_call():
             print(f"API limit reached ({self.api_limit} calls)")
             return None
             
@@ -204,10 +337,28 @@ class ComprehensiveAPIClient:
         url = f"https://cricbuzz-cricket.p.rapidapi.com{endpoint}"
         
         try:
-            response = requests.get(url, headers=headers, params=params)
-            self.api_calls_made += 1
+            attempt = 0
+            while True:
+                try:
+                    response = requests.get(url, headers=headers, params=params)
+                except Exception:
+                    self._release_call()
+                    raise
+                if response.status_code != 429 or attempt >= self.max_retries:
+                    break
+                # Concurrent requests can trip the per-second rate limit: back off and retry
+                delay = self._retry_delay(response, attempt)
+                print(f"Rate limited on {endpoint}, retrying in {delay:.1f}s")
+                time.sleep(delay)
+                attempt += 1
             
             if response.status_code == 200:
+                if self.archive is not None:
+                    try:
+                        self.archive.store(endpoint, params, response.content)
+                    except Exception as e:
+                        # The call succeeded (and was counted); losing its archive copy is not worth losing the data
+                        print(f"Could not archive response for {endpoint}: {e}")
                 return response.json()
             else:
                 print(f"API Error {response.status_code}: {response.text}")
@@ -217,6 +368,51 @@ class ComprehensiveAPIClient:
             print(f"API call failed: {str(e)}")
             return None
     
+    def _retry_delay(self, response, attempt):
+        """Seconds to wait before retrying a 429: Retry-After if given, else jittered exponential backoff"""
+        try:
+            return max(0.0, min(float(response.headers.get("Retry-After", "")), 60.0))
+        except ValueError:
+            return random.uniform(0, min(30.0, self.backoff_base * (2 ** attempt)))
+    
+    def fetch_all(self, calls):
+        """Yield make_api_call results for calls, in order, keeping up to max_workers requests in flight
+        
+        calls is an iterable of endpoints or (endpoint, params) pairs. Only the
+        caller's thread touches the database, so writes stay in call order.
+        Closing the generator early (use contextlib.closing around a loop that
+        may break) cancels the requests that haven't started.
+        """
+        if self._fetch_executor is None:
+            self._fetch_executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="api-fetch")
+        calls = iter(calls)
+        pending = deque()
+        
+        def submit_next():
+            call = next(calls, None)
+            if call is None:
+                return
+            endpoint, params = (call, None) if isinstance(call, str) else call
+            pending.append(self._fetch_executor.submit(self.make_api_call, endpoint, params))
+        
+        try:
+            for _ in range(self.max_workers):
+                submit_next()
+            while pending:
+                result = pending.popleft().result()
+                submit_next()
+                yield result
+        finally:
+            for future in pending:
+                future.cancel()
+    
+    def _not_synced_filter(self, entity):
+        """SQL condition excluding matches (alias m) already synced for entity, in incremental mode"""
+        if not self.incremental:
+            return ""
+        return (f"AND NOT EXISTS (SELECT 1 FROM sync_state s "
+                f"WHERE s.entity = '{entity}' AND s.item = CAST(m.match_id AS CHAR))")
+    
     def populate_teams(self):
         """Populate teams table"""
         print("\nPOPULATING TEAMS")
@@ -276,7 +472,7 @@ class ComprehensiveAPIClient:
                         teams_seen.add(team2['teamId'])
                         teams_added += 1
         
-        self.connection.commit()
+        self.commit("teams")
         print(f"Added {teams_added} teams")
         return teams_added
     
@@ -319,7 +515,7 @@ class ComprehensiveAPIClient:
                         venues_seen.add(venue['id'])
                         venues_added += 1
         
-        self.connection.commit()
+        self.commit("venues")
         print(f"Added {venues_added} venues")
         return venues_added
     
@@ -337,7 +533,9 @@ class ComprehensiveAPIClient:
         players_added = 0
         
         for player in player_stats.get('player', []):
-            self.cursor.execute("""
+            if not player.get('id'):
+                continue
+            self.writer.add("""
                 INSERT INTO players (player_id, name, team_id, role, batting_style, bowling_style, country)
                 VALUES (%s, %s, %s, %s, %s, %s, %s)
                 ON DUPLICATE KEY UPDATE
@@ -358,7 +556,8 @@ class ComprehensiveAPIClient:
             ))
             players_added += 1
         
-        self.connection.commit()
+        players_added -= len(self.flush_writes("players"))
+        self.commit("players")
         print(f"Added {players_added} players")
         return players_added
     
@@ -397,7 +596,7 @@ class ComprehensiveAPIClient:
             ))
             series_added += 1
         
-        self.connection.commit()
+        self.commit("series")
         print(f"Added {series_added} series")
         return series_added
     
@@ -412,6 +611,14 @@ class ComprehensiveAPIClient:
         live_matches = self.make_api_call("/matches/v1/live")
         
         matches_added = 0
+        matches_unchanged = 0
+        
+        # Incremental: a match already stored as completed can't change (matched by id, not by
+        # date, so a match that overran its scheduled end is still picked up when it completes)
+        completed_ids = set()
+        if self.incremental:
+            self.cursor.execute("SELECT match_id FROM matches WHERE state = 'Complete'")
+            completed_ids = {match_id for (match_id,) in self.cursor.fetchall()}
         
         for match_type, matches_data in [
             ("recent", recent_matches),
@@ -427,6 +634,8 @@ class ComprehensiveAPIClient:
                     
                     for match_info in series.get('seriesAdWrapper', {}).get('matches', []):
                         match_data = match_info.get('matchInfo', {})
+                        if not match_data.get('matchId'):
+                            continue
                         
                         # Parse dates
                         start_date = None
@@ -436,6 +645,10 @@ class ComprehensiveAPIClient:
                         if match_data.get('endDate'):
                             end_date = datetime.fromtimestamp(match_data['endDate'] / 1000)
                         
+                        if match_data.get('state') == 'Complete' and match_data['matchId'] in completed_ids:
+                            matches_unchanged += 1
+                            continue
+                        
                         # Get winner ID
                         winner_id = None
                         if match_data.get('status'):
@@ -454,7 +667,7 @@ class ComprehensiveAPIClient:
                         # Ensure teams exist in database with real names
                         for team_data in [team1_data, team2_data]:
                             if team_data.get('teamId'):
-                                self.cursor.execute("""
+                                self.writer.add("""
                                     INSERT INTO teams (team_id, name, short_name, country_name, image_id)
                                     VALUES (%s, %s, %s, %s, %s)
                                     ON DUPLICATE KEY UPDATE
@@ -472,7 +685,7 @@ class ComprehensiveAPIClient:
                         
                         # Ensure venue exists in database
                         if venue_data.get('id'):
-                            self.cursor.execute("""
+                            self.writer.add("""
                                 INSERT INTO venues (venue_id, name, city, country, timezone, latitude, longitude, capacity)
                                 VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
                                 ON DUPLICATE KEY UPDATE
@@ -495,7 +708,7 @@ class ComprehensiveAPIClient:
                             ))
                         
                         # Insert match with proper foreign key references
-                        self.cursor.execute("""
+                        self.writer.add("""
                             INSERT INTO matches (
                                 match_id, series_id, match_desc, match_format, start_datetime, end_datetime,
                                 team1_id, team2_id, venue_id, winner_id, status, state
@@ -527,10 +740,18 @@ class ComprehensiveAPIClient:
                             match_data.get('status', ''),
                             match_data.get('state', '')
                         ))
+                        self.dirty_matches.add(match_data.get('matchId'))
                         matches_added += 1
         
-        self.connection.commit()
+        # Rows are only known to be written once flushed; don't count or refresh the ones that failed
+        failed_matches = self.flush_writes("matches")
+        matches_added -= len(failed_matches)
+        self.dirty_matches.difference_update(failed_matches)
+        
+        self.commit("teams", "venues", "matches")
         print(f"Added {matches_added} matches")
+        if matches_unchanged:
+            print(f"Skipped {matches_unchanged} completed matches already stored")
         return matches_added
     
     def populate_toss_data(self):
@@ -538,22 +759,26 @@ class ComprehensiveAPIClient:
         print("\nPOPULATING TOSS DATA")
         print("=" * 60)
         
-        # Get matches without toss data
-        self.cursor.execute("""
-            SELECT match_id FROM matches 
+        # Get matches without toss data (incremental: not already looked up)
+        self.cursor.execute(f"""
+            SELECT match_id FROM matches m
             WHERE (toss_decision IS NULL OR toss_decision = 'None' OR toss_winner_id IS NULL)
               AND winner_id IS NOT NULL
+              {self._not_synced_filter(TOSS)}
             LIMIT 20
         """)
         
         matches_to_update = self.cursor.fetchall()
         toss_updates = 0
         
-        for (match_id,) in matches_to_update:
-            match_data = self.make_api_call(f"/mcenter/v1/{match_id}")
-            
+        # Match details are fetched concurrently; updates are applied in order below
+        match_details = self.fetch_all(f"/mcenter/v1/{match_id}" for (match_id,) in matches_to_update)
+        
+        fetched = []
+        for (match_id,), match_data in zip(matches_to_update, match_details):
             if not match_data:
                 continue
+            fetched.append(match_id)
             
             try:
                 tossstatus = match_data.get('tossstatus', '')
@@ -590,7 +815,9 @@ class ComprehensiveAPIClient:
                 print(f"Error updating toss data for match {match_id}: {str(e)}")
                 continue
         
-        self.connection.commit()
+        # Finished matches: their toss details won't appear later if missing now
+        mark_synced(self.cursor, TOSS, fetched)
+        self.commit("matches")
         print(f"Updated toss data for {toss_updates} matches")
         return toss_updates
     
@@ -609,13 +836,15 @@ class ComprehensiveAPIClient:
         
         for player in player_stats.get('player', []):
             player_id = player.get('id')
+            if not player_id:
+                continue
             
             # Parse batting stats for different formats
             for format_name, format_key in [("TEST", "test"), ("ODI", "odi"), ("T20", "t20"), ("IPL", "ipl")]:
                 format_stats = player.get(format_key, {})
                 
                 if format_stats:
-                    self.cursor.execute("""
+                    self.writer.add("""
                         INSERT INTO player_stats (
                             player_id, format, matches, innings, runs, highest_score, 
                             average, strike_rate, centuries, fifties, wickets, 
@@ -651,7 +880,8 @@ class ComprehensiveAPIClient:
                     ))
                     stats_added += 1
         
-        self.connection.commit()
+        stats_added -= len(self.flush_writes("player_stats"))
+        self.commit("player_stats")
         print(f"Added {stats_added} player stats")
         return stats_added
     
@@ -660,10 +890,11 @@ class ComprehensiveAPIClient:
         print("\nPOPULATING SCORECARDS")
         print("=" * 60)
         
-        # Get matches with results
-        self.cursor.execute("""
-            SELECT match_id FROM matches 
+        # Get matches with results (incremental: whose final scorecard isn't stored yet)
+        self.cursor.execute(f"""
+            SELECT match_id FROM matches m
             WHERE winner_id IS NOT NULL
+              {self._not_synced_filter(SCORECARDS)}
             LIMIT 15
         """)
         
@@ -673,9 +904,10 @@ class ComprehensiveAPIClient:
         # Disable foreign key checks for scorecard insertion
         self.cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
         
-        for (match_id,) in matches_to_process:
-            scorecard_data = self.make_api_call(f"/mcenter/v1/{match_id}/scard")
-            
+        scorecards = self.fetch_all(f"/mcenter/v1/{match_id}/scard" for (match_id,) in matches_to_process)
+        
+        stored = []
+        for (match_id,), scorecard_data in zip(matches_to_process, scorecards):
             if not scorecard_data or 'scorecard' not in scorecard_data:
                 continue
             
@@ -685,7 +917,9 @@ class ComprehensiveAPIClient:
                     
                     if 'batsman' in innings:
                         for i, batsman in enumerate(innings['batsman']):
-                            self.cursor.execute("""
+                            if not batsman.get('id'):
+                                continue
+                            self.writer.add("""
                                 INSERT INTO match_scorecards (
                                     match_id, innings_id, player_id, runs, balls, fours, sixes,
                                     strike_rate, batting_position, out_description, is_captain, is_keeper
@@ -715,29 +949,46 @@ class ComprehensiveAPIClient:
                                 batsman.get('iscaptain', False),
                                 batsman.get('iskeeper', False)
                             ))
+                            self.dirty_matches.add(match_id)
                             scorecards_added += 1
+                stored.append(match_id)
                 
             except Exception as e:
                 print(f"Error processing scorecard for match {match_id}: {str(e)}")
                 continue
         
+        # Buffered rows must be written while foreign key checks are still off
+        failed_matches = self.flush_writes("match_scorecards")
+        scorecards_added -= len(failed_matches)
+        
         # Re-enable foreign key checks
         self.cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
         
-        self.connection.commit()
+        # A match with a failed row is fetched again next time
+        mark_synced(self.cursor, SCORECARDS, [match_id for match_id in stored if match_id not in failed_matches])
+        self.commit("match_scorecards")
         print(f"Added {scorecards_added} scorecard entries")
         return scorecards_added
     
-    def run_comprehensive_population(self):
-        """Run the complete database population"""
-        print("COMPREHENSIVE CRICKET DATABASE POPULATION")
+    def run_comprehensive_population(self, incremental=False):
+        """Run the complete database population
+        
+        incremental keeps the existing tables and only fetches what sync_state
+        doesn't already record (new matches, scorecards, toss and series).
+        """
+        self.incremental = incremental
+        print("INCREMENTAL CRICKET DATABASE SYNC" if incremental else "COMPREHENSIVE CRICKET DATABASE POPULATION")
         print("=" * 70)
         print(f"API Limit: {self.api_limit} calls")
         print(f"Starting API calls: {self.api_calls_made}")
+        if self.replay:
+            print(f"Replaying archived responses from {self.archive.directory}"
+                  + (f" (fetched at or before {self.replay_as_of})" if self.replay_as_of else ""))
+        self.clear_response_memo()
         
         try:
             # Setup database
-            self.setup_database_tables()
+            self.setup_database_tables(incremental)
             
             # Populate all data
             teams_added = self.populate_teams()
@@ -767,6 +1018,8 @@ class ComprehensiveAPIClient:
             print(f"Scorecards added: {scorecards_added}")
             print(f"Total API calls made: {self.api_calls_made}")
             print(f"API calls remaining: {self.api_limit - self.api_calls_made}")
+            print(f"API calls saved by response reuse: {self.memo_hits}")
+            self.writer.report()
             
             return {
                 'teams': teams_added,
@@ -834,7 +1087,7 @@ class ComprehensiveAPIClient:
             series_updates = self.cursor.rowcount
             print(f"Updated {series_updates} series with match counts")
             
-            self.connection.commit()
+            self.commit("players", "venues", "series")
             return {
                 'missing_players': missing_players,
                 'capacity_updates': capacity_updates,
@@ -861,6 +1114,10 @@ class ComprehensiveAPIClient:
             total_matches_processed = 0
             total_scorecards_added = 0
             
+            # Incremental: finished series and final scorecards from earlier runs are not fetched again
+            archived_series = synced_items(self.cursor, SERIES) if self.incremental else set()
+            stored_scorecards = synced_items(self.cursor, SCORECARDS) if self.incremental else set()
+            
             for year in years:
                 print(f"\nProcessing year {year}...")
                 
@@ -877,61 +1134,75 @@ class ComprehensiveAPIClient:
                         break
                 
                 print(f"Found {len(series_list)} series for {year}")
+                if archived_series:
+                    series_list = [series for series in series_list if str(series.get('id')) not in archived_series]
+                    print(f"{len(series_list)} series not archived yet")
                 
                 matches_processed_this_year = 0
                 
+                # Series details are fetched a few ahead; stopping early cancels the rest
+                series_details = self.fetch_all(f"/series/v1/{series.get('id')}" for series in series_list)
+                
                 # Process series until we get enough matches
-                for series in series_list:
-                    if matches_processed_this_year >= matches_per_year:
-                        break
-                    
-                    series_id = series.get('id')
-                    series_name = series.get('name', 'Unknown')
-                    
-                    # Store series data
-                    self._store_series_data(series, year)
-                    
-                    # Get matches for this series
-                    matches_data = self.make_api_call(f"/series/v1/{series_id}")
-                    if not matches_data:
-                        continue
-                    
-                    matches = []
-                    if 'matches' in matches_data:
-                        matches = matches_data['matches']
-                    elif 'matchList' in matches_data:
-                        matches = matches_data['matchList']
-                    elif 'seriesMatches' in matches_data:
-                        matches = matches_data['seriesMatches']
-                    
-                    matches = matches[:matches_per_year - matches_processed_this_year] if matches else []
-                    
-                    for match in matches:
+                with closing(series_details):
+                    for series, matches_data in zip(series_list, series_details):
                         if matches_processed_this_year >= matches_per_year:
                             break
                         
-                        match_info = match.get('matchInfo', {})
-                        match_id = match_info.get('matchId')
+                        series_id = series.get('id')
+                        series_name = series.get('name', 'Unknown')
+                        
+                        # Store series data
+                        self._store_series_data(series, year)
                         
-                        if not match_id:
+                        # Matches for this series
+                        if not matches_data:
                             continue
                         
-                        print(f"  Processing: {match_info.get('matchDesc', 'Unknown')}")
+                        matches = []
+                        if 'matches' in matches_data:
+                            matches = matches_data['matches']
+                        elif 'matchList' in matches_data:
+                            matches = matches_data['matchList']
+                        elif 'seriesMatches' in matches_data:
+                            matches = matches_data['seriesMatches']
                         
-                        # Store match data
-                        if self._store_match_data(match, series_id):
-                            # Get and store scorecard data
-                            scorecard_data = self.make_api_call(f"/mcenter/v1/{match_id}/scard")
-                            if scorecard_data:
-                                scorecards_added = self._store_scorecard_data(scorecard_data, match_id)
-                                total_scorecards_added += scorecards_added
-                                print(f"    Added {scorecards_added} scorecard records")
-                            
-                            matches_processed_this_year += 1
-                            total_matches_processed += 1
-                            
-                            # Commit after each match
-                            self.connection.commit()
+                        matches = [match for match in matches or []
+                                   if match.get('matchInfo', {}).get('matchId')
+                                   and str(match['matchInfo']['matchId']) not in stored_scorecards]
+                        pending = len(matches)
+                        matches = matches[:matches_per_year - matches_processed_this_year]
+                        final_scorecards = []
+                        matches, scorecards = self._store_matches_and_fetch_scorecards(matches, series_id)
+                        
+                        with closing(scorecards):
+                            for match, scorecard_data in zip(matches, scorecards):
+                                match_info = match['matchInfo']
+                                match_id = match_info['matchId']
+                                
+                                print(f"  Processing: {match_info.get('matchDesc', 'Unknown')}")
+                                
+                                if scorecard_data:
+                                    scorecards_added, scorecards_failed = self._store_scorecard_data(
+                                        scorecard_data, match_id
+                                    )
+                                    total_scorecards_added += scorecards_added
+                                    print(f"    Added {scorecards_added} scorecard records")
+                                    if (match_info.get('state') == 'Complete' and 'scorecard' in scorecard_data
+                                            and not scorecards_failed):
+                                        final_scorecards.append(match_id)
+                                
+                                matches_processed_this_year += 1
+                                total_matches_processed += 1
+                                
+                                # Commit after each match
+                                self.commit()
+                        
+                        # A finished series whose every match has its final scorecard is never fetched again
+                        mark_synced(self.cursor, SCORECARDS, final_scorecards)
+                        if len(final_scorecards) == pending and self._series_ended(series):
+                            mark_synced(self.cursor, SERIES, [series_id])
+                        self.commit()
                 
                 print(f"Year {year}: Processed {matches_processed_this_year} matches")
             
@@ -939,6 +1210,7 @@ class ComprehensiveAPIClient:
             print(f"Total matches processed: {total_matches_processed}")
             print(f"Total scorecard records added: {total_scorecards_added}")
             print(f"Total API calls made: {self.api_calls_made}")
+            self.writer.report()
             
             return {
                 'matches_processed': total_matches_processed,
@@ -953,8 +1225,26 @@ class ComprehensiveAPIClient:
             if self.connection:
                 self.connection.close()
     
+    def _series_ended(self, series_data):
+        """True if the series' end date (ms timestamp) has passed"""
+        try:
+            return int(series_data.get('endDt')) / 1000 < time.time()
+        except (TypeError, ValueError):
+            return False
+    
+    def _store_matches_and_fetch_scorecards(self, matches, series_id):
+        """Store matches, then fetch the scorecards of the ones stored
+        
+        Returns (stored matches, fetch_all generator of their scorecards), so
+        no API calls are spent on scorecards for matches that failed to store.
+        """
+        stored = [match for match in matches if self._store_match_data(match, series_id)]
+        scorecards = self.fetch_all(f"/mcenter/v1/{match['matchInfo']['matchId']}/scard" for match in stored)
+        return stored, scorecards
+    
     def _store_series_data(self, series_data, year):
         """Helper method to store series data"""
+        self.modified_tables.update(("series", "series_2024"))
         series_id = series_data.get('id')
         series_name = series_data.get('name', 'Unknown Series')
         start_date = series_data.get('startDt')
@@ -1022,6 +1312,7 @@ class ComprehensiveAPIClient:
     
     def _store_match_data(self, match_data, series_id):
         """Helper method to store match data"""
+        self.modified_tables.update(("teams", "venues", "matches"))
         match_info = match_data.get('matchInfo', {})
         match_id = match_info.get('matchId')
         
@@ -1123,15 +1414,17 @@ class ComprehensiveAPIClient:
                 match_id, series_id, match_desc, match_format, start_datetime, end_datetime,
                 team1_id, team2_id, venue_id, status, state
             ))
+            self.dirty_matches.add(match_id)
             return True
         except Exception as e:
             print(f"    Error storing match {match_id}: {e}")
             return False
     
     def _store_scorecard_data(self, scorecard_data, match_id):
-        """Helper method to store scorecard data"""
+        """Helper method to store scorecard data; returns (rows written, rows that failed)"""
+        self.modified_tables.update(("players", "match_scorecards"))
         if not scorecard_data or 'scorecard' not in scorecard_data:
-            return 0
+            return 0, 0
         
         scorecards_added = 0
         
@@ -1146,7 +1439,7 @@ class ComprehensiveAPIClient:
                     continue
                 
                 # Ensure player exists
-                self.cursor.execute("""
+                self.writer.add("""
                     INSERT IGNORE INTO players (player_id, name, country, role, batting_style, bowling_style)
                     VALUES (%s, %s, %s, %s, %s, %s)
                 """, (
@@ -1159,44 +1452,46 @@ class ComprehensiveAPIClient:
                 ))
                 
                 # Store scorecard data
-                try:
-                    self.cursor.execute("""
-                        INSERT INTO match_scorecards (
-                            match_id, player_id, innings_id, runs, balls, fours, sixes, strike_rate,
-                            batting_position, out_description, is_captain, is_keeper
-                        )
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                        ON DUPLICATE KEY UPDATE
-                        runs = VALUES(runs),
-                        balls = VALUES(balls),
-                        fours = VALUES(fours),
-                        sixes = VALUES(sixes),
-                        strike_rate = VALUES(strike_rate),
-                        batting_position = VALUES(batting_position),
-                        out_description = VALUES(out_description),
-                        is_captain = VALUES(is_captain),
-                        is_keeper = VALUES(is_keeper)
-                    """, (
-                        match_id,
-                        player_id,
-                        innings_id,
-                        batsman.get('runs', 0),
-                        batsman.get('balls', 0),
-                        batsman.get('fours', 0),
-                        batsman.get('sixes', 0),
-                        batsman.get('strkrate', 0.0),
-                        batsman.get('battingPosition', 0),
-                        batsman.get('outdec', ''),
-                        batsman.get('iscaptain', False),
-                        batsman.get('iskeeper', False)
-                    ))
-                    scorecards_added += 1
-                except Exception as e:
-                    print(f"      Error storing batsman {player_id}: {e}")
+                self.writer.add("""
+                    INSERT INTO match_scorecards (
+                        match_id, player_id, innings_id, runs, balls, fours, sixes, strike_rate,
+                        batting_position, out_description, is_captain, is_keeper
+                    )
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    ON DUPLICATE KEY UPDATE
+                    runs = VALUES(runs),
+                    balls = VALUES(balls),
+                    fours = VALUES(fours),
+                    sixes = VALUES(sixes),
+                    strike_rate = VALUES(strike_rate),
+                    batting_position = VALUES(batting_position),
+                    out_description = VALUES(out_description),
+                    is_captain = VALUES(is_captain),
+                    is_keeper = VALUES(is_keeper)
+                """, (
+                    match_id,
+                    player_id,
+                    innings_id,
+                    batsman.get('runs', 0),
+                    batsman.get('balls', 0),
+                    batsman.get('fours', 0),
+                    batsman.get('sixes', 0),
+                    batsman.get('strkrate', 0.0),
+                    batsman.get('battingPosition', 0),
+                    batsman.get('outdec', ''),
+                    batsman.get('iscaptain', False),
+                    batsman.get('iskeeper', False)
+                ))
+                scorecards_added += 1
             
             # Note: Bowling data not stored as match_scorecards table doesn't support it
         
-        return scorecards_added
+        # Flush now so the count (and the caller's sync marks) only cover rows that were written
+        scorecards_failed = len(self.flush_writes("match_scorecards"))
+        scorecards_added -= scorecards_failed
+        if scorecards_added:
+            self.dirty_matches.add(match_id)
+        return scorecards_added, scorecards_failed
 
     def populate_cricket_world_cups(self, years=[2011, 2015, 2019, 2023]):
         """Populate Cricket World Cup data for Query 22"""
@@ -1275,25 +1570,22 @@ class ComprehensiveAPIClient:
             matches_processed_this_year = 0
             
             # Process all matches in the World Cup (they're all important for team head-to-head)
-            for match in matches:
-                if self.api_calls_made >= 180:  # Leave buffer
-                    print("Approaching API limit, stopping early")
-                    break
-                
-                match_info = match.get('matchInfo', {})
-                match_id = match_info.get('matchId')
-                
-                if not match_id:
-                    continue
-                
-                print(f"  Processing: {match_info.get('matchDesc', 'Unknown')}")
-                
-                # Store match data
-                if self._store_match_data(match, series_id):
-                    # Get and store scorecard data
-                    scorecard_data = self.make_api_call(f"/mcenter/v1/{match_id}/scard")
+            matches = [match for match in matches if match.get('matchInfo', {}).get('matchId')]
+            matches, scorecards = self._store_matches_and_fetch_scorecards(matches, series_id)
+            
+            with closing(scorecards):
+                for match, scorecard_data in zip(matches, scorecards):
+                    if self.api_calls_made >= 180:  # Leave buffer
+                        print("Approaching API limit, stopping early")
+                        break
+                    
+                    match_info = match['matchInfo']
+                    match_id = match_info['matchId']
+                    
+                    print(f"  Processing: {match_info.get('matchDesc', 'Unknown')}")
+                    
                     if scorecard_data and 'scorecard' in scorecard_data:
-                        scorecards_added = self._store_scorecard_data(scorecard_data, match_id)
+                        scorecards_added, _ = self._store_scorecard_data(scorecard_data, match_id)
                         total_scorecards_added += scorecards_added
                         print(f"    Added {scorecards_added} scorecard records")
                     else:
@@ -1303,7 +1595,7 @@ class ComprehensiveAPIClient:
                     total_matches_processed += 1
                     
                     # Commit after each match
-                    self.connection.commit()
+                    self.commit()
             
             print(f"Year {year}: Processed {matches_processed_this_year} matches")
             
@@ -1399,25 +1691,22 @@ class ComprehensiveAPIClient:
             matches_processed_this_year = 0
             
             # Process all matches in the World Cup
-            for match in matches:
-                if self.api_calls_made >= 180:  # Leave buffer
-                    print("Approaching API limit, stopping early")
-                    break
-                
-                match_info = match.get('matchInfo', {})
-                match_id = match_info.get('matchId')
-                
-                if not match_id:
-                    continue
-                
-                print(f"  Processing: {match_info.get('matchDesc', 'Unknown')}")
-                
-                # Store match data
-                if self._store_match_data(match, series_id):
-                    # Get and store scorecard data
-                    scorecard_data = self.make_api_call(f"/mcenter/v1/{match_id}/scard")
+            matches = [match for match in matches if match.get('matchInfo', {}).get('matchId')]
+            matches, scorecards = self._store_matches_and_fetch_scorecards(matches, series_id)
+            
+            with closing(scorecards):
+                for match, scorecard_data in zip(matches, scorecards):
+                    if self.api_calls_made >= 180:  # Leave buffer
+                        print("Approaching API limit, stopping early")
+                        break
+                    
+                    match_info = match['matchInfo']
+                    match_id = match_info['matchId']
+                    
+                    print(f"  Processing: {match_info.get('matchDesc', 'Unknown')}")
+                    
                     if scorecard_data and 'scorecard' in scorecard_data:
-                        scorecards_added = self._store_scorecard_data(scorecard_data, match_id)
+                        scorecards_added, _ = self._store_scorecard_data(scorecard_data, match_id)
                         total_scorecards_added += scorecards_added
                         print(f"    Added {scorecards_added} scorecard records")
                     else:
@@ -1427,7 +1716,7 @@ class ComprehensiveAPIClient:
                     total_matches_processed += 1
                     
                     # Commit after each match
-                    self.connection.commit()
+                    self.commit()
             
             print(f"Year {year}: Processed {matches_processed_this_year} matches")
             
@@ -1448,10 +1737,21 @@ class ComprehensiveAPIClient:
         }
 
 def main():
-    client = ComprehensiveAPIClient()
+    parser = argparse.ArgumentParser(description="Populate the cricket database from RapidAPI")
+    parser.add_argument("--replay", action="store_true",
+                        help="Serve every call from the response archive instead of the API (no API calls)")
+    parser.add_argument("--as-of", help="With --replay, use the responses fetched at or before this ISO time")
+    parser.add_argument("--archive", action="store_true",
+                        help=f"Archive every response fetched in {DEFAULT_ARCHIVE_DIR} (for later --replay)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Keep the existing tables and fetch only what earlier runs haven't stored")
+    args = parser.parse_args()
+    
+    client = ComprehensiveAPIClient(replay=args.replay or None, as_of=args.as_of,
+                                    archive_dir=DEFAULT_ARCHIVE_DIR if args.archive else None)
     try:
         client.connect_database()
-        results = client.run_comprehensive_population()
+        results = client.run_comprehensive_population(incremental=args.incremental)
         
         print(f"\nESTIMATED API COST:")
         print(f"Total API calls: {results['api_calls']}")
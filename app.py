@@ -2,7 +2,11 @@ import streamlit as st
 import requests
 import pandas as pd
 import json
+import time
 from datetime import datetime
+from urllib.parse import urlencode
+from match_feed import apply_match_changes
+from arrow_transport import ARROW_AVAILABLE, ARROW_STREAM_MEDIA_TYPE, read_arrow_ipc
 
 # Configure Streamlit page
 st.set_page_config(
@@ -16,12 +20,27 @@ st.set_page_config(
 API_BASE_URL = "http://localhost:8000"
 
 def make_api_request(endpoint, method="GET", data=None):
-    """Make API request to FastAPI backend"""
+    """Make API request to FastAPI backend
+
+    GET responses that carry an ETag/Last-Modified are remembered in session
+    state; repeat requests send them back and reuse the stored body on 304.
+    """
     try:
         url = f"{API_BASE_URL}{endpoint}"
         
         if method.upper() == "GET":
-            response = requests.get(url)
+            http_cache = st.session_state.setdefault('http_cache', {})
+            cached = http_cache.get(url)
+            headers = {}
+            if cached:
+                if cached.get('etag'):
+                    headers['If-None-Match'] = cached['etag']
+                if cached.get('last_modified'):
+                    headers['If-Modified-Since'] = cached['last_modified']
+            
+            response = requests.get(url, headers=headers)
+            if response.status_code == 304 and cached:
+                return cached['data']
         elif method.upper() == "POST":
             response = requests.post(url, json=data)
         else:
@@ -30,11 +49,81 @@ def make_api_request(endpoint, method="GET", data=None):
             
         response.raise_for_status()
         data = response.json()
+        
+        if method.upper() == "GET" and (response.headers.get('ETag') or response.headers.get('Last-Modified')):
+            http_cache[url] = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'data': data
+            }
         return data
     except requests.RequestException as e:
         st.error(f"API request failed: {str(e)}")
         return None
 
+def fetch_dataframe(endpoint):
+    """GET a table/analytics endpoint as (DataFrame, other response fields)
+
+    Asks for an Arrow stream when pyarrow is installed (no JSON parsing or
+    row-by-row DataFrame construction) and falls back to JSON rows.
+    """
+    try:
+        url = f"{API_BASE_URL}{endpoint}"
+        headers = {"Accept": f"{ARROW_STREAM_MEDIA_TYPE}, application/json"} if ARROW_AVAILABLE else {}
+        response = requests.get(url, headers=headers)
+        response.raise_for_status()
+        
+        if response.headers.get("content-type", "").startswith(ARROW_STREAM_MEDIA_TYPE):
+            return read_arrow_ipc(response.content)
+        result = response.json()
+        return pd.DataFrame(result.pop("data", [])), result
+    except requests.RequestException as e:
+        st.error(f"API request failed: {str(e)}")
+        return None, None
+
+def follow_live_matches(matches, max_wait_seconds=60):
+    """Wait on the live push stream for the next score changes and apply them to matches
+
+    The id of the last event applied is kept with the list it produced; when
+    called again with that list, the stream resumes from it (Last-Event-ID)
+    and sends only the changes since, not another full snapshot.
+    """
+    deadline = time.monotonic() + max_wait_seconds
+    feed = st.session_state.get('live_feed', {})
+    headers = {}
+    if feed.get('matches') is matches and feed.get('event_id'):
+        headers['Last-Event-ID'] = feed['event_id']
+    
+    def remember(updated, event_id):
+        st.session_state['live_feed'] = {'matches': updated, 'event_id': event_id}
+        return updated
+    
+    try:
+        url = f"{API_BASE_URL}/api/live_matches/stream"
+        with requests.get(url, headers=headers, stream=True, timeout=(5, max_wait_seconds)) as response:
+            response.raise_for_status()
+            event_name = None
+            event_id = headers.get('Last-Event-ID')
+            for line in response.iter_lines(decode_unicode=True):
+                if line.startswith("id:"):
+                    event_id = line[len("id:"):].strip()
+                elif line.startswith("event:"):
+                    event_name = line[len("event:"):].strip()
+                elif line.startswith("data:"):
+                    payload = json.loads(line[len("data:"):])
+                    if event_name == "snapshot":
+                        matches = remember(payload.get("matches", []), event_id)
+                    elif event_name == "changes":
+                        return remember(apply_match_changes(matches, payload), event_id)
+                if time.monotonic() >= deadline:
+                    break
+    except requests.exceptions.Timeout:
+        pass
+    except requests.RequestException as e:
+        st.error(f"Live updates unavailable: {str(e)}")
+        time.sleep(5)
+    return matches
+
 def fetch_scorecard_data(match_id):
     """Fetch scorecard data for a specific match"""
     try:
@@ -445,20 +534,40 @@ def show_matches_page():
     # Initialize session state for current match type
     current_matches_key = f'current_{match_type.lower()}_matches'
 
+    follow_live = False
+    if match_type == "Live":
+        follow_live = st.checkbox(
+            "🔴 Follow live scores",
+            help="Keep this page updated from the server's push feed instead of re-fetching every match"
+        )
+
     if st.button(f"Fetch {match_type} Matches", type="primary"):
         with st.spinner(f"Fetching {match_type.lower()} matches..."):
             if match_type == "Live":
-                data = make_api_request("/api/live_matches")
+                endpoint = "/api/live_matches"
             elif match_type == "Recent":
-                data = make_api_request("/api/recent_matches")
+                endpoint = "/api/recent_matches"
             else:  # Upcoming
-                data = make_api_request("/api/upcoming_matches")
+                endpoint = "/api/upcoming_matches"
+
+            # Already holding a list: only ask for what changed since its version
+            version_key = f'{current_matches_key}_version'
+            if current_matches_key in st.session_state and version_key in st.session_state:
+                endpoint += f"?since={st.session_state[version_key]}"
+            data = make_api_request(endpoint)
 
             if data and 'matches' in data:
                 matches = data['matches']
                 # Store matches in session state
                 st.session_state[current_matches_key] = matches
+                st.session_state[version_key] = data.get('version')
                 st.rerun()  # Rerun to display the matches
+            elif data and 'version' in data:
+                st.session_state[current_matches_key] = apply_match_changes(
+                    st.session_state[current_matches_key], data
+                )
+                st.session_state[version_key] = data['version']
+                st.rerun()
             else:
                 st.error(f"❌ Failed to fetch {match_type.lower()} matches")
                     
@@ -586,6 +695,14 @@ def show_matches_page():
         else:
             st.error(f"❌ No {match_type.lower()} matches found")
 
+    # Block on the push stream until something changes, then redraw with the new scores
+    if follow_live:
+        with st.spinner("Waiting for live score updates..."):
+            st.session_state[current_matches_key] = follow_live_matches(
+                st.session_state.get(current_matches_key, [])
+            )
+        st.rerun()
+
 def show_player_stats_page():
     """Enhanced Player Statistics page with search and detailed stats"""
     st.header("🏏 Cricket Player Statistics")
@@ -970,37 +1087,27 @@ def show_sql_analytics_from_new_app():
         if st.button("🚀 Run Query", type="primary"):
             with st.spinner("Executing query..."):
                 try:
-                    import mysql.connector
-                    from config import DB_CONFIG
-                    import pandas as pd
-                    
-                    connection = mysql.connector.connect(**DB_CONFIG)
-                    cursor = connection.cursor()
-                    
-                    cursor.execute(query_info['query'])
-                    results = cursor.fetchall()
+                    # Run through the API (Arrow stream when pyarrow is available)
+                    df, result = fetch_dataframe(f"/api/analytics/run_query/{selected_query_num}")
+                    if result is None:
+                        return
                     
-                    if results:
-                        # Get column names
-                        columns = [desc[0] for desc in cursor.description]
-                        
-                        # Create DataFrame
-                        df = pd.DataFrame(results, columns=columns)
-                        
+                    if not df.empty:
                         st.success(f"✅ Query executed successfully! Found {len(df)} results.")
+                        if result.get('cached'):
+                            st.caption("⚡ Served from the analytics cache (tables unchanged since last run)")
                         
                         # Display results
                         st.markdown("### 📊 Results")
                         st.dataframe(df, use_container_width=True)
                         
-                        # Download button
-                        csv = df.to_csv(index=False)
-                        st.download_button(
-                            label="📥 Download CSV",
-                            data=csv,
-                            file_name=f"query_{selected_query_num}_results.csv",
-                            mime="text/csv"
-                        )
+                        # Download links stream straight from the API instead of building the file here
+                        export_url = f"{API_BASE_URL}/api/export/query/{selected_query_num}"
+                        dl_col1, dl_col2 = st.columns(2)
+                        with dl_col1:
+                            st.link_button("📥 Download CSV", f"{export_url}?format=csv")
+                        with dl_col2:
+                            st.link_button("📥 Download NDJSON", f"{export_url}?format=ndjson")
                         
                         # Show query SQL
                         with st.expander("🔍 View SQL Query"):
@@ -1013,9 +1120,6 @@ def show_sql_analytics_from_new_app():
                         # Show query SQL
                         with st.expander("🔍 View SQL Query"):
                             st.code(query_info['query'], language="sql")
-                    
-                    cursor.close()
-                    connection.close()
                         
                 except Exception as e:
                     st.error(f"❌ Query execution failed: {str(e)}")
@@ -1418,30 +1522,106 @@ def show_database_viewer_page():
         table_name = st.session_state.selected_table
         st.markdown(f"### 📋 Table: {table_name}")
         
-        # Load table data automatically when table is selected
-        if f"table_data_{table_name}" not in st.session_state:
+        # Only the current page lives in session state; the cursor stack leads back to earlier pages
+        page_key = f"table_page_{table_name}"
+        cursors_key = f"table_cursors_{table_name}"
+        meta_key = f"table_meta_{table_name}"
+        view_key = f"table_view_{table_name}"
+        meta = st.session_state.get(meta_key, {})
+        
+        col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+        with col1:
+            selected_columns = st.multiselect(
+                "Columns (empty = all)",
+                [col.get('Field') for col in meta.get('columns', [])],
+                key=f"columns_{table_name}"
+            )
+        with col2:
+            sort_column = st.selectbox(
+                "Sort by (indexed columns)",
+                ["Primary key"] + meta.get('sortable_columns', []),
+                key=f"sort_{table_name}"
+            )
+        with col3:
+            page_size = st.selectbox("Rows per page", [50, 100, 250, 500, 1000], index=1, key=f"page_size_{table_name}")
+        with col4:
+            st.markdown("<br>", unsafe_allow_html=True)
+            descending = st.checkbox("Descending", key=f"descending_{table_name}")
+        
+        view = (tuple(selected_columns), sort_column, page_size, descending)
+        if st.session_state.get(view_key) != view:
+            # View settings changed: start again from the first page
+            st.session_state[view_key] = view
+            st.session_state[cursors_key] = [None]
+            st.session_state.pop(page_key, None)
+        
+        # Load the current page
+        if page_key not in st.session_state:
+            params = {"limit": page_size, "order": "desc" if descending else "asc"}
+            if selected_columns:
+                params["columns"] = ",".join(selected_columns)
+            if sort_column != "Primary key":
+                params["sort"] = sort_column
+            page_cursor = st.session_state[cursors_key][-1]
+            if page_cursor:
+                params["cursor"] = page_cursor
+            
             with st.spinner(f"Loading data from {table_name}..."):
-                table_data = make_api_request(f"/api/database_table/{table_name}")
-                if table_data:
-                    st.session_state[f"table_data_{table_name}"] = table_data
-                    st.success(f"✅ Loaded {table_data.get('total_rows', 0)} rows from {table_name}")
+                frame, table_data = fetch_dataframe(f"/api/database_table/{table_name}?{urlencode(params)}")
+                if table_data is not None:
+                    table_data['frame'] = frame
+                    st.session_state[page_key] = table_data
+                    if 'columns' in table_data:
+                        first_load = meta_key not in st.session_state
+                        st.session_state[meta_key] = {
+                            'columns': table_data.get('columns', []),
+                            'sortable_columns': table_data.get('sortable_columns', []),
+                            'estimated_total_rows': table_data.get('estimated_total_rows')
+                        }
+                        if first_load:
+                            st.rerun()  # Fill the column / sort pickers
                 else:
                     st.error(f"❌ Failed to load data from {table_name}")
         
         # Display table data if available
-        if f"table_data_{table_name}" in st.session_state:
-            table_data = st.session_state[f"table_data_{table_name}"]
+        if page_key in st.session_state:
+            table_data = st.session_state[page_key]
+            cursors = st.session_state[cursors_key]
+            page_number = len(cursors)
             
             # Display data first
-            data = table_data.get('data', [])
-            if data:
-                st.markdown("#### 📈 Table Data:")
-                st.dataframe(data, width='stretch')
+            frame = table_data['frame']
+            if not frame.empty:
+                estimated_rows = meta.get('estimated_total_rows')
+                total_text = f" of ~{estimated_rows} rows" if estimated_rows else ""
+                st.markdown(f"#### 📈 Table Data (page {page_number}, {len(frame)} rows{total_text}):")
+                st.dataframe(frame, width='stretch')
             else:
                 st.error(f"❌ No data found in {table_name} table")
             
+            # Whole-table downloads are streamed by the API, not assembled from pages here
+            export_params = {"columns": ",".join(selected_columns)} if selected_columns else {}
+            export_url = f"{API_BASE_URL}/api/export/table/{table_name}"
+            dl_col1, dl_col2 = st.columns(2)
+            with dl_col1:
+                st.link_button("📥 Export table as CSV", f"{export_url}?{urlencode({**export_params, 'format': 'csv'})}")
+            with dl_col2:
+                st.link_button("📥 Export table as NDJSON", f"{export_url}?{urlencode({**export_params, 'format': 'ndjson'})}")
+            
+            prev_col, next_col = st.columns(2)
+            with prev_col:
+                if st.button("⬅️ Previous page", disabled=page_number == 1, key=f"prev_{table_name}"):
+                    cursors.pop()
+                    del st.session_state[page_key]
+                    st.rerun()
+            with next_col:
+                if st.button("Next page ➡️", disabled=not table_data.get('has_more'), key=f"next_{table_name}"):
+                    cursors.append(table_data.get('next_cursor'))
+                    del st.session_state[page_key]
+                    st.rerun()
+            
             # Display columns below the data
-            columns = table_data.get('columns', [])
+            columns = meta.get('columns', [])
             if columns:
                 st.markdown("#### 📊 Table Structure:")
                 col_df = []
@@ -1494,6 +1674,10 @@ def show_database_viewer_page():
                             if data:
                                 st.markdown("#### 📊 Results:")
                                 st.dataframe(data, width='stretch')
+                                st.link_button(
+                                    "📥 Export results as CSV",
+                                    f"{API_BASE_URL}/api/export/sql?{urlencode({'query': query, 'format': 'csv'})}"
+                                )
                             else:
                                 st.error("No results found")
                         elif query_type == 'SHOW':
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Arrow Transport - Columnar Apache Arrow IPC streams built straight from cursor rows
+Lets the Streamlit frontend load results into pandas without parsing JSON.
+"""
+
+import serialization
+
+try:
+    import pyarrow as pa
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+# Schema metadata key holding the non-row fields of the JSON response (cursor, totals...)
+META_KEY = b"response"
+
+# Rows per record batch in the stream
+BATCH_ROWS = 65536
+
+
+def wants_arrow(accept_header):
+    """True if the client asked for an Arrow stream and pyarrow is installed"""
+    return ARROW_AVAILABLE and ARROW_STREAM_MEDIA_TYPE in (accept_header or "")
+
+
+def _column_array(values):
+    """Build one Arrow array, mapping DECIMAL to float64 as the JSON path does"""
+    try:
+        array = pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Mixed types in one column (e.g. CASE producing ints and strings)
+        return pa.array([None if value is None else str(value) for value in values], type=pa.string())
+    if pa.types.is_decimal(array.type):
+        return pa.array([None if value is None else float(value) for value in values], type=pa.float64())
+    return array
+
+
+def rows_to_arrow_ipc(columns, rows, meta=None):
+    """Serialize tuple rows (a non-dictionary cursor's fetchall()) as an Arrow IPC stream
+
+    meta is stored as JSON in the schema metadata so the columnar payload can
+    still carry the fields the JSON response has next to "data".
+    """
+    if rows:
+        column_values = [list(values) for values in zip(*rows)]
+    else:
+        column_values = [[] for _ in columns]
+    arrays = [_column_array(values) for values in column_values]
+
+    metadata = {META_KEY: serialization.dumps_bytes(meta or {})}
+    table = pa.Table.from_arrays(arrays, names=list(columns), metadata=metadata)
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table, max_chunksize=BATCH_ROWS)
+    return sink.getvalue().to_pybytes()
+
+
+def read_arrow_ipc(payload):
+    """Read an Arrow IPC stream into (DataFrame, meta)
+
+    Numeric columns without nulls become pandas blocks backed by the Arrow
+    buffers, without a per-value copy.
+    """
+    reader = pa.ipc.open_stream(payload)
+    table = reader.read_all()
+    meta = serialization.loads((table.schema.metadata or {}).get(META_KEY, b"{}"))
+    return table.to_pandas(split_blocks=True, self_destruct=True), meta
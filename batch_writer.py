@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Batch Writer - Buffers INSERT/upsert rows per statement and writes them with executemany
+mysql-connector turns executemany on an INSERT ... VALUES into multi-row statements,
+so a batch costs one round trip instead of one per row.
+"""
+
+import re
+import time
+
+INSERT_TABLE = re.compile(r"INSERT\s+(?:IGNORE\s+)?INTO\s+(\w+)", re.IGNORECASE)
+
+
+class BatchWriter:
+    """Buffered writes for a cursor, with rows/sec per table
+
+    Buffers are flushed together, in the order their statements were first
+    used, so parent rows (teams, players) reach the database before the rows
+    that reference them. batch_size=1 writes every row with its own execute,
+    the way the writers did before, for comparison.
+
+    A row is only known to be written after a flush: flush() returns the rows
+    that failed since the previous flush (including ones written when a
+    buffer filled up inside add()), so callers can correct what they counted.
+    """
+
+    def __init__(self, cursor=None, batch_size=500):
+        self.cursor = cursor
+        self.batch_size = max(1, batch_size)
+        self._buffers = {}  # statement -> [params, ...] in first-use order
+        self._stats = {}    # table -> {"rows", "statements", "seconds", "failed"}
+        self._failed = []   # (table, params) of rows that failed since the last flush()
+
+    def add(self, statement, params):
+        """Queue one row; writes every buffer once this statement has batch_size rows"""
+        rows = self._buffers.setdefault(statement, [])
+        rows.append(params)
+        if len(rows) >= self.batch_size:
+            self._write_buffers()
+
+    def flush(self):
+        """Write every buffered row; returns [(table, params), ...] of the rows that failed"""
+        self._write_buffers()
+        failed, self._failed = self._failed, []
+        return failed
+
+    def _write_buffers(self):
+        buffers, self._buffers = self._buffers, {}
+        for statement, rows in buffers.items():
+            if rows:
+                self._write(statement, rows)
+
+    def _write(self, statement, rows):
+        match = INSERT_TABLE.search(statement)
+        table = match.group(1) if match else "unknown"
+        stats = self._stats.setdefault(table, {"rows": 0, "statements": 0, "seconds": 0.0, "failed": 0})
+
+        started = time.perf_counter()
+        if len(rows) == 1 or self.batch_size == 1:
+            self._write_rows(statement, rows, table, stats)
+        else:
+            try:
+                self.cursor.executemany(statement, rows)
+                stats["statements"] += 1
+            except Exception as e:
+                # One bad row fails the whole multi-row statement; retry row by row to keep the rest
+                print(f"Batch write to {table} failed ({e}); retrying {len(rows)} rows individually")
+                self._write_rows(statement, rows, table, stats)
+        stats["seconds"] += time.perf_counter() - started
+        stats["rows"] += len(rows)
+
+    def _write_rows(self, statement, rows, table, stats):
+        for params in rows:
+            try:
+                self.cursor.execute(statement, params)
+            except Exception as e:
+                print(f"Error writing {table} row {params[:3]}: {e}")
+                stats["failed"] += 1
+                self._failed.append((table, params))
+            stats["statements"] += 1
+
+    def stats(self):
+        """Rows, statements and rows/sec per table"""
+        return {
+            table: {
+                **stats,
+                "seconds": round(stats["seconds"], 4),
+                "rows_per_second": round(stats["rows"] / stats["seconds"], 1) if stats["seconds"] else 0.0,
+            }
+            for table, stats in self._stats.items()
+        }
+
+    def report(self):
+        """Print the per-table write throughput"""
+        print(f"\nDB WRITES (batch size {self.batch_size})")
+        for table, stats in sorted(self.stats().items()):
+            print(f"  {table}: {stats['rows']} rows in {stats['statements']} statements, "
+                  f"{stats['seconds']:.3f}s ({stats['rows_per_second']} rows/sec)"
+                  + (f", {stats['failed']} failed" if stats["failed"] else ""))
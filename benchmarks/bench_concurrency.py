@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Concurrency Benchmark - Requests/sec against the running FastAPI backend
+
+Usage:
+    python benchmarks/bench_concurrency.py --label before --output before.json
+    (check out the new code, restart the backend)
+    python benchmarks/bench_concurrency.py --label after --compare before.json
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_ENDPOINTS = [
+    "/api/database_viewer",
+    "/api/database_table/players",
+    "/api/matches",
+    "/api/players",
+]
+
+def timed_get(url, timeout):
+    """GET a URL and return (latency_seconds, ok)"""
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            response.read()
+            ok = 200 <= response.status < 400
+    except (urllib.error.URLError, OSError):
+        ok = False
+    return time.perf_counter() - started, ok
+
+def run_benchmark(base_url, endpoints, concurrency, total_requests, timeout):
+    """Fire total_requests GETs (round-robin over endpoints) from `concurrency` clients"""
+    urls = [f"{base_url}{endpoints[i % len(endpoints)]}" for i in range(total_requests)]
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda url: timed_get(url, timeout), urls))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for latency, _ in results)
+    errors = sum(1 for _, ok in results if not ok)
+
+    return {
+        "concurrency": concurrency,
+        "requests": total_requests,
+        "errors": errors,
+        "elapsed_seconds": round(elapsed, 3),
+        "requests_per_second": round(total_requests / elapsed, 2),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure backend throughput under concurrent load")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--endpoint", action="append", dest="endpoints",
+                        help="Endpoint to hit (repeatable, default: mixed analytics/CRUD set)")
+    parser.add_argument("--label", default="run")
+    parser.add_argument("--output", help="Write results JSON to this file")
+    parser.add_argument("--compare", help="Results JSON from an earlier run to compare against")
+    args = parser.parse_args()
+
+    endpoints = args.endpoints or DEFAULT_ENDPOINTS
+
+    print("CONCURRENCY BENCHMARK")
+    print("=" * 50)
+    print(f"Target: {args.base_url}")
+    print(f"Clients: {args.concurrency}, Requests: {args.requests}")
+
+    # Warm up connections and caches so the first requests don't skew results
+    for endpoint in endpoints:
+        timed_get(f"{args.base_url}{endpoint}", args.timeout)
+
+    result = run_benchmark(args.base_url, endpoints, args.concurrency, args.requests, args.timeout)
+    result["label"] = args.label
+    result["endpoints"] = endpoints
+
+    for key in ["requests_per_second", "p50_ms", "p95_ms", "max_ms", "errors"]:
+        print(f"{key}: {result[key]}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        speedup = result["requests_per_second"] / baseline["requests_per_second"]
+        print(f"\n{baseline.get('label', 'baseline')}: {baseline['requests_per_second']} req/s")
+        print(f"{args.label}: {result['requests_per_second']} req/s")
+        print(f"Speedup: {speedup:.2f}x")
+
+    return 0 if result["errors"] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
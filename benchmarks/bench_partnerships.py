@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Partnerships Benchmark - match_scorecards self-join vs the linear pass in partnerships.py
+
+Scorecard rows are parsed from the bundled database backup and loaded into an
+in-memory SQLite database, so no server or MySQL is needed.
+
+Usage:
+    python benchmarks/bench_partnerships.py
+    python benchmarks/bench_partnerships.py --scale 1 4 16 --renumber
+"""
+
+import argparse
+import glob
+import os
+import re
+import sqlite3
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from partnerships import PARTNERSHIP_INSERT, PARTNERSHIPS_DDL, compute_partnerships
+from bench_serialization import ROOT, load_rows, time_it
+
+# The join queries 13/24 used before batting_partnerships existed (one direction only)
+SELF_JOIN_QUERY = """
+SELECT ms1.match_id, ms1.innings_id, ms1.batting_position, ms1.player_id, ms2.player_id,
+       ms1.runs, ms2.runs, ms1.runs + ms2.runs
+FROM match_scorecards ms1
+JOIN match_scorecards ms2 ON ms1.match_id = ms2.match_id
+    AND ms1.innings_id = ms2.innings_id
+    AND ABS(ms1.batting_position - ms2.batting_position) = 1
+WHERE ms1.batting_position < ms2.batting_position
+  AND ms1.player_id IS NOT NULL AND ms2.player_id IS NOT NULL
+"""
+
+ORDERED_ROWS_QUERY = """
+SELECT match_id, innings_id, batting_position, player_id, runs
+FROM match_scorecards
+WHERE innings_id IS NOT NULL AND batting_position IS NOT NULL AND player_id IS NOT NULL
+ORDER BY match_id, innings_id, batting_position, player_id
+"""
+
+
+def renumber_positions(rows):
+    """Give each innings batting positions 1..n in scorecard order, as populate_scorecards does"""
+    positions = {}
+    for row in sorted(rows, key=lambda row: row["scorecard_id"]):
+        key = (row["match_id"], row["innings_id"])
+        positions[key] = positions.get(key, 0) + 1
+        row["batting_position"] = positions[key]
+
+
+def build_database(rows, scale):
+    """In-memory match_scorecards holding scale copies of rows (copies get new match ids)"""
+    db = sqlite3.connect(":memory:")
+    db.execute("""
+    CREATE TABLE match_scorecards (
+        match_id INTEGER, innings_id INTEGER, player_id INTEGER, runs INTEGER, batting_position INTEGER
+    )
+    """)
+    offset = max(row["match_id"] for row in rows) + 1
+    db.executemany(
+        "INSERT INTO match_scorecards VALUES (?, ?, ?, ?, ?)",
+        [(row["match_id"] + copy * offset, row["innings_id"], row["player_id"], row["runs"], row["batting_position"])
+         for copy in range(scale) for row in rows]
+    )
+    db.execute("CREATE INDEX idx_match_innings ON match_scorecards (match_id, innings_id)")
+    db.commit()
+    return db
+
+
+def linear_pass(db):
+    return list(compute_partnerships(db.execute(ORDERED_ROWS_QUERY)))
+
+
+def sqlite_statements(ddl):
+    """PARTNERSHIPS_DDL as SQLite statements, keeping its primary and unique keys"""
+    indexes = re.findall(r"^\s*(UNIQUE )?(?:INDEX|KEY|UNIQUE KEY) (\w+) \((.*?)\),?$", ddl, re.M)
+    table = re.sub(r"^\s*(UNIQUE )?(INDEX|KEY|UNIQUE KEY) \w+ \(.*?\),?\n", "", ddl, flags=re.M)
+    table = re.sub(r",(\s*\))", r"\1", table.replace("BIGINT NOT NULL AUTO_INCREMENT", "INTEGER"))
+    return [table] + [f"CREATE {unique or ''}INDEX bp_{name} ON batting_partnerships ({columns})"
+                      for unique, name, columns in indexes]
+
+
+def check_table_keys(rows):
+    """Write the linear pass over the backup's own rows into batting_partnerships' keys
+
+    Uses the scorecards as they are (duplicated rows, unnumbered positions),
+    so a key the real data can violate fails here rather than in a rebuild.
+    """
+    db = build_database(rows, 1)
+    for statement in sqlite_statements(PARTNERSHIPS_DDL):
+        db.execute(statement)
+    partnerships = linear_pass(db)
+    try:
+        db.executemany(PARTNERSHIP_INSERT.replace("%s", "?"), partnerships)
+    except sqlite3.IntegrityError as e:
+        print(f"❌ batting_partnerships rejects the backup's partnerships: {e}")
+        sys.exit(1)
+    print(f"✅ {len(partnerships)} partnerships from the backup fit batting_partnerships' keys")
+    db.close()
+
+
+def main():
+    backups = sorted(glob.glob(os.path.join(ROOT, "cricket_database_backup_*.sql")))
+    parser = argparse.ArgumentParser(description="Benchmark partnership computation on backup scorecards")
+    parser.add_argument("--backup", default=backups[-1] if backups else None,
+                        help="Path to a cricket_database_backup_*.sql file")
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 4, 16],
+                        help="Copies of the scorecard history to benchmark on")
+    parser.add_argument("--renumber", action="store_true",
+                        help="Renumber batting positions 1..n per innings (the backup has mostly position 0)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per measurement (median reported)")
+    args = parser.parse_args()
+
+    if not args.backup or not os.path.exists(args.backup):
+        print("❌ No backup file found; pass --backup")
+        sys.exit(1)
+
+    rows = load_rows(args.backup, ["match_scorecards"])["match_scorecards"]
+    check_table_keys(rows)
+    if args.renumber:
+        renumber_positions(rows)
+
+    print(f"{'scale':>6} {'rows':>9} {'pairs':>8} {'self-join ms':>13} {'linear ms':>10} {'speedup':>8}")
+    for scale in args.scale:
+        db = build_database(rows, scale)
+        joined = db.execute(SELF_JOIN_QUERY).fetchall()
+        linear = linear_pass(db)
+        if sorted(joined) != sorted(linear):
+            print(f"❌ Results differ at scale {scale}: self-join {len(joined)} vs linear {len(linear)} pairs")
+            sys.exit(1)
+
+        join_ms = time_it(lambda: db.execute(SELF_JOIN_QUERY).fetchall(), args.repeat)
+        linear_ms = time_it(lambda: linear_pass(db), args.repeat)
+        total_rows = db.execute("SELECT COUNT(*) FROM match_scorecards").fetchone()[0]
+        print(f"{scale:>6} {total_rows:>9} {len(linear):>8} {join_ms:>13.2f} {linear_ms:>10.2f} "
+              f"{join_ms / linear_ms:>7.1f}x")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
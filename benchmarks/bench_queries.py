@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Query Benchmark - Latency, rows examined and result checksums for the 25 analytics queries
+
+Loads the bundled backup into a separate MySQL database (DB_CONFIG's server,
+database cricbuzz_bench by default), runs every query from get_all_queries()
+and compares against a stored baseline. Exits non-zero on a regression.
+
+Usage:
+    python benchmarks/bench_queries.py --update-baseline   (record benchmarks/query_baseline.json)
+    python benchmarks/bench_queries.py                      (compare against it)
+    python benchmarks/bench_queries.py --skip-load --runs 50 --query 13 --query 24
+"""
+
+import argparse
+import decimal
+import glob
+import hashlib
+import json
+import os
+import statistics
+import sys
+import time
+
+import mysql.connector
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import DB_CONFIG
+from import_database import import_database
+from query_cache import is_time_dependent
+from sql_queries import get_all_queries
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "query_baseline.json")
+
+
+def handler_reads(cursor):
+    """Session Handler_read_* counters (rows the storage engine was asked for)"""
+    cursor.execute("SHOW SESSION STATUS LIKE 'Handler_read%'")
+    return {name: int(value) for name, value in cursor.fetchall()}
+
+
+def rows_examined(cursor, query, overhead):
+    """Handler_read_* delta of one run of query, minus the cost of reading the counters"""
+    before = handler_reads(cursor)
+    cursor.execute(query)
+    cursor.fetchall()
+    after = handler_reads(cursor)
+    return max(sum(after.values()) - sum(before.values()) - overhead, 0)
+
+
+def checksum(rows):
+    """Order-insensitive SHA-256 of a result set (ties in ORDER BY may come back in any order)"""
+    def encode(value):
+        if isinstance(value, decimal.Decimal):
+            return str(value.normalize())
+        if isinstance(value, float):
+            return repr(round(value, 6))
+        return str(value)
+    lines = sorted("\x1f".join(encode(value) for value in row) for row in rows)
+    return hashlib.sha256("\n".join(lines).encode("utf-8")).hexdigest()
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[max(int(round(len(sorted_values) * fraction)) - 1, 0)]
+
+
+def bench_query(cursor, query, runs, overhead):
+    """Run query runs times (after one warm-up) and return its measurements"""
+    cursor.execute(query)
+    rows = cursor.fetchall()
+
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        cursor.execute(query)
+        cursor.fetchall()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+
+    return {
+        "rows": len(rows),
+        "p50_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(percentile(timings, 0.95), 3),
+        "rows_examined": rows_examined(cursor, query, overhead),
+        # Results of NOW()-relative queries drift with the clock, so they are not compared
+        "checksum": None if is_time_dependent(query) else checksum(rows),
+    }
+
+
+def compare(results, baseline, tolerance, min_ms):
+    """Return a list of regression messages (empty if none)"""
+    regressions = []
+    for number, result in results.items():
+        previous = baseline.get(number)
+        if previous is None:
+            continue
+        slower = result["p50_ms"] - previous["p50_ms"]
+        if slower > min_ms and result["p50_ms"] > previous["p50_ms"] * (1 + tolerance):
+            regressions.append(f"Query {number}: p50 {previous['p50_ms']} -> {result['p50_ms']} ms")
+        if result["rows_examined"] > previous["rows_examined"] * (1 + tolerance) + 100:
+            regressions.append(
+                f"Query {number}: rows examined {previous['rows_examined']} -> {result['rows_examined']}"
+            )
+        if result["checksum"] and previous.get("checksum") and result["checksum"] != previous["checksum"]:
+            regressions.append(f"Query {number}: result changed ({previous['rows']} -> {result['rows']} rows)")
+    return regressions
+
+
+def main():
+    backups = sorted(glob.glob(os.path.join(ROOT, "cricket_database_backup_*.sql")))
+    parser = argparse.ArgumentParser(description="Benchmark the analytics queries against the bundled backup")
+    parser.add_argument("--backup", default=backups[-1] if backups else None,
+                        help="Path to a cricket_database_backup_*.sql file")
+    parser.add_argument("--database", default="cricbuzz_bench",
+                        help="Database to load the backup into (never the app's own database)")
+    parser.add_argument("--skip-load", action="store_true", help="Reuse an already loaded --database")
+    parser.add_argument("--runs", type=int, default=20, help="Timed runs per query")
+    parser.add_argument("--query", type=int, action="append", dest="queries",
+                        help="Query number to run (repeatable, default: all 25)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed relative increase in p50 latency / rows examined")
+    parser.add_argument("--min-ms", type=float, default=2.0,
+                        help="Latency increases below this many ms are treated as noise")
+    args = parser.parse_args()
+
+    if args.database == DB_CONFIG.get('database'):
+        print("❌ --database must differ from DB_CONFIG's database (the backup import replaces its tables)")
+        return 1
+
+    db_config = {**DB_CONFIG, "database": args.database}
+    if not args.skip_load:
+        if not args.backup or not os.path.exists(args.backup):
+            print("❌ No backup file found; pass --backup")
+            return 1
+        if not import_database(args.backup, db_config):
+            return 1
+
+    queries = get_all_queries()
+    numbers = args.queries or sorted(queries)
+
+    connection = mysql.connector.connect(**db_config)
+    cursor = connection.cursor()
+
+    # Reading the counters touches a few rows itself; measure it once and subtract
+    first = handler_reads(cursor)
+    overhead = sum(handler_reads(cursor).values()) - sum(first.values())
+
+    print("\nQUERY BENCHMARK")
+    print("=" * 78)
+    print(f"{'#':>3} {'rows':>7} {'p50 ms':>9} {'p95 ms':>9} {'examined':>10}  title")
+    results = {}
+    for number in numbers:
+        query_info = queries[number]
+        result = bench_query(cursor, query_info['query'], args.runs, overhead)
+        results[str(number)] = result
+        print(f"{number:>3} {result['rows']:>7} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} "
+              f"{result['rows_examined']:>10}  {query_info['title']}")
+
+    cursor.close()
+    connection.close()
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nℹ️ No baseline at {args.baseline}; run with --update-baseline to record one")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance, args.min_ms)
+    if regressions:
+        print("\n❌ REGRESSIONS")
+        for message in regressions:
+            print(f"  {message}")
+        return 1
+    print(f"\n✅ No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Serialization Benchmark - JSON encode time and compressed size for table payloads
+
+Rows are parsed from the bundled database backup, so no server or MySQL is needed.
+
+Usage:
+    python benchmarks/bench_serialization.py
+    python benchmarks/bench_serialization.py --tables match_scorecards players --repeat 20
+"""
+
+import argparse
+import decimal
+import glob
+import json
+import os
+import re
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import serialization
+from compression import BROTLI_AVAILABLE, compress
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+INSERT_PATTERN = re.compile(r"^INSERT INTO `(\w+)` \((.*?)\) VALUES \((.*)\);$")
+VALUE_PATTERN = re.compile(r"'((?:[^'\\]|\\.)*)'|(NULL)|(-?\d+\.\d+)|(-?\d+)")
+ESCAPES = {"n": "\n", "r": "\r", "t": "\t", "0": "\0", "Z": "\x1a"}
+
+
+def unescape(text):
+    """Undo MySQL string escaping"""
+    return re.sub(r"\\(.)", lambda m: ESCAPES.get(m.group(1), m.group(1)), text)
+
+
+def load_rows(backup_path, tables):
+    """Parse INSERT statements for the given tables into lists of dict rows
+
+    DECIMAL values become decimal.Decimal, as mysql-connector returns them.
+    """
+    rows = {table: [] for table in tables}
+    with open(backup_path, encoding="utf-8") as f:
+        for line in f:
+            match = INSERT_PATTERN.match(line.strip())
+            if not match or match.group(1) not in rows:
+                continue
+            columns = [column.strip(" `") for column in match.group(2).split(",")]
+            values = []
+            for text, null, dec, integer in VALUE_PATTERN.findall(match.group(3)):
+                if null:
+                    values.append(None)
+                elif dec:
+                    values.append(decimal.Decimal(dec))
+                elif integer:
+                    values.append(int(integer))
+                else:
+                    values.append(unescape(text))
+            rows[match.group(1)].append(dict(zip(columns, values)))
+    return rows
+
+
+def stdlib_default(obj):
+    """What FastAPI's default path effectively does for Decimal / dates"""
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    return str(obj)
+
+
+def time_it(func, repeat):
+    """Median wall time of func() in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def bench_table(table, rows, repeat):
+    payload = {"table_name": table, "data": rows, "total_rows": len(rows)}
+    results = []
+
+    stdlib_ms = time_it(lambda: json.dumps(payload, default=stdlib_default), repeat)
+    body = json.dumps(payload, default=stdlib_default).encode("utf-8")
+    results.append(("json.dumps (stdlib, default separators)", stdlib_ms, len(body)))
+
+    for name in serialization.BACKENDS:
+        serialization.set_backend(name)
+        ms = time_it(lambda: serialization.dumps_bytes(payload), repeat)
+        results.append((f"serialization [{name}]", ms, len(serialization.dumps_bytes(payload))))
+    body = serialization.dumps_bytes(payload)
+
+    encodings = [("gzip", 1), ("gzip", 6)]
+    if BROTLI_AVAILABLE:
+        encodings += [("br", 4), ("br", 6)]
+    for encoding, level in encodings:
+        def run():
+            return compress(body, encoding, gzip_level=level, brotli_quality=level)
+        ms = time_it(run, repeat)
+        results.append((f"{encoding} level {level} (on {serialization.backend_name()} output)", ms, len(run())))
+
+    return results
+
+
+def main():
+    backups = sorted(glob.glob(os.path.join(ROOT, "cricket_database_backup_*.sql")))
+    parser = argparse.ArgumentParser(description="Benchmark JSON serialization and compression on backup data")
+    parser.add_argument("--backup", default=backups[-1] if backups else None,
+                        help="Path to a cricket_database_backup_*.sql file")
+    parser.add_argument("--tables", nargs="+", default=["match_scorecards", "players"])
+    parser.add_argument("--repeat", type=int, default=10, help="Timed runs per measurement (median reported)")
+    args = parser.parse_args()
+
+    if not args.backup or not os.path.exists(args.backup):
+        print("❌ No backup file found; pass --backup")
+        sys.exit(1)
+
+    rows = load_rows(args.backup, args.tables)
+    if not serialization.ORJSON_AVAILABLE:
+        print("ℹ️ orjson is not installed; only the stdlib backend is measured")
+    if not BROTLI_AVAILABLE:
+        print("ℹ️ brotli is not installed; only gzip is measured")
+
+    for table in args.tables:
+        print(f"\n📊 {table}: {len(rows[table])} rows")
+        print(f"{'step':<48} {'median ms':>10} {'bytes':>10}")
+        for label, ms, size in bench_table(table, rows[table], args.repeat):
+            print(f"{label:<48} {ms:>10.2f} {size:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Compression - Negotiated gzip/brotli response compression (ASGI middleware)
+Small bodies and Server-Sent Events streams are passed through untouched.
+"""
+
+import gzip
+import zlib
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Never compressed: SSE must reach the client event by event
+EXCLUDED_MEDIA_TYPES = ("text/event-stream",)
+
+
+def choose_encoding(accept_encoding):
+    """Pick "br" or "gzip" from an Accept-Encoding header, or None"""
+    offered = {}
+    for item in (accept_encoding or "").split(","):
+        parts = item.strip().split(";")
+        coding = parts[0].strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in parts[1:]:
+            name, _, value = param.strip().partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        offered[coding] = quality
+
+    candidates = []
+    if BROTLI_AVAILABLE:
+        candidates.append("br")
+    candidates.append("gzip")
+
+    best, best_quality = None, 0.0
+    for coding in candidates:
+        quality = offered.get(coding, offered.get("*", 0.0))
+        if quality > best_quality:  # ties keep the earlier (smaller output) coding
+            best, best_quality = coding, quality
+    return best
+
+
+def compress(body, encoding, gzip_level=6, brotli_quality=4):
+    """Compress a complete body with the given encoding"""
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+class StreamCompressor:
+    """Incremental compressor for streamed (chunked) responses"""
+
+    def __init__(self, encoding, gzip_level=6, brotli_quality=4):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, chunk):
+        if self.encoding == "br":
+            return self._compressor.process(chunk) + self._compressor.flush()
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+class CompressionMiddleware:
+    """Compress responses of at least minimum_size bytes for clients that accept it"""
+
+    def __init__(self, app, minimum_size=1024, gzip_level=6, brotli_quality=4, stats=None):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.stats = stats if stats is not None else {}
+        for counter in ("compressed", "passed_through", "bytes_in", "bytes_out"):
+            self.stats.setdefault(counter, 0)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for name, value in scope.get("headers", []):
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        encoding = choose_encoding(accept_encoding)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await self.app(scope, receive, _CompressingSender(self, send, encoding))
+
+
+class _CompressingSender:
+    """ASGI send wrapper that decides on the first body chunk whether to compress"""
+
+    def __init__(self, middleware, send, encoding):
+        self.middleware = middleware
+        self.send = send
+        self.encoding = encoding
+        self.start_message = None
+        self.mode = None  # None until decided, then "identity", "whole" or "stream"
+        self.stream = None
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        stats = self.middleware.stats
+
+        if self.mode is None:
+            self.mode = self._choose_mode(body, more_body)
+            if self.mode == "identity":
+                stats["passed_through"] += 1
+                await self.send(self.start_message)
+            elif self.mode == "whole":
+                compressed = compress(body, self.encoding, self.middleware.gzip_level,
+                                      self.middleware.brotli_quality)
+                self._set_headers(len(compressed))
+                stats["compressed"] += 1
+                stats["bytes_in"] += len(body)
+                stats["bytes_out"] += len(compressed)
+                await self.send(self.start_message)
+                await self.send({"type": "http.response.body", "body": compressed, "more_body": False})
+                return
+            else:
+                self.stream = StreamCompressor(self.encoding, self.middleware.gzip_level,
+                                               self.middleware.brotli_quality)
+                self._set_headers(None)
+                stats["compressed"] += 1
+                await self.send(self.start_message)
+
+        if self.mode == "identity":
+            await self.send(message)
+            return
+
+        chunk = self.stream.compress(body) if body else b""
+        if not more_body:
+            chunk += self.stream.finish()
+        stats["bytes_in"] += len(body)
+        stats["bytes_out"] += len(chunk)
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    def _choose_mode(self, body, more_body):
+        headers = {name.lower(): value for name, value in self.start_message.get("headers", [])}
+        content_type = headers.get(b"content-type", b"").decode("latin-1").lower()
+        if (self.start_message["status"] in (204, 304)
+                or b"content-encoding" in headers
+                or content_type.startswith(EXCLUDED_MEDIA_TYPES)):
+            return "identity"
+        if more_body:
+            return "stream"
+        if len(body) < self.middleware.minimum_size:
+            return "identity"
+        return "whole"
+
+    def _set_headers(self, content_length):
+        headers = [
+            (name, value) for name, value in self.start_message.get("headers", [])
+            if name.lower() not in (b"content-length", b"content-encoding")
+        ]
+        headers.append((b"content-encoding", self.encoding.encode("latin-1")))
+        headers.append((b"vary", b"Accept-Encoding"))
+        if content_length is not None:
+            headers.append((b"content-length", str(content_length).encode("latin-1")))
+        self.start_message = {**self.start_message, "headers": headers}
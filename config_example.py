@@ -12,3 +12,68 @@ RAPIDAPI_KEY = "your_rapidapi_key_here"  # Replace with your RapidAPI key
 RAPIDAPI_HOST = "cricbuzz-cricket.p.rapidapi.com"  # Replace if different
 BASE_URL = "https://cricbuzz-cricket.p.rapidapi.com/"  # Replace if different
 
+
+# MySQL connection pool (optional - defaults are used if omitted)
+DB_POOL_CONFIG = {
+    'pool_size': 10,  # Maximum connections held open by the backend
+    'borrow_timeout': 5.0,  # Seconds to wait for a free connection before failing
+    'recycle_seconds': 1800  # Reopen connections older than this
+}
+
+# Shared RapidAPI HTTP client (optional - defaults are used if omitted)
+RAPIDAPI_HTTP_CONFIG = {
+    'max_connections': 20,  # Connection cap towards the RapidAPI host
+    'max_keepalive_connections': 10,  # Idle connections kept open for reuse
+    'connect_timeout': 5.0,  # Seconds
+    'read_timeout': 15.0,  # Seconds
+    'max_retries': 3  # Retries for timeouts/5xx with jittered exponential backoff
+}
+
+# In-process API response cache in front of the api_cache table (optional)
+MEMORY_CACHE_CONFIG = {
+    'max_bytes': 64 * 1024 * 1024,  # Total serialized payload size held in memory
+    'max_entries': 1024  # Maximum number of cached endpoints
+}
+
+# Background refresh of hot endpoints (optional - defaults are used if omitted)
+REFRESH_SCHEDULER_CONFIG = {
+    'enabled': True,  # Set False when running several uvicorn workers except one
+    'quota_calls': 100,  # Upstream RapidAPI calls allowed per window (users + scheduler)
+    'quota_window_seconds': 3600,
+    'reserve_calls': 10,  # Calls the scheduler always leaves for on-demand requests
+    'refresh_ahead': 0.8  # Refresh when 80% of an entry's soft TTL has elapsed
+}
+
+# Live-match polling cadence by match state (seconds)
+LIVE_POLLING_CONFIG = {
+    'in_progress_seconds': 60,  # A match is in play
+    'break_seconds': 300,  # Innings break, stumps, lunch, tea, rain...
+    'dormant_seconds': 1800,  # Nothing live; doubles on each quiet poll...
+    'dormant_max_seconds': 3600,  # ...up to this cap
+    'wake_before_start_seconds': 300,  # Poll this long before the next upcoming match starts
+    'hard_ttl_factor': 3  # Stale live data stays servable for this many intervals
+}
+
+# JSON serialization and response compression
+RESPONSE_CONFIG = {
+    'json_backend': 'orjson',  # 'orjson' (pip install orjson) or 'json'
+    'compression_min_size': 1024,  # Bytes; smaller responses are sent uncompressed
+    'gzip_level': 6,
+    'brotli_quality': 4  # Used when the brotli package is installed
+}
+
+# Analytics query result cache (entries are also dropped when their tables change)
+ANALYTICS_CACHE_CONFIG = {
+    'max_age_seconds': 86400,
+    'time_dependent_max_age': 3600  # Queries using NOW()/CURDATE()
+}
+
+# Database population client (api_client.py)
+API_CLIENT_CONFIG = {
+    'max_workers': 4,  # RapidAPI requests in flight at once; DB writes stay sequential
+    'max_retries': 3,  # Retries of a request answered 429 (rate limited), with backoff
+    'backoff_base': 1.0,  # Seconds before the first 429 retry (doubles each time, jittered)
+    'batch_size': 500,  # Rows per multi-row upsert (1 = one statement per row)
+    'archive_dir': None,  # e.g. 'response_archive': keep raw responses for offline rebuilds (off by default)
+    'replay': False  # Serve calls from the archive instead of RapidAPI (same as --replay)
+}
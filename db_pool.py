@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+MySQL Connection Pool - Shared, health-checked connections for the FastAPI backend
+"""
+
+import asyncio
+import functools
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import mysql.connector
+from mysql.connector import Error
+
+
+class PoolExhaustedError(Error):
+    """Raised when no connection becomes available within the borrow timeout"""
+
+
+class PooledConnection:
+    """Proxy around a MySQL connection that returns itself to the pool on close()"""
+
+    def __init__(self, pool, connection, created_at):
+        self._pool = pool
+        self._connection = connection
+        self._created_at = created_at
+        self._released = False
+
+    def close(self):
+        """Return the connection to the pool instead of closing the socket"""
+        if not self._released:
+            self._released = True
+            self._pool.release(self._connection, self._created_at)
+
+    def discard(self):
+        """Close the socket and free the pool slot (e.g. with an unread result pending)"""
+        if not self._released:
+            self._released = True
+            self._pool.release(self._connection, self._created_at, discard=True)
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class LazyConnection:
+    """Connection handle that borrows from the pool on first use
+
+    Handed out by request dependencies, so a request holds no pool slot while
+    it waits for an executor worker; close() returns whatever was borrowed.
+    """
+
+    def __init__(self, pool):
+        self._pool = pool
+        self._connection = None
+
+    def close(self):
+        """Return the borrowed connection, if any (the handle can borrow again)"""
+        if self._connection is not None:
+            connection, self._connection = self._connection, None
+            connection.close()
+
+    def __getattr__(self, name):
+        if self._connection is None:
+            self._connection = self._pool.get_connection()
+        return getattr(self._connection, name)
+
+
+class ConnectionPool:
+    """Bounded pool of MySQL connections with health-check on borrow and recycling"""
+
+    def __init__(self, db_config, pool_size=10, borrow_timeout=5.0, recycle_seconds=1800):
+        self.db_config = dict(db_config)
+        self.pool_size = pool_size
+        self.borrow_timeout = borrow_timeout
+        self.recycle_seconds = recycle_seconds
+
+        self._idle = deque()  # (connection, created_at)
+        self._lock = threading.Condition()
+        self._in_use = 0
+        self._opened = 0
+
+        # Metrics
+        self._borrows = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._exhausted = 0
+        self._recycled = 0
+        self._health_check_failures = 0
+
+    def _open(self):
+        """Open a brand new server connection"""
+        return mysql.connector.connect(**self.db_config), time.monotonic()
+
+    def _discard(self, connection):
+        """Close a connection that is leaving the pool for good"""
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def _is_healthy(self, connection, created_at):
+        """Check age and liveness of an idle connection before handing it out"""
+        if self.recycle_seconds and time.monotonic() - created_at > self.recycle_seconds:
+            self._recycled += 1
+            return False
+        try:
+            connection.ping(reconnect=False)
+            return True
+        except Exception:
+            self._health_check_failures += 1
+            return False
+
+    def get_connection(self):
+        """Borrow a connection, waiting up to borrow_timeout if the pool is busy"""
+        started = time.monotonic()
+        deadline = started + self.borrow_timeout
+
+        with self._lock:
+            while not self._idle and self._in_use >= self.pool_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._exhausted += 1
+                    raise PoolExhaustedError(
+                        msg=f"Connection pool exhausted ({self.pool_size} connections in use)"
+                    )
+                self._lock.wait(remaining)
+
+            candidate = self._idle.popleft() if self._idle else None
+            self._in_use += 1
+
+        try:
+            connection, created_at = None, None
+            if candidate is not None:
+                if self._is_healthy(*candidate):
+                    connection, created_at = candidate
+                else:
+                    self._discard(candidate[0])
+            if connection is None:
+                connection, created_at = self._open()
+                with self._lock:
+                    self._opened += 1
+        except Exception:
+            with self._lock:
+                self._in_use -= 1
+                self._lock.notify()
+            raise
+
+        waited = time.monotonic() - started
+        with self._lock:
+            self._borrows += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+
+        return PooledConnection(self, connection, created_at)
+
+    def release(self, connection, created_at, discard=False):
+        """Give a borrowed connection back to the pool (or drop it if discard)"""
+        keep = False
+        if not discard:
+            try:
+                # Never hand the next borrower an open transaction
+                if connection.in_transaction:
+                    connection.rollback()
+                keep = connection.is_connected()
+            except Exception:
+                keep = False
+
+        with self._lock:
+            self._in_use -= 1
+            if keep and len(self._idle) < self.pool_size:
+                self._idle.append((connection, created_at))
+                connection = None
+            self._lock.notify()
+
+        if connection is not None:
+            self._discard(connection)
+
+    def close_all(self):
+        """Close every idle connection (used on application shutdown)"""
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+        for connection, _ in idle:
+            self._discard(connection)
+
+    def stats(self):
+        """Return pool metrics"""
+        with self._lock:
+            return {
+                "pool_size": self.pool_size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "borrows": self._borrows,
+                "connections_opened": self._opened,
+                "avg_wait_ms": round(self._total_wait / self._borrows * 1000, 3) if self._borrows else 0.0,
+                "max_wait_ms": round(self._max_wait * 1000, 3),
+                "exhausted_count": self._exhausted,
+                "recycled": self._recycled,
+                "health_check_failures": self._health_check_failures,
+                "recycle_seconds": self.recycle_seconds,
+            }
+
+
+class BlockingExecutor:
+    """Bounded thread pool that runs blocking database work off the event loop"""
+
+    def __init__(self, max_workers=10, thread_name_prefix="db"):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self._lock = threading.Lock()
+        self._active = 0
+        self._queued = 0
+        self._completed = 0
+
+    def _call(self, func, args, kwargs):
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+
+    async def run(self, func, *args, **kwargs):
+        """Run func(*args, **kwargs) on the pool and await its result"""
+        with self._lock:
+            self._queued += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._call, func, args, kwargs)
+
+    def offload(self, func):
+        """Decorator turning a blocking route handler into an awaitable one
+
+        functools.wraps keeps the original signature visible to FastAPI, so
+        path/query parameters and Depends() still resolve as before. Any
+        LazyConnection argument is returned to the pool as soon as the
+        handler finishes, before the worker takes its next job.
+        """
+        def call(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            finally:
+                for value in (*args, *kwargs.values()):
+                    if isinstance(value, LazyConnection):
+                        value.close()
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await self.run(call, *args, **kwargs)
+        return wrapper
+
+    def shutdown(self):
+        """Stop accepting work and wait for running jobs"""
+        self._executor.shutdown(wait=True)
+
+    def stats(self):
+        """Return executor metrics"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "active": self._active,
+                "queued": self._queued,
+                "completed": self._completed,
+            }
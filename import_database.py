@@ -6,11 +6,15 @@ Clears existing database and imports from backup file
 
 import mysql.connector
 from config import DB_CONFIG
+from table_versions import ALL_TABLES, ensure_table_versions, bump_table_versions
+from materialize import ensure_summary_tables, refresh_summaries
+from migrate import migrate_up
+from sync_state import ensure_sync_state, seed_sync_state
 import os
 import sys
 
-def import_database(backup_file):
-    """Import database from SQL backup file"""
+def import_database(backup_file, db_config=None):
+    """Import database from SQL backup file (into db_config's database, default DB_CONFIG)"""
     print("IMPORTING DATABASE")
     print("=" * 50)
     
@@ -18,10 +22,12 @@ def import_database(backup_file):
         print(f"Backup file not found: {backup_file}")
         return False
     
+    db_config = db_config or DB_CONFIG
+    
     try:
         # Connect to MySQL server without database first
-        db_name = DB_CONFIG.get('database', 'cricbuzz_livestats')
-        server_config = DB_CONFIG.copy()
+        db_name = db_config.get('database', 'cricbuzz_livestats')
+        server_config = db_config.copy()
         server_config.pop('database', None)  # Remove database from connection config
         
         connection = mysql.connector.connect(**server_config)
@@ -35,7 +41,7 @@ def import_database(backup_file):
         cursor.close()
         connection.close()
         
-        connection = mysql.connector.connect(**DB_CONFIG)
+        connection = mysql.connector.connect(**db_config)
         cursor = connection.cursor()
         
         print(f"Importing from: {backup_file}")
@@ -60,6 +66,20 @@ def import_database(backup_file):
                     print(f"Warning: {str(e)}")
                     continue
         
+        # The backup recreates its tables without the migration indexes
+        migrate_up(cursor, reset=True)
+        
+        # Summaries are derived data: rebuild them from the imported scorecards
+        ensure_summary_tables(cursor)
+        refresh_summaries(cursor)
+        
+        # Incremental syncs start from what the backup already holds
+        ensure_sync_state(cursor)
+        seed_sync_state(cursor)
+        
+        # Everything was replaced, so cached analytics results are stale
+        ensure_table_versions(cursor)
+        bump_table_versions(cursor, [ALL_TABLES])
         connection.commit()
         cursor.close()
         connection.close()
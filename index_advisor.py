@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Index Advisor - EXPLAINs the analytics queries and proposes composite/covering indexes
+Proposals can be written out as a new versioned migration (see migrate.py).
+
+Usage:
+    python index_advisor.py
+    python index_advisor.py --write-migration more_analytics_indexes
+"""
+
+import argparse
+import os
+import re
+import statistics
+import sys
+import time
+
+from migrate import MIGRATIONS_DIR, covering_index, load_migrations, table_columns, table_indexes
+
+# EXPLAIN access types that read the whole table or index
+FULL_SCAN_TYPES = ("ALL", "index")
+
+# Columns per proposed index; a table needing more than this gets no covering index
+MAX_INDEX_COLUMNS = 4
+
+SQL_KEYWORDS = {"ON", "WHERE", "JOIN", "LEFT", "RIGHT", "INNER", "OUTER", "CROSS", "GROUP",
+                "ORDER", "HAVING", "LIMIT", "USING", "AS", "UNION"}
+
+TABLE_REF = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.IGNORECASE)
+COLUMN_REF = re.compile(r"\b(\w+)\.(\w+)\b")
+EQUALITY = re.compile(r"\b(\w+)\.(\w+)\s*(?:=\s*(?:'[^']*'|\d+)|IN\s*\(|IS\s+NULL)", re.IGNORECASE)
+RANGE = re.compile(r"\b(\w+)\.(\w+)\s*(?:>=|<=|>|<|BETWEEN\b|LIKE\s+'[^%]|IS\s+NOT\s+NULL)", re.IGNORECASE)
+JOIN_EQUALITY = re.compile(r"\b(\w+)\.(\w+)\s*=\s*(\w+)\.(\w+)")
+WRAPPED_COLUMN = re.compile(r"\b(YEAR|MONTH|QUARTER|DATE|LOWER|UPPER|SUBSTRING)\(\s*(\w+)\.(\w+)\s*\)", re.IGNORECASE)
+
+
+def _clause(query, keyword, terminators):
+    """Text of the first `keyword` clause up to the next terminator keyword"""
+    match = re.search(rf"\b{keyword}\b(.*?)(?:\b(?:{'|'.join(terminators)})\b|;|$)", query,
+                      re.IGNORECASE | re.DOTALL)
+    return match.group(1) if match else ""
+
+
+def parse_query(query):
+    """Map each alias to its table and collect the columns used per role
+
+    Returns (aliases, roles) where roles maps a role (equality, range, join,
+    group, order, any) to {alias: [column, ...]} in order of appearance.
+    """
+    query = re.sub(r"--[^\n]*", "", query)
+    aliases = {}
+    for table, alias in TABLE_REF.findall(query):
+        if alias.upper() in SQL_KEYWORDS or not alias:
+            alias = table
+        aliases[alias] = table
+
+    where = _clause(query, "WHERE", ["GROUP BY", "ORDER BY", "HAVING", "LIMIT"])
+    group = _clause(query, "GROUP BY", ["HAVING", "ORDER BY", "LIMIT"])
+    order = _clause(query, "ORDER BY", ["LIMIT"])
+    joins = " ".join(re.findall(r"\bON\b(.*?)(?=\b(?:LEFT|RIGHT|INNER|JOIN|WHERE|GROUP|ORDER)\b|$)",
+                                query, re.IGNORECASE | re.DOTALL))
+
+    roles = {role: {} for role in ("equality", "range", "join", "group", "order", "any")}
+
+    def add(role, alias, column):
+        columns = roles[role].setdefault(alias, [])
+        if column not in columns:
+            columns.append(column)
+
+    for alias, column in EQUALITY.findall(where):
+        add("equality", alias, column)
+    for alias, column in RANGE.findall(where):
+        add("range", alias, column)
+    for left_alias, left_column, right_alias, right_column in JOIN_EQUALITY.findall(joins):
+        add("join", left_alias, left_column)
+        add("join", right_alias, right_column)
+    for alias, column in COLUMN_REF.findall(group):
+        add("group", alias, column)
+    for alias, column in COLUMN_REF.findall(order):
+        add("order", alias, column)
+    for alias, column in COLUMN_REF.findall(query):
+        if alias in aliases:
+            add("any", alias, column)
+    return aliases, roles
+
+
+def candidate_columns(alias, roles, driving):
+    """Index columns for alias: equality, then one range column, then GROUP BY / ORDER BY
+
+    The driving (first) table of the plan is looked up by its filters; a joined
+    table is looked up by its join columns first.
+    """
+    columns = [] if driving else list(roles["join"].get(alias, []))
+    columns += roles["equality"].get(alias, [])
+    columns += roles["range"].get(alias, [])[:1]
+    if driving:
+        columns += roles["group"].get(alias, []) + roles["order"].get(alias, [])
+    ordered = []
+    for column in columns:
+        if column not in ordered:
+            ordered.append(column)
+    return ordered
+
+
+def non_sargable(query):
+    """Columns wrapped in a function in the WHERE clause (an index on them can't be used for the filter)"""
+    where = _clause(query, "WHERE", ["GROUP BY", "ORDER BY", "HAVING", "LIMIT"])
+    return sorted({f"{function.upper()}({alias}.{column})" for function, alias, column in WRAPPED_COLUMN.findall(where)})
+
+
+def explain(cursor, query):
+    """EXPLAIN rows as dicts"""
+    cursor.execute(f"EXPLAIN {query.strip().rstrip(';')}")
+    names = [description[0] for description in cursor.description]
+    return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+
+def advise(cursor, queries, min_rows=0):
+    """Return (proposals, warnings) for the queries
+
+    A proposal is {"table", "columns", "covering", "queries", "reasons"}; one
+    is made for every table EXPLAIN shows being scanned in full or sorted via
+    a temporary table / filesort, unless an existing index already starts
+    with the proposed columns.
+    """
+    proposals = {}
+    warnings = []
+    index_cache = {}
+    column_cache = {}
+
+    for number, query_info in sorted(queries.items()):
+        query = query_info['query']
+        for wrapped in non_sargable(query):
+            warnings.append(f"Query {number}: {wrapped} in WHERE can't use an index on the column")
+
+        aliases, roles = parse_query(query)
+        for position, row in enumerate(explain(cursor, query)):
+            alias = row.get("table")
+            if alias not in aliases:
+                continue  # derived tables, <union...>
+            extra = row.get("Extra") or ""
+            scanned = row.get("type") in FULL_SCAN_TYPES
+            sorted_in_temp = "Using temporary" in extra or "Using filesort" in extra
+            if not (scanned or sorted_in_temp) or (row.get("rows") or 0) < min_rows:
+                continue
+
+            table = aliases[alias]
+            if table not in column_cache:
+                column_cache[table] = table_columns(cursor, table)
+                index_cache[table] = table_indexes(cursor, table)
+            columns = [column for column in candidate_columns(alias, roles, driving=position == 0)
+                       if column in column_cache[table]]
+            if not columns:
+                continue
+            columns = columns[:MAX_INDEX_COLUMNS]
+
+            # Covering: every column the query reads from this table fits in the index
+            used = [column for column in roles["any"].get(alias, []) if column in column_cache[table]]
+            covering = len(set(used) | set(columns)) <= MAX_INDEX_COLUMNS
+            if covering:
+                columns += [column for column in used if column not in columns]
+
+            if covering_index(index_cache[table], columns):
+                continue
+
+            key = (table, tuple(columns))
+            proposal = proposals.setdefault(key, {
+                "table": table, "columns": list(columns), "covering": covering, "queries": [], "reasons": []
+            })
+            proposal["queries"].append(number)
+            proposal["reasons"].append(f"type={row.get('type')} rows={row.get('rows')} {extra}".strip())
+
+    # An index that is a prefix of another proposal on the same table is redundant
+    result = []
+    for (table, columns), proposal in proposals.items():
+        longer = [key for key in proposals
+                  if key[0] == table and len(key[1]) > len(columns) and key[1][:len(columns)] == columns]
+        if longer:
+            proposals[longer[0]]["queries"] += proposal["queries"]
+            continue
+        result.append(proposal)
+    return sorted(result, key=lambda proposal: (proposal["table"], proposal["columns"])), warnings
+
+
+def index_name(proposal):
+    return f"idx_{proposal['table']}_{'_'.join(proposal['columns'])}"[:64]
+
+
+def write_migration(proposals, name):
+    """Write proposals as migrations/NNNN_name.py and return its path"""
+    versions = [version for version, _, _ in load_migrations()]
+    version = (max(versions) if versions else 0) + 1
+    path = os.path.join(MIGRATIONS_DIR, f"{version:04d}_{name}.py")
+    lines = [
+        '"""',
+        "Indexes proposed by index_advisor.py",
+        '"""',
+        "",
+        "from migrate import create_index, drop_index",
+        "",
+        "INDEXES = [",
+    ]
+    for proposal in proposals:
+        queries = "/".join(str(number) for number in sorted(set(proposal["queries"])))
+        lines.append(f"    # Queries {queries}{' (covering)' if proposal['covering'] else ''}")
+        lines.append(f"    ({proposal['table']!r}, {index_name(proposal)!r}, {tuple(proposal['columns'])!r}),")
+    lines += [
+        "]",
+        "",
+        "",
+        "def upgrade(cursor):",
+        "    for table, name, columns in INDEXES:",
+        "        create_index(cursor, table, name, columns)",
+        "",
+        "",
+        "def downgrade(cursor):",
+        "    for table, name, _ in reversed(INDEXES):",
+        "        drop_index(cursor, table, name)",
+        "",
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+    return path
+
+
+def time_queries(cursor, queries, runs=5):
+    """Median wall time in ms of each query (after one warm-up run)"""
+    timings = {}
+    for number, query_info in sorted(queries.items()):
+        cursor.execute(query_info['query'])
+        cursor.fetchall()
+        samples = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            cursor.execute(query_info['query'])
+            cursor.fetchall()
+            samples.append((time.perf_counter() - started) * 1000)
+        timings[number] = statistics.median(samples)
+    return timings
+
+
+def main():
+    import mysql.connector
+    from config import DB_CONFIG
+    from sql_queries import get_all_queries
+
+    parser = argparse.ArgumentParser(description="Propose indexes for the analytics queries")
+    parser.add_argument("--min-rows", type=int, default=0,
+                        help="Ignore scans EXPLAIN estimates at fewer rows than this")
+    parser.add_argument("--write-migration", metavar="NAME", help="Write the proposals as migrations/NNNN_NAME.py")
+    args = parser.parse_args()
+
+    connection = mysql.connector.connect(**DB_CONFIG)
+    cursor = connection.cursor()
+    proposals, warnings = advise(cursor, get_all_queries(), args.min_rows)
+    cursor.close()
+    connection.close()
+
+    print("INDEX ADVISOR")
+    print("=" * 60)
+    if not proposals:
+        print("No new indexes proposed")
+    for proposal in proposals:
+        queries = ", ".join(str(number) for number in sorted(set(proposal["queries"])))
+        kind = "covering " if proposal["covering"] else ""
+        print(f"\n{proposal['table']} ({', '.join(proposal['columns'])}) - {kind}index for queries {queries}")
+        for reason in sorted(set(proposal["reasons"])):
+            print(f"    {reason}")
+
+    if warnings:
+        print("\nNon-sargable predicates:")
+        for warning in warnings:
+            print(f"  {warning}")
+
+    if args.write_migration and proposals:
+        print(f"\nMigration written to {write_migration(proposals, args.write_migration)}")
+        print("Apply it with: python migrate.py up --timings")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Live Polling Engine - Picks the live-match poll interval from match state
+Polls aggressively during play, slows down in breaks and goes dormant when
+nothing is live (waking up ahead of the next scheduled start).
+"""
+
+import threading
+import time
+
+PHASE_IN_PROGRESS = "in_progress"
+PHASE_BREAK = "break"
+PHASE_DORMANT = "dormant"
+
+# Cricbuzz matchInfo.state values (lower-cased) mapped to a polling phase
+STATE_PHASES = {
+    "in progress": PHASE_IN_PROGRESS,
+    "innings break": PHASE_BREAK,
+    "stumps": PHASE_BREAK,
+    "lunch": PHASE_BREAK,
+    "tea": PHASE_BREAK,
+    "drinks": PHASE_BREAK,
+    "rain": PHASE_BREAK,
+    "delay": PHASE_BREAK,
+    "toss": PHASE_BREAK,
+}
+
+# Most active phase wins when several matches are on
+PHASE_ORDER = [PHASE_IN_PROGRESS, PHASE_BREAK, PHASE_DORMANT]
+
+
+def classify_match_state(state):
+    """Map a match's state string to a polling phase"""
+    return STATE_PHASES.get(str(state or "").strip().lower(), PHASE_DORMANT)
+
+
+class LivePollingEngine:
+    """Tracks the current live phase and derives poll interval and cache TTLs"""
+
+    def __init__(self, in_progress_seconds=60, break_seconds=300, dormant_seconds=1800,
+                 dormant_max_seconds=3600, wake_before_start_seconds=300, hard_ttl_factor=3):
+        self.intervals = {
+            PHASE_IN_PROGRESS: in_progress_seconds,
+            PHASE_BREAK: break_seconds,
+            PHASE_DORMANT: dormant_seconds,
+        }
+        self.dormant_max_seconds = dormant_max_seconds
+        self.wake_before_start_seconds = wake_before_start_seconds
+        self.hard_ttl_factor = hard_ttl_factor
+
+        self._lock = threading.Lock()
+        self.phase = PHASE_DORMANT
+        self.dormant_polls = 0
+        self.next_start = None  # epoch seconds of the earliest upcoming match
+        self.phase_counts = {phase: 0 for phase in PHASE_ORDER}
+        self.phase_changes = 0
+
+    def observe(self, data):
+        """Update the phase from a normalized {"matches": [...]} live payload
+
+        Returns True when the phase changed.
+        """
+        matches = data.get("matches", []) if isinstance(data, dict) else []
+        phases = {classify_match_state(match.get("state")) for match in matches}
+        phase = next((p for p in PHASE_ORDER if p in phases), PHASE_DORMANT)
+
+        with self._lock:
+            changed = phase != self.phase
+            if changed:
+                self.phase_changes += 1
+            self.phase = phase
+            self.phase_counts[phase] += 1
+            self.dormant_polls = self.dormant_polls + 1 if phase == PHASE_DORMANT else 0
+            return changed
+
+    def observe_upcoming(self, data):
+        """Remember the earliest future start time from the upcoming-matches payload"""
+        matches = data.get("matches", []) if isinstance(data, dict) else []
+        now = time.time()
+        starts = []
+        for match in matches:
+            try:
+                start = int(match.get("startDate") or 0) / 1000
+            except (TypeError, ValueError):
+                continue
+            if start > now:
+                starts.append(start)
+        with self._lock:
+            self.next_start = min(starts) if starts else None
+
+    def next_interval(self):
+        """Seconds until the live feed should be polled again"""
+        with self._lock:
+            if self.phase != PHASE_DORMANT:
+                return self.intervals[self.phase]
+
+            # Dormant: back off the longer nothing is live, but wake before the next start
+            interval = min(self.intervals[PHASE_DORMANT] * (2 ** max(self.dormant_polls - 1, 0)),
+                           self.dormant_max_seconds)
+            if self.next_start is not None:
+                until_start = self.next_start - time.time() - self.wake_before_start_seconds
+                interval = min(interval, max(until_start, self.intervals[PHASE_IN_PROGRESS]))
+            return interval
+
+    def cache_ttls(self):
+        """(soft, hard) TTLs for the live cache entry matching the poll cadence"""
+        soft = int(self.next_interval())
+        return soft, soft * self.hard_ttl_factor
+
+    def is_active(self):
+        """True while a match is in progress or in a break"""
+        return self.phase != PHASE_DORMANT
+
+    def stats(self):
+        """Return polling metrics"""
+        soft, hard = self.cache_ttls()
+        with self._lock:
+            return {
+                "phase": self.phase,
+                "next_interval_seconds": soft,
+                "hard_ttl_seconds": hard,
+                "dormant_polls": self.dormant_polls,
+                "next_scheduled_start": self.next_start,
+                "phase_observations": dict(self.phase_counts),
+                "phase_changes": self.phase_changes,
+            }
@@ -1,17 +1,128 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request, Query
+from fastapi.responses import StreamingResponse, JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
 import mysql.connector
 from mysql.connector import Error
-import requests
+import httpx
 import json
+import re
+import asyncio
+import hashlib
+import time
+from email.utils import formatdate, parsedate_to_datetime
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from config import DB_CONFIG
+from db_pool import ConnectionPool, BlockingExecutor, LazyConnection
+from rapidapi_client import RapidAPIClient
+from memory_cache import LRUCache
+from singleflight import SingleFlight
+from refresh_scheduler import QuotaBudget, RefreshJob, RefreshScheduler
+from live_polling import LivePollingEngine
+from match_feed import LiveBroadcaster, SnapshotStore
+from compression import CompressionMiddleware
+from table_paging import PagingError, load_table_schema, build_page_query, next_cursor
+from streaming_export import EXPORT_MEDIA_TYPES, is_read_only, stream_export
+from arrow_transport import ARROW_STREAM_MEDIA_TYPE, wants_arrow, rows_to_arrow_ipc
+from table_versions import ALL_TABLES, ensure_table_versions, bump_table_versions, get_table_versions
+from query_cache import QueryResultCache
+from materialize import SUMMARY_TABLES, ensure_summary_tables, needs_rebuild, refresh_summaries
+import serialization
 
-app = FastAPI(title="Cricbuzz LiveStats API", version="1.0.0")
+try:
+    from config import DB_POOL_CONFIG
+except ImportError:
+    DB_POOL_CONFIG = {}
+
+try:
+    from config import RAPIDAPI_HTTP_CONFIG
+except ImportError:
+    RAPIDAPI_HTTP_CONFIG = {}
+
+try:
+    from config import MEMORY_CACHE_CONFIG
+except ImportError:
+    MEMORY_CACHE_CONFIG = {}
+
+try:
+    from config import REFRESH_SCHEDULER_CONFIG
+except ImportError:
+    REFRESH_SCHEDULER_CONFIG = {}
+
+try:
+    from config import LIVE_POLLING_CONFIG
+except ImportError:
+    LIVE_POLLING_CONFIG = {}
+
+try:
+    from config import RESPONSE_CONFIG
+except ImportError:
+    RESPONSE_CONFIG = {}
+
+try:
+    from config import ANALYTICS_CACHE_CONFIG
+except ImportError:
+    ANALYTICS_CACHE_CONFIG = {}
+
+# JSON backend for responses and api_cache blobs (orjson when installed)
+if RESPONSE_CONFIG.get('json_backend'):
+    serialization.set_backend(RESPONSE_CONFIG['json_backend'])
+
+# Shared MySQL connection pool (size, borrow timeout and recycle age come from config.py)
+db_pool = ConnectionPool(DB_CONFIG, **DB_POOL_CONFIG)
+
+# L1 cache of decoded payloads; the api_cache table is the shared L2 tier
+memory_cache = LRUCache(**MEMORY_CACHE_CONFIG)
+
+# Concurrent cache misses for the same key share one L2 lookup / upstream fetch
+cache_fills = SingleFlight()
+
+# Blocking DB work runs here, one worker per pooled connection. Route handlers
+# borrow theirs inside the worker (get_db hands out a LazyConnection), so a
+# request queued for a worker holds no connection; a worker only waits on the
+# pool while streaming exports or the startup jobs have connections out.
+db_executor = BlockingExecutor(max_workers=db_pool.pool_size)
+
+# Analytics query results, invalidated through table_versions when their tables change
+analytics_cache = QueryResultCache(**ANALYTICS_CACHE_CONFIG)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup/shutdown hooks"""
+    await db_executor.run(ensure_cache_schema)
+    await db_executor.run(ensure_summaries)
+    if REFRESH_SCHEDULER_CONFIG.get('enabled', True):
+        refresh_scheduler.start()
+    yield
+    await refresh_scheduler.stop()
+    await rapidapi.aclose()
+    db_executor.shutdown()
+    db_pool.close_all()
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with the configured serialization backend"""
+    
+    def render(self, content: Any) -> bytes:
+        return serialization.dumps_bytes(content)
+
+app = FastAPI(title="Cricbuzz LiveStats API", version="1.0.0", lifespan=lifespan,
+              default_response_class=FastJSONResponse)
+
+# Response compression counters (see /api/metrics)
+compression_stats = {}
+
+# gzip/brotli for responses above the size threshold; SSE streams are left alone
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=RESPONSE_CONFIG.get('compression_min_size', 1024),
+    gzip_level=RESPONSE_CONFIG.get('gzip_level', 6),
+    brotli_quality=RESPONSE_CONFIG.get('brotli_quality', 4),
+    stats=compression_stats
+)
 
 # CORS middleware
 app.add_middleware(
@@ -28,13 +139,24 @@ RAPIDAPI_HOST = "cricbuzz-cricket.p.rapidapi.com"
 BASE_URL = "https://cricbuzz-cricket.p.rapidapi.com/"
 
 def get_db_connection():
-    """Get database connection"""
+    """Borrow a database connection from the pool (close() returns it)"""
     try:
-        connection = mysql.connector.connect(**DB_CONFIG)
-        return connection
+        return db_pool.get_connection()
     except Error as e:
         raise HTTPException(status_code=500, detail=f"Database connection failed: {str(e)}")
 
+def get_db():
+    """FastAPI dependency lending a pooled connection to a db_executor.offload handler
+
+    The connection is borrowed on first use, inside the executor worker, and
+    returned when the handler finishes (or at the latest when the request ends).
+    """
+    conn = LazyConnection(db_pool)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
 def get_rapidapi_headers():
     """Get RapidAPI headers"""
     return {
@@ -43,68 +165,226 @@ def get_rapidapi_headers():
         "Accept": "application/json"
     }
 
-def check_cache(endpoint: str, cache_key: str = "default") -> Optional[Dict]:
-    """Check if data exists in cache and is not expired"""
+# Upstream calls made in the last window (on-demand, scheduled and player lookups alike)
+quota_budget = QuotaBudget(
+    max_calls=REFRESH_SCHEDULER_CONFIG.get('quota_calls', 100),
+    window_seconds=REFRESH_SCHEDULER_CONFIG.get('quota_window_seconds', 3600)
+)
+
+# Shared keep-alive HTTP client for every RapidAPI call made by the routes below;
+# it counts each request it sends against quota_budget
+rapidapi = RapidAPIClient(BASE_URL, get_rapidapi_headers(), on_request=quota_budget.record,
+                          **RAPIDAPI_HTTP_CONFIG)
+
+# cache_key -> (endpoint, soft TTL, hard TTL) for the hot, shared endpoints
+# (live_matches TTLs are only the starting point; live_poller adjusts them to match state)
+CACHE_POLICIES = {
+    "live_matches": ("matches/v1/live", 300, 900),
+    "upcoming_matches": ("matches/v1/upcoming", 600, 3600),
+    "recent_matches": ("matches/v1/recent", 900, 3600),
+    "top_stats": ("stats/v1/topstats", 1200, 7200),
+    "schedule": ("schedule/v1/international", 1800, 7200),
+}
+
+# Poll cadence for the live feed: fast during play, slower in breaks, dormant otherwise
+live_poller = LivePollingEngine(**LIVE_POLLING_CONFIG)
+
+# Pushes live-match changes from each upstream poll to every /api/live_matches/stream viewer
+live_broadcaster = LiveBroadcaster()
+
+# Versioned match lists behind the ?since= delta mode of the match routes
+match_snapshots = SnapshotStore()
+
+# Responses to conditional-request-aware routes (see conditional_response)
+conditional_stats = {"not_modified": 0, "full_responses": 0}
+
+# Seconds between SSE keep-alive comments on an idle stream
+STREAM_KEEPALIVE_SECONDS = 15
+
+def ensure_cache_schema():
+    """Create api_cache (adding newer columns to older tables) and table_versions if needed"""
+    try:
+        conn = get_db_connection()
+    except HTTPException as e:
+        print(f"Cache schema error: {e.detail}")
+        return
+    
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS api_cache (
+            endpoint VARCHAR(255) NOT NULL,
+            cache_key VARCHAR(255) NOT NULL,
+            response_json LONGTEXT,
+            last_fetched TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            ttl_seconds INT DEFAULT 3600,
+            hard_ttl_seconds INT NULL,
+            content_hash CHAR(32) NULL,
+            content_changed_at TIMESTAMP NULL,
+            PRIMARY KEY (endpoint, cache_key)
+        )
+        """)
+        for column, definition in [("hard_ttl_seconds", "INT NULL"),
+                                   ("content_hash", "CHAR(32) NULL"),
+                                   ("content_changed_at", "TIMESTAMP NULL")]:
+            cursor.execute("""
+            SELECT COUNT(*) FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'api_cache'
+              AND COLUMN_NAME = %s
+            """, (column,))
+            if cursor.fetchone()[0] == 0:
+                cursor.execute(f"ALTER TABLE api_cache ADD COLUMN {column} {definition}")
+                print(f"Added {column} column to api_cache")
+        ensure_table_versions(cursor)
+        conn.commit()
+        cursor.close()
+    except Error as e:
+        print(f"Cache schema error: {e}")
+    finally:
+        conn.close()
+
+def ensure_summaries():
+    """Create the materialized summary tables, filling them if scorecards exist but were never summarized"""
+    try:
+        conn = get_db_connection()
+    except HTTPException as e:
+        print(f"Summary tables error: {e.detail}")
+        return
+    
+    try:
+        cursor = conn.cursor()
+        ensure_summary_tables(cursor)
+        if needs_rebuild(cursor):
+            print("Building batting summaries from match_scorecards...")
+            refresh_summaries(cursor)
+            bump_table_versions(cursor, SUMMARY_TABLES)
+        conn.commit()
+        cursor.close()
+    except Error as e:
+        print(f"Summary tables error: {e}")
+    finally:
+        conn.close()
+
+def content_hash(body: bytes) -> str:
+    """Stable hash of a serialized payload, used as its ETag"""
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+def check_cache(endpoint: str, cache_key: str = "default") -> Optional[Tuple[Dict, int, int, int, Dict]]:
+    """Check if data exists in cache and is within its hard TTL
+
+    ttl_seconds is the soft TTL; rows without hard_ttl_seconds have no stale window.
+    Returns (data, seconds_until_stale, seconds_until_expiry, payload_bytes, validators)
+    or None, where validators holds the entry's etag, last_modified (epoch seconds)
+    and body (the serialized payload, sent as is).
+    """
     try:
         conn = get_db_connection()
+    except HTTPException as e:
+        print(f"Cache check error: {e.detail}")
+        return None
+    
+    try:
         cursor = conn.cursor(dictionary=True)
         
+        # Age is computed by the server so it matches last_fetched's clock
         query = """
-        SELECT response_json, last_fetched, ttl_seconds 
+        SELECT response_json, ttl_seconds,
+               COALESCE(hard_ttl_seconds, ttl_seconds) AS hard_ttl_seconds,
+               TIMESTAMPDIFF(SECOND, last_fetched, NOW()) AS age_seconds,
+               content_hash,
+               UNIX_TIMESTAMP(COALESCE(content_changed_at, last_fetched)) AS last_modified
         FROM api_cache 
         WHERE endpoint = %s AND cache_key = %s
         """
         cursor.execute(query, (endpoint, cache_key))
         result = cursor.fetchone()
+        cursor.close()
         
         if result:
-            last_fetched = result['last_fetched']
-            ttl_seconds = result['ttl_seconds']
+            soft_remaining = result['ttl_seconds'] - result['age_seconds']
+            hard_remaining = max(result['hard_ttl_seconds'], result['ttl_seconds']) - result['age_seconds']
             
-            # Check if cache is still valid
-            if datetime.now() - last_fetched < timedelta(seconds=ttl_seconds):
-                return json.loads(result['response_json'])
+            # Servable until the hard TTL; past the soft TTL it is stale
+            if hard_remaining > 0:
+                response_json = result['response_json']
+                body = response_json.encode("utf-8")
+                validators = {
+                    "etag": result['content_hash'] or content_hash(body),
+                    "last_modified": int(result['last_modified']),
+                    "body": body
+                }
+                return serialization.loads(response_json), soft_remaining, hard_remaining, len(response_json), validators
         
-        cursor.close()
-        conn.close()
         return None
         
     except Error as e:
         print(f"Cache check error: {e}")
         return None
+    finally:
+        conn.close()
 
-def save_to_cache(endpoint: str, cache_key: str, data: Dict, ttl_seconds: int = 3600):
-    """Save data to cache"""
+def save_to_cache(endpoint: str, cache_key: str, data: Dict, ttl_seconds: int = 3600,
+                  hard_ttl_seconds: Optional[int] = None) -> Tuple[int, Dict]:
+    """Save data to cache and return the serialized payload size and its validators"""
+    body = serialization.dumps_bytes(data, sort_keys=True)
+    response_json = body.decode("utf-8")
+    validators = {"etag": content_hash(body), "last_modified": int(time.time()), "body": body}
     try:
         conn = get_db_connection()
+    except HTTPException as e:
+        print(f"Cache save error: {e.detail}")
+        return len(response_json), validators
+    
+    try:
         cursor = conn.cursor()
         
+        # content_changed_at only moves when the hash does (it must be assigned before content_hash)
         query = """
-        INSERT INTO api_cache (endpoint, cache_key, response_json, ttl_seconds)
-        VALUES (%s, %s, %s, %s)
+        INSERT INTO api_cache (endpoint, cache_key, response_json, ttl_seconds, hard_ttl_seconds,
+                               content_hash, content_changed_at)
+        VALUES (%s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
         ON DUPLICATE KEY UPDATE
         response_json = VALUES(response_json),
         last_fetched = CURRENT_TIMESTAMP,
-        ttl_seconds = VALUES(ttl_seconds)
+        ttl_seconds = VALUES(ttl_seconds),
+        hard_ttl_seconds = VALUES(hard_ttl_seconds),
+        content_changed_at = IF(content_hash <=> VALUES(content_hash), content_changed_at, CURRENT_TIMESTAMP),
+        content_hash = VALUES(content_hash)
         """
-        cursor.execute(query, (endpoint, cache_key, json.dumps(data), ttl_seconds))
+        cursor.execute(query, (endpoint, cache_key, response_json, ttl_seconds, hard_ttl_seconds,
+                               validators["etag"]))
+        cursor.execute(
+            "SELECT UNIX_TIMESTAMP(content_changed_at) FROM api_cache WHERE endpoint = %s AND cache_key = %s",
+            (endpoint, cache_key)
+        )
+        changed_at = cursor.fetchone()
+        if changed_at and changed_at[0] is not None:
+            validators["last_modified"] = int(changed_at[0])
         conn.commit()
         
         cursor.close()
-        conn.close()
         
     except Error as e:
         print(f"Cache save error: {e}")
+    finally:
+        conn.close()
+    
+    return len(response_json), validators
+
+QUOTA_EXCEEDED_MESSAGE = "API quota exceeded. Please try again later."
 
-def fetch_from_rapidapi(endpoint: str) -> Dict:
-    """Fetch data from RapidAPI"""
+async def fetch_from_rapidapi(endpoint: str) -> Dict:
+    """Fetch data from RapidAPI
+
+    Raises HTTPException (429 when the quota is exceeded) instead of returning
+    a payload, so no refresh path ever caches an upstream failure.
+    """
     try:
-        url = f"{BASE_URL}{endpoint}"
-        response = requests.get(url, headers=get_rapidapi_headers())
+        response = await rapidapi.get(endpoint)
         
         # Handle API quota exceeded
         if response.status_code == 429:
-            return {"matches": [], "message": "API quota exceeded. Please try again later."}
+            raise HTTPException(status_code=429, detail=QUOTA_EXCEEDED_MESSAGE)
         
         response.raise_for_status()
         
@@ -170,27 +450,249 @@ def fetch_from_rapidapi(endpoint: str) -> Dict:
             return {"matches": matches}
         
         return data
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(status_code=500, detail=f"RapidAPI request failed: {str(e)}")
 
-def get_cached_or_fetch(endpoint: str, cache_key: str = "default", ttl_seconds: int = 3600) -> Dict:
-    """Get data from cache or fetch from RapidAPI - ON DEMAND ONLY"""
-    # Check cache first
-    cached_data = check_cache(endpoint, cache_key)
-    if cached_data:
+async def get_cached_or_fetch(endpoint: str, cache_key: str = "default", ttl_seconds: int = 3600,
+                              hard_ttl_seconds: Optional[int] = None) -> Dict:
+    """Get data from cache or fetch from RapidAPI - ON DEMAND ONLY
+
+    ttl_seconds is the soft TTL. Between it and hard_ttl_seconds the stale
+    payload is returned immediately and refreshed in the background; past
+    the hard TTL the request waits for a synchronous fetch.
+    """
+    data, _ = await get_cached_entry(endpoint, cache_key, ttl_seconds, hard_ttl_seconds)
+    return data
+
+async def get_cached_entry(endpoint: str, cache_key: str, ttl_seconds: int,
+                           hard_ttl_seconds: Optional[int]) -> Tuple[Dict, Optional[Dict]]:
+    """get_cached_or_fetch that also returns the entry's validators (etag, last_modified)
+
+    validators is None for the uncached placeholder served when nothing is
+    cached and the upstream quota is exceeded.
+    """
+    # L1: decoded payload held in this process, no database round trip
+    memory_key = (endpoint, cache_key)
+    found = memory_cache.lookup(memory_key)
+    if found is not None:
+        cached_data, is_fresh, validators = found
+        if not is_fresh:
+            revalidate_in_background(endpoint, cache_key, ttl_seconds, hard_ttl_seconds)
+        return cached_data, validators
+    
+    return await cache_fills.do(memory_key, lambda: fill_cache(endpoint, cache_key, ttl_seconds, hard_ttl_seconds))
+
+async def get_match_list(cache_key: str, since: Optional[int] = None) -> Tuple[Dict, Optional[Dict]]:
+    """Match list for a CACHE_POLICIES key, tagged with its snapshot version
+
+    With since, only the matches added, changed or removed after that version
+    are returned (or the full list with "full": true if since is too old).
+    Returns (payload, validators); deltas carry no validators.
+    """
+    data, validators = await get_cached_entry_policy(cache_key)
+    if validators is None:
+        # Quota placeholder: not a snapshot of the match list
+        return data, None
+    version = match_snapshots.record(cache_key, data)
+    if since is None:
+        return {**data, "version": version}, versioned_validators(cache_key, validators, version)
+    return match_snapshots.delta(cache_key, since), None
+
+# cache_key -> (entry validators, version, validators of the version-tagged body)
+versioned_entries = {}
+
+def versioned_validators(cache_key: str, validators: Dict, version: int) -> Dict:
+    """Validators for an entry's body with its snapshot version appended
+
+    Built once per entry and version: the stored body gets the version spliced
+    in before its closing brace and the tag gets the version as a suffix.
+    """
+    found = versioned_entries.get(cache_key)
+    if found and found[0] is validators and found[1] == version:
+        return found[2]
+    body = validators["body"]  # a compact JSON object, so it ends with its closing brace
+    versioned = {
+        **validators,
+        "etag": f"{validators['etag']}-{version}",
+        "body": body[:-1] + (b"," if body != b"{}" else b"") + b'"version":%d}' % version
+    }
+    versioned_entries[cache_key] = (validators, version, versioned)
+    return versioned
+
+def conditional_response(request: Request, data: Dict, validators: Optional[Dict]):
+    """Return data with ETag/Last-Modified, or an empty 304 if the client's copy is current
+
+    With validators, the body and tag stored alongside the cache entry are
+    sent as they are; data is only serialized for responses without them.
+    """
+    if not validators:
+        return data
+    
+    # Weak tag: the gzip, br and identity encodings of the body all carry it
+    etag = f'W/"{validators["etag"]}"'
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(validators["last_modified"], usegmt=True),
+        "Cache-Control": "no-cache"
+    }
+    
+    # If-None-Match wins; If-Modified-Since is only consulted without it
+    not_modified = False
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        tags = [tag[2:] if tag.startswith("W/") else tag for tag in tags]
+        not_modified = etag[2:] in tags or "*" in tags
+    elif "if-modified-since" in request.headers:
+        try:
+            modified_since = parsedate_to_datetime(request.headers["if-modified-since"]).timestamp()
+            not_modified = validators["last_modified"] <= modified_since
+        except (TypeError, ValueError):
+            pass
+    
+    if not_modified:
+        conditional_stats["not_modified"] += 1
+        return Response(status_code=304, headers=headers)
+    conditional_stats["full_responses"] += 1
+    return Response(content=validators["body"], media_type="application/json", headers=headers)
+
+def policy_ttls(cache_key: str) -> Tuple[int, int]:
+    """Current (soft, hard) TTLs for a CACHE_POLICIES key; the live feed follows live_poller"""
+    if cache_key == "live_matches":
+        return live_poller.cache_ttls()
+    _, ttl_seconds, hard_ttl_seconds = CACHE_POLICIES[cache_key]
+    return ttl_seconds, hard_ttl_seconds
+
+async def get_cached_or_fetch_policy(cache_key: str) -> Dict:
+    """get_cached_or_fetch for a key listed in CACHE_POLICIES"""
+    data, _ = await get_cached_entry_policy(cache_key)
+    return data
+
+async def get_cached_entry_policy(cache_key: str) -> Tuple[Dict, Optional[Dict]]:
+    """get_cached_entry for a key listed in CACHE_POLICIES"""
+    endpoint = CACHE_POLICIES[cache_key][0]
+    ttl_seconds, hard_ttl_seconds = policy_ttls(cache_key)
+    return await get_cached_entry(endpoint, cache_key, ttl_seconds, hard_ttl_seconds)
+
+async def fill_cache(endpoint: str, cache_key: str, ttl_seconds: int,
+                     hard_ttl_seconds: Optional[int]) -> Tuple[Dict, Optional[Dict]]:
+    """Resolve an L1 miss from api_cache or RapidAPI (run once per key via cache_fills)"""
+    memory_key = (endpoint, cache_key)
+    
+    # L2: api_cache table shared by all workers
+    cached = await db_executor.run(check_cache, endpoint, cache_key)
+    if cached:
+        cached_data, soft_remaining, hard_remaining, size, validators = cached
         print(f"Using cached data for {endpoint} (saved API call)")
-        return cached_data
+        memory_cache.set(memory_key, cached_data, soft_remaining, size, hard_remaining, validators)
+        if soft_remaining <= 0:
+            # This fill is the in-flight call for the key; refresh once it has returned
+            cache_fills.after(memory_key, lambda: revalidate_in_background(
+                endpoint, cache_key, ttl_seconds, hard_ttl_seconds))
+        return cached_data, validators
     
     # Only fetch from RapidAPI when explicitly requested
     print(f"Fetching from RapidAPI for {endpoint} (on-demand call)")
-    data = fetch_from_rapidapi(endpoint)
+    try:
+        return await refresh_cache(endpoint, cache_key, ttl_seconds, hard_ttl_seconds)
+    except HTTPException as e:
+        if e.status_code != 429:
+            raise
+        # Nothing cached to fall back on: answer with an empty list, but don't cache it
+        return {"matches": [], "message": QUOTA_EXCEEDED_MESSAGE}, None
+
+async def refresh_cache(endpoint: str, cache_key: str, ttl_seconds: int,
+                        hard_ttl_seconds: Optional[int]) -> Tuple[Dict, Dict]:
+    """Fetch from RapidAPI and write the result through both cache tiers"""
+    data = await fetch_from_rapidapi(endpoint)
+    ttl_seconds, hard_ttl_seconds = observe_match_state(cache_key, data, ttl_seconds, hard_ttl_seconds)
     
     # Save to cache for future on-demand requests
-    save_to_cache(endpoint, cache_key, data, ttl_seconds)
+    size, validators = await db_executor.run(save_to_cache, endpoint, cache_key, data, ttl_seconds, hard_ttl_seconds)
+    memory_cache.set((endpoint, cache_key), data, ttl_seconds, size, hard_ttl_seconds, validators)
+    
+    return data, validators
+
+def observe_match_state(cache_key: str, data: Dict, ttl_seconds: int,
+                        hard_ttl_seconds: Optional[int]) -> Tuple[int, Optional[int]]:
+    """Feed fresh match payloads to live_poller and return the TTLs to cache them under"""
+    if cache_key == "upcoming_matches":
+        live_poller.observe_upcoming(data)
+        if not live_poller.is_active():
+            reschedule_live_poll()
+    elif cache_key == "live_matches":
+        live_broadcaster.update(data)
+        if live_poller.observe(data):
+            print(f"Live polling phase is now {live_poller.phase}")
+            reschedule_live_poll()
+        return live_poller.cache_ttls()
+    return ttl_seconds, hard_ttl_seconds
+
+def reschedule_live_poll():
+    """Pull the scheduled live poll forward if the new cadence wants it sooner"""
+    job = refresh_scheduler.jobs.get("live_matches")
+    if job is None:
+        return
+    job.next_run = min(job.next_run, time.monotonic() + live_poller.next_interval())
+    refresh_scheduler.wake()
+
+def revalidate_in_background(endpoint: str, cache_key: str, ttl_seconds: int, hard_ttl_seconds: Optional[int]):
+    """Start a background refresh of a stale entry unless one is already running"""
+    memory_key = (endpoint, cache_key)
+    if cache_fills.in_flight(memory_key):
+        return
     
+    async def revalidate():
+        try:
+            await cache_fills.do(memory_key, lambda: refresh_cache(endpoint, cache_key, ttl_seconds, hard_ttl_seconds))
+            print(f"Revalidated stale cache for {endpoint}")
+        except Exception as e:
+            print(f"Background refresh failed for {endpoint}: {e}")
+    
+    asyncio.ensure_future(revalidate())
+
+async def scheduled_refresh(job: RefreshJob) -> Dict:
+    """Refresh callback for the background scheduler (joins any in-flight user fetch)
+
+    Upstream failures raise, so the scheduler counts them and backs off.
+    """
+    job.ttl_seconds, job.hard_ttl_seconds = policy_ttls(job.cache_key)
+    data, validators = await cache_fills.do(
+        (job.endpoint, job.cache_key),
+        lambda: refresh_cache(job.endpoint, job.cache_key, job.ttl_seconds, job.hard_ttl_seconds)
+    )
+    if validators is None:
+        # Joined an on-demand fill that got the uncached quota placeholder
+        raise HTTPException(status_code=429, detail=QUOTA_EXCEEDED_MESSAGE)
     return data
 
+async def seconds_until_stale(job: RefreshJob) -> Optional[float]:
+    """How long the cached entry for a job stays fresh (None if nothing is cached)"""
+    cached = await db_executor.run(check_cache, job.endpoint, job.cache_key)
+    return cached[1] if cached else None
 
+def next_refresh_interval(job: RefreshJob, data: Dict) -> Optional[float]:
+    """Poll the live feed on live_poller's cadence, with top priority while a match is on"""
+    if job.cache_key != "live_matches":
+        return None
+    
+    # live_poller already saw this payload in refresh_cache
+    job.priority = 0 if live_poller.is_active() else job.base_priority
+    job.idle_polls = live_poller.dormant_polls
+    return live_poller.next_interval()
+
+refresh_scheduler = RefreshScheduler(
+    jobs=[
+        RefreshJob(cache_key, endpoint, ttl, hard_ttl, priority=index)
+        for index, (cache_key, (endpoint, ttl, hard_ttl)) in enumerate(CACHE_POLICIES.items())
+    ],
+    refresh_func=scheduled_refresh,
+    budget=quota_budget,
+    peek_func=seconds_until_stale,
+    interval_func=next_refresh_interval,
+    refresh_ahead=REFRESH_SCHEDULER_CONFIG.get('refresh_ahead', 0.8),
+    reserve_calls=REFRESH_SCHEDULER_CONFIG.get('reserve_calls', 10)
+)
 
 
 # API Endpoints
@@ -199,74 +701,153 @@ def get_cached_or_fetch(endpoint: str, cache_key: str = "default", ttl_seconds:
 async def root():
     return {"message": "Cricbuzz LiveStats API", "version": "1.0.0", "auto_reload": "✅ WORKING"}
 
+@app.get("/api/metrics")
+async def get_metrics():
+    """Runtime metrics for the backend (connection pool, DB executor, RapidAPI client, caches)"""
+    return {
+        "db_pool": db_pool.stats(),
+        "db_executor": db_executor.stats(),
+        "rapidapi": rapidapi.stats(),
+        "memory_cache": memory_cache.stats(),
+        "cache_fills": cache_fills.stats(),
+        "refresh_scheduler": refresh_scheduler.stats(),
+        "live_polling": live_poller.stats(),
+        "live_broadcaster": live_broadcaster.stats(),
+        "match_snapshots": match_snapshots.stats(),
+        "conditional_requests": dict(conditional_stats),
+        "analytics_cache": analytics_cache.stats(),
+        "responses": {"json_backend": serialization.backend_name(), **compression_stats}
+    }
+
 
 @app.get("/api/live_matches")
-async def get_live_matches():
-    """Get live matches - ON DEMAND ONLY"""
+async def get_live_matches(request: Request, since: Optional[int] = None):
+    """Get live matches - ON DEMAND ONLY (?since=<version> returns only the changes)"""
     try:
-        # Short cache time since we only want on-demand calls (5 minutes)
-        data = get_cached_or_fetch("matches/v1/live", "live_matches", 300)
-        return data
+        # TTL follows match state (live_poller): ~1 minute during play, much longer when nothing is live
+        data, validators = await get_match_list("live_matches", since)
+        return conditional_response(request, data, validators)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+def sse_event(event: str, data: Dict, event_id: Optional[int] = None) -> str:
+    """Format one Server-Sent Events message"""
+    id_line = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{id_line}event: {event}\ndata: {serialization.dumps(data)}\n\n"
+
+@app.get("/api/live_matches/stream")
+async def stream_live_matches(request: Request):
+    """Server-Sent Events feed of live match changes
+
+    Sends a "snapshot" event with the full match list, then a "changes" event
+    (added matches, matchScore/state/status deltas keyed by matchId, removed
+    matchIds) whenever the shared live poll sees something new. Every event
+    carries its version as the SSE id; a client reconnecting with
+    Last-Event-ID gets only the changes it missed instead of a new snapshot.
+    """
+    queue = live_broadcaster.subscribe()
+    try:
+        if live_broadcaster.matches is None:
+            live_broadcaster.seed(await get_cached_or_fetch_policy("live_matches"))
     except Exception as e:
+        live_broadcaster.unsubscribe(queue)
         raise HTTPException(status_code=500, detail=str(e))
+    
+    try:
+        last_event_id = int(request.headers.get("last-event-id", ""))
+    except ValueError:
+        last_event_id = None
+    missed = live_broadcaster.events_since(last_event_id) if last_event_id is not None else None
+    
+    async def events():
+        try:
+            if missed is None:
+                sent_version = live_broadcaster.version
+                yield sse_event("snapshot", {"version": sent_version, "matches": live_broadcaster.matches},
+                                sent_version)
+            else:
+                sent_version = last_event_id
+                for event in missed:
+                    sent_version = event["version"]
+                    yield sse_event("changes", event, sent_version)
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if event is None:
+                    break  # fell too far behind; the client reconnects for a new snapshot
+                if event["version"] <= sent_version:
+                    continue  # already sent from the history
+                sent_version = event["version"]
+                yield sse_event("changes", event, sent_version)
+        finally:
+            live_broadcaster.unsubscribe(queue)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @app.get("/api/upcoming_matches")
-async def get_upcoming_matches():
-    """Get upcoming matches - ON DEMAND ONLY"""
+async def get_upcoming_matches(request: Request, since: Optional[int] = None):
+    """Get upcoming matches - ON DEMAND ONLY (?since=<version> returns only the changes)"""
     try:
-        # Short cache time since we only want on-demand calls (10 minutes)
-        data = get_cached_or_fetch("matches/v1/upcoming", "upcoming_matches", 600)
-        return data
+        # 10 minutes fresh, served stale up to 1 hour (see CACHE_POLICIES); kept warm by refresh_scheduler
+        data, validators = await get_match_list("upcoming_matches", since)
+        return conditional_response(request, data, validators)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/recent_matches")
-async def get_recent_matches():
-    """Get recent matches - ON DEMAND ONLY"""
+async def get_recent_matches(request: Request, since: Optional[int] = None):
+    """Get recent matches - ON DEMAND ONLY (?since=<version> returns only the changes)"""
     try:
-        # Short cache time since we only want on-demand calls (15 minutes)
-        data = get_cached_or_fetch("matches/v1/recent", "recent_matches", 900)
-        return data
+        # 15 minutes fresh, served stale up to 1 hour (see CACHE_POLICIES); kept warm by refresh_scheduler
+        data, validators = await get_match_list("recent_matches", since)
+        return conditional_response(request, data, validators)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/top_player_stats")
-async def get_top_player_stats():
+async def get_top_player_stats(request: Request):
     """Get top player statistics - ON DEMAND ONLY"""
     try:
-        # Short cache time since we only want on-demand calls (20 minutes)
-        data = get_cached_or_fetch("stats/v1/topstats", "top_stats", 1200)
-        return data
+        # 20 minutes fresh, served stale up to 2 hours (see CACHE_POLICIES); kept warm by refresh_scheduler
+        data, validators = await get_cached_entry_policy("top_stats")
+        return conditional_response(request, data, validators)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/player_stats/{player_id}")
-async def get_player_stats(player_id: str):
+async def get_player_stats(player_id: str, request: Request):
     """Get specific player statistics - ON DEMAND ONLY"""
     try:
-        # Short cache time since we only want on-demand calls (30 minutes)
-        data = get_cached_or_fetch(f"stats/v1/player/{player_id}", f"player_{player_id}", 1800)
-        return data
+        # Short cache time since we only want on-demand calls (30 minutes fresh, served stale up to 2 hours)
+        data, validators = await get_cached_entry(f"stats/v1/player/{player_id}", f"player_{player_id}", 1800, 7200)
+        return conditional_response(request, data, validators)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/schedule")
-async def get_schedule():
+async def get_schedule(request: Request):
     """Get match schedule - ON DEMAND ONLY"""
     try:
-        # Short cache time since we only want on-demand calls (30 minutes)
-        data = get_cached_or_fetch("schedule/v1/international", "schedule", 1800)
-        return data
+        # 30 minutes fresh, served stale up to 2 hours (see CACHE_POLICIES); kept warm by refresh_scheduler
+        data, validators = await get_cached_entry_policy("schedule")
+        return conditional_response(request, data, validators)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/database_viewer")
-async def get_database_viewer():
+@db_executor.offload
+def get_database_viewer(conn=Depends(get_db)):
     """Get database contents for viewing"""
     try:
-        conn = get_db_connection()
         cursor = conn.cursor(dictionary=True)
         
         # Get all table counts
@@ -282,7 +863,6 @@ async def get_database_viewer():
                 table_counts[table] = 0
         
         cursor.close()
-        conn.close()
         
         return {
             "summary": table_counts
@@ -292,86 +872,165 @@ async def get_database_viewer():
         raise HTTPException(status_code=500, detail=f"Database query failed: {str(e)}")
 
 @app.get("/api/database_tables")
-async def get_database_tables():
+@db_executor.offload
+def get_database_tables(conn=Depends(get_db)):
     """Get list of all database tables"""
     try:
-        conn = get_db_connection()
         cursor = conn.cursor()
         
         cursor.execute("SHOW TABLES")
         tables = [row[0] for row in cursor.fetchall()]
         
         cursor.close()
-        conn.close()
         
         return {"tables": tables}
         
     except Error as e:
         raise HTTPException(status_code=500, detail=f"Database query failed: {str(e)}")
 
+# Tables the table browser may read
+BROWSABLE_TABLES = ['matches', 'teams', 'venues', 'series', 'players', 'player_stats', 'match_scorecards']
+
+# Largest page /api/database_table will return
+MAX_PAGE_SIZE = 1000
+
 @app.get("/api/database_table/{table_name}")
-async def get_database_table(table_name: str):
-    """Get data from a specific database table"""
+@db_executor.offload
+def get_database_table(table_name: str, request: Request, limit: int = 100, cursor: Optional[str] = None,
+                       columns: Optional[str] = None, sort: Optional[str] = None,
+                       order: str = "asc", conn=Depends(get_db)):
+    """Get one page of a database table
+
+    Pages are keyset-paginated on the primary key: pass next_cursor back as
+    ?cursor= for the following page. ?columns=a,b projects columns (primary
+    key columns are always included) and ?sort= orders by an indexed column.
+    Column metadata is only returned with the first page. With Accept:
+    application/vnd.apache.arrow.stream the page is an Arrow stream and the
+    other fields travel in its schema metadata.
+    """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        
         # Validate table name to prevent SQL injection
-        allowed_tables = ['matches', 'teams', 'venues', 'series', 'players', 'player_stats']
-        if table_name not in allowed_tables:
+        if table_name not in BROWSABLE_TABLES:
             raise HTTPException(status_code=400, detail="Invalid table name")
+        if order.lower() not in ("asc", "desc"):
+            raise HTTPException(status_code=400, detail="order must be asc or desc")
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        requested_columns = [column.strip() for column in columns.split(",") if column.strip()] if columns else None
+        
+        db_cursor = conn.cursor(dictionary=True)
+        schema = load_table_schema(db_cursor, table_name)
+        
+        try:
+            query, params, selected = build_page_query(
+                table_name, schema, requested_columns, sort, order.lower() == "desc", cursor, limit
+            )
+        except PagingError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        arrow = wants_arrow(request.headers.get("accept"))
+        if arrow:
+            # Plain tuples straight into columns; no per-row dicts
+            row_cursor = conn.cursor()
+            row_cursor.execute(query, params)
+            data = row_cursor.fetchall()
+            row_cursor.close()
+        else:
+            db_cursor.execute(query, params)
+            data = db_cursor.fetchall()
         
-        cursor.execute(f"SELECT * FROM {table_name}")
-        data = cursor.fetchall()
-        
-        # Get column information
-        cursor.execute(f"DESCRIBE {table_name}")
-        columns = cursor.fetchall()
-        
-        cursor.close()
-        conn.close()
+        has_more = len(data) > limit
+        data = data[:limit]
+        last_row = (dict(zip(selected, data[-1])) if arrow else data[-1]) if data else None
         
-        return {
+        result = {
             "table_name": table_name,
-            "columns": columns,
-            "data": data,
-            "total_rows": len(data)
+            "page_rows": len(data),
+            "selected_columns": selected,
+            "next_cursor": next_cursor(last_row, schema, sort) if has_more else None,
+            "has_more": has_more
         }
         
+        if cursor is None:
+            # InnoDB's row estimate; an exact COUNT(*) would scan the whole table
+            db_cursor.execute("""
+            SELECT TABLE_ROWS FROM information_schema.TABLES
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+            """, (table_name,))
+            estimate = db_cursor.fetchone()
+            result["columns"] = schema["columns"]
+            result["primary_key"] = schema["primary_key"]
+            result["sortable_columns"] = schema["sortable"]
+            result["estimated_total_rows"] = estimate["TABLE_ROWS"] if estimate else None
+        
+        db_cursor.close()
+        
+        if arrow:
+            return Response(rows_to_arrow_ipc(selected, data, result), media_type=ARROW_STREAM_MEDIA_TYPE)
+        
+        # Rendered directly, skipping FastAPI's per-row jsonable_encoder pass
+        result["data"] = data
+        return FastJSONResponse(result)
+        
     except Error as e:
         raise HTTPException(status_code=500, detail=f"Database query failed: {str(e)}")
 
 
 @app.get("/api/analytics/run_query/{query_number}")
-async def run_analytics_query(query_number: int):
-    """Run predefined analytics query by number (1-25) - Database queries only"""
+@db_executor.offload
+def run_analytics_query(query_number: int, request: Request, conn=Depends(get_db)):
+    """Run predefined analytics query by number (1-25) - Database queries only
+
+    Results are cached until one of the query's tables gets a new version.
+    Send Accept: application/vnd.apache.arrow.stream for a columnar Arrow
+    stream instead of JSON rows.
+    """
     try:
         # Get the query from sql_queries
-        from sql_queries import get_query_by_number
+        from sql_queries import get_query
         
-        query_info = get_query_by_number(query_number)
+        query_info = get_query(query_number)
         if not query_info:
             raise HTTPException(status_code=404, detail=f"Query {query_number} not found")
         
-        # Execute the query on database (no API calls)
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute(query_info['query'])
-        data = cursor.fetchall()
+        cursor = conn.cursor()
+        
+        # Versions are read in the same snapshot the query will see
+        try:
+            versions = get_table_versions(cursor, query_info['tables'])
+        except Error as e:
+            print(f"Table versions unavailable, skipping analytics cache: {e}")
+            versions = None
         
+        cached = analytics_cache.get(query_number, versions) if versions is not None else None
+        if cached:
+            columns, rows = cached
+        else:
+            # Execute the query on database (no API calls)
+            cursor.execute(query_info['query'])
+            rows = cursor.fetchall()
+            columns = [description[0] for description in cursor.description]
+            if versions is not None:
+                analytics_cache.set(query_number, versions, columns, rows, query_info['query'])
         cursor.close()
-        conn.close()
         
-        return {
+        result = {
             "query_number": query_number,
             "title": query_info['title'],
             "description": query_info['description'],
             "category": query_info['category'],
             "query": query_info['query'],
-            "data": data,
-            "total_rows": len(data)
+            "total_rows": len(rows),
+            "cached": cached is not None
         }
         
+        if wants_arrow(request.headers.get("accept")):
+            return Response(rows_to_arrow_ipc(columns, rows, result), media_type=ARROW_STREAM_MEDIA_TYPE)
+        
+        result["data"] = [dict(zip(columns, row)) for row in rows]
+        return FastJSONResponse(result)
+        
+    except HTTPException:
+        raise
     except ImportError:
         raise HTTPException(status_code=500, detail="SQL queries module not found")
     except Error as e:
@@ -380,7 +1039,7 @@ async def run_analytics_query(query_number: int):
         raise HTTPException(status_code=500, detail=f"Error executing query: {str(e)}")
 
 @app.post("/api/analytics/populate_data/{query_number}")
-async def populate_query_data(query_number: int):
+def populate_query_data(query_number: int):
     """Populate data for a specific query number"""
     try:
         from api_client import ComprehensiveAPIClient
@@ -426,13 +1085,13 @@ async def populate_query_data(query_number: int):
         raise HTTPException(status_code=500, detail=f"Error populating data for query {query_number}: {str(e)}")
 
 @app.post("/api/analytics/populate_all_tables")
-async def populate_all_tables():
-    """Populate all database tables with fresh data"""
+def populate_all_tables(incremental: bool = False):
+    """Populate all database tables with fresh data (incremental: only fetch what is new)"""
     try:
         from api_client import ComprehensiveAPIClient
         
         client = ComprehensiveAPIClient()
-        result = client.run_comprehensive_population()
+        result = client.run_comprehensive_population(incremental=incremental)
         
         return {
             "status": "success",
@@ -444,7 +1103,7 @@ async def populate_all_tables():
         raise HTTPException(status_code=500, detail=f"Error populating all tables: {str(e)}")
 
 @app.post("/api/analytics/update_teams")
-async def update_teams():
+def update_teams():
     """Update only teams table"""
     try:
         from api_client import ComprehensiveAPIClient
@@ -458,7 +1117,7 @@ async def update_teams():
         raise HTTPException(status_code=500, detail=f"Error updating teams: {str(e)}")
 
 @app.post("/api/analytics/update_players")
-async def update_players():
+def update_players():
     """Update only players table"""
     try:
         from api_client import ComprehensiveAPIClient
@@ -472,7 +1131,7 @@ async def update_players():
         raise HTTPException(status_code=500, detail=f"Error updating players: {str(e)}")
 
 @app.post("/api/analytics/update_venues")
-async def update_venues():
+def update_venues():
     """Update only venues table"""
     try:
         from api_client import ComprehensiveAPIClient
@@ -486,7 +1145,7 @@ async def update_venues():
         raise HTTPException(status_code=500, detail=f"Error updating venues: {str(e)}")
 
 @app.post("/api/analytics/update_matches")
-async def update_matches():
+def update_matches():
     """Update only matches table"""
     try:
         from api_client import ComprehensiveAPIClient
@@ -500,7 +1159,7 @@ async def update_matches():
         raise HTTPException(status_code=500, detail=f"Error updating matches: {str(e)}")
 
 @app.post("/api/analytics/update_series")
-async def update_series():
+def update_series():
     """Update only series table"""
     try:
         from api_client import ComprehensiveAPIClient
@@ -514,7 +1173,7 @@ async def update_series():
         raise HTTPException(status_code=500, detail=f"Error updating series: {str(e)}")
 
 @app.post("/api/analytics/populate_recent_matches")
-async def populate_recent_matches():
+def populate_recent_matches():
     """Populate recent matches data for Queries 2 and 10"""
     try:
         from api_client import ComprehensiveAPIClient
@@ -528,7 +1187,7 @@ async def populate_recent_matches():
         raise HTTPException(status_code=500, detail=f"Error populating recent matches: {str(e)}")
 
 @app.post("/api/analytics/populate_2024_series")
-async def populate_2024_series_endpoint():
+def populate_2024_series_endpoint():
     """Populate 2024 series data from archives"""
     try:
         from api_client import ComprehensiveAPIClient
@@ -542,10 +1201,10 @@ async def populate_2024_series_endpoint():
         raise HTTPException(status_code=500, detail=f"Error populating 2024 series: {str(e)}")
 
 @app.post("/api/database_query")
-async def execute_database_query(request: dict):
+@db_executor.offload
+def execute_database_query(request: dict, conn=Depends(get_db)):
     """Execute a custom SQL query"""
     try:
-        conn = get_db_connection()
         cursor = conn.cursor(dictionary=True)
         
         # Extract query from request
@@ -561,7 +1220,6 @@ async def execute_database_query(request: dict):
             # For SHOW/DESCRIBE commands, fetch all results
             data = cursor.fetchall()
             cursor.close()
-            conn.close()
             
             return {
                 "query": query,
@@ -573,7 +1231,6 @@ async def execute_database_query(request: dict):
             # For SELECT queries, fetch data
             data = cursor.fetchall()
             cursor.close()
-            conn.close()
             
             return {
                 "query": query,
@@ -583,10 +1240,22 @@ async def execute_database_query(request: dict):
             }
         else:
             # For non-SELECT queries, commit and return success message
-            conn.commit()
             affected_rows = cursor.rowcount
+            # The target tables aren't parsed, so every cached analytics result is invalidated
+            if re.search(r"\b(match_scorecards|matches)\b", query, re.IGNORECASE):
+                try:
+                    refresh_summaries(cursor)
+                except Error as e:
+                    # The rebuild deletes summary rows before re-inserting them, so
+                    # committing after a failure would leave them emptied
+                    conn.rollback()
+                    raise HTTPException(
+                        status_code=500,
+                        detail=f"Query rolled back: batting summaries could not be refreshed: {str(e)}"
+                    )
+            bump_table_versions(cursor, [ALL_TABLES])
+            conn.commit()
             cursor.close()
-            conn.close()
             
             return {
                 "query": query,
@@ -601,13 +1270,89 @@ async def execute_database_query(request: dict):
         raise HTTPException(status_code=500, detail=f"Database query failed: {str(e)}")
 
 
+# Rows held in memory at a time by the streaming export endpoints
+EXPORT_CHUNK_ROWS = 5000
+
+def get_table_schema(table_name: str) -> Dict:
+    """Cached column / key metadata for a table (see table_paging)"""
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor(dictionary=True)
+        schema = load_table_schema(cursor, table_name)
+        cursor.close()
+        return schema
+    finally:
+        conn.close()
+
+async def start_export(query: str, fmt: str, filename: str, params: Optional[Tuple] = None) -> StreamingResponse:
+    """Run query on an unbuffered cursor and stream its rows as NDJSON or CSV"""
+    if fmt not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="format must be ndjson or csv")
+    
+    conn = await db_executor.run(get_db_connection)
+    try:
+        # Read-only snapshot (also refuses writes hidden in e.g. WITH ... DELETE)
+        await db_executor.run(conn.start_transaction, readonly=True)
+        # Unbuffered: rows stay on the server's socket until fetchmany() reads them
+        cursor = conn.cursor(buffered=False)
+        await db_executor.run(cursor.execute, query, params)
+    except Error as e:
+        conn.discard()
+        raise HTTPException(status_code=500, detail=f"Database query failed: {str(e)}")
+    
+    return StreamingResponse(
+        stream_export(conn, cursor, fmt, db_executor.run, EXPORT_CHUNK_ROWS),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'}
+    )
+
+@app.get("/api/export/table/{table_name}")
+async def export_table(table_name: str, fmt: str = Query("csv", alias="format"), columns: Optional[str] = None):
+    """Stream a whole table as NDJSON or CSV in primary key order (?columns=a,b to project)"""
+    if table_name not in BROWSABLE_TABLES:
+        raise HTTPException(status_code=400, detail="Invalid table name")
+    
+    try:
+        schema = await db_executor.run(get_table_schema, table_name)
+    except Error as e:
+        raise HTTPException(status_code=500, detail=f"Database query failed: {str(e)}")
+    
+    selected = [column.strip() for column in columns.split(",") if column.strip()] if columns else schema["names"]
+    unknown = [column for column in selected if column not in schema["names"]]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown columns: {', '.join(unknown)}")
+    
+    query = f"SELECT {', '.join(f'`{column}`' for column in selected)} FROM `{table_name}`"
+    if schema["primary_key"]:
+        query += " ORDER BY " + ", ".join(f"`{column}`" for column in schema["primary_key"])
+    return await start_export(query, fmt, table_name)
+
+@app.get("/api/export/query/{query_number}")
+async def export_analytics_query(query_number: int, fmt: str = Query("csv", alias="format")):
+    """Stream the result of a predefined analytics query (1-25) as NDJSON or CSV"""
+    from sql_queries import get_query
+    
+    query_info = get_query(query_number)
+    if not query_info:
+        raise HTTPException(status_code=404, detail=f"Query {query_number} not found")
+    return await start_export(query_info['query'], fmt, f"query_{query_number}_results")
+
+@app.get("/api/export/sql")
+async def export_sql(query: str, fmt: str = Query("csv", alias="format")):
+    """Stream the result of a read-only custom query (SELECT/SHOW/DESCRIBE/EXPLAIN) as NDJSON or CSV"""
+    if not is_read_only(query):
+        raise HTTPException(status_code=400, detail="Only a single read-only statement can be exported")
+    return await start_export(query.strip().rstrip(";"), fmt, "query_results")
+
+
 
 
 
 
 # Legacy analytics endpoint (keeping for backward compatibility)
 @app.get("/api/analytics/run_query_legacy/{query_number}")
-async def run_analytics_query_legacy(query_number: int):
+@db_executor.offload
+def run_analytics_query_legacy(query_number: int, conn=Depends(get_db)):
     """Run predefined analytics query (1-25) - Legacy version"""
     if query_number < 1 or query_number > 25:
         raise HTTPException(status_code=400, detail="Query number must be between 1 and 25")
@@ -839,7 +1584,6 @@ async def run_analytics_query_legacy(query_number: int):
     }
     
     try:
-        conn = get_db_connection()
         cursor = conn.cursor(dictionary=True)
         
         query = queries[query_number]
@@ -847,7 +1591,6 @@ async def run_analytics_query_legacy(query_number: int):
         results = cursor.fetchall()
         
         cursor.close()
-        conn.close()
         
         return {
             "query_number": query_number,
@@ -860,10 +1603,10 @@ async def run_analytics_query_legacy(query_number: int):
 
 # CRUD endpoints for matches
 @app.get("/api/matches")
-async def get_matches():
+@db_executor.offload
+def get_matches(conn=Depends(get_db)):
     """Get all matches from database"""
     try:
-        conn = get_db_connection()
         cursor = conn.cursor(dictionary=True)
         
         query = """
@@ -880,18 +1623,17 @@ async def get_matches():
         results = cursor.fetchall()
         
         cursor.close()
-        conn.close()
         
-        return results
+        return FastJSONResponse(results)
         
     except Error as e:
         raise HTTPException(status_code=500, detail=f"Database query failed: {str(e)}")
 
 @app.post("/api/matches")
-async def create_match(match_data: Dict[str, Any]):
+@db_executor.offload
+def create_match(match_data: Dict[str, Any], conn=Depends(get_db)):
     """Create a new match"""
     try:
-        conn = get_db_connection()
         cursor = conn.cursor()
         
         query = """
@@ -914,9 +1656,9 @@ async def create_match(match_data: Dict[str, Any]):
             json.dumps(match_data.get('raw_json', {}))
         ))
         
+        bump_table_versions(cursor, ["matches"])
         conn.commit()
         cursor.close()
-        conn.close()
         
         return {"message": "Match created successfully", "match_id": match_data.get('match_id')}
         
@@ -924,10 +1666,10 @@ async def create_match(match_data: Dict[str, Any]):
         raise HTTPException(status_code=500, detail=f"Database insert failed: {str(e)}")
 
 @app.put("/api/matches/{match_id}")
-async def update_match(match_id: str, match_data: Dict[str, Any]):
+@db_executor.offload
+def update_match(match_id: str, match_data: Dict[str, Any], conn=Depends(get_db)):
     """Update a match"""
     try:
-        conn = get_db_connection()
         cursor = conn.cursor()
         
         query = """
@@ -952,9 +1694,11 @@ async def update_match(match_id: str, match_data: Dict[str, Any]):
             match_id
         ))
         
+        # A changed start date moves the match's innings to another summary month
+        refresh_summaries(cursor, [match_id])
+        bump_table_versions(cursor, ["matches", *SUMMARY_TABLES])
         conn.commit()
         cursor.close()
-        conn.close()
         
         return {"message": "Match updated successfully"}
         
@@ -962,18 +1706,18 @@ async def update_match(match_id: str, match_data: Dict[str, Any]):
         raise HTTPException(status_code=500, detail=f"Database update failed: {str(e)}")
 
 @app.delete("/api/matches/{match_id}")
-async def delete_match(match_id: str):
+@db_executor.offload
+def delete_match(match_id: str, conn=Depends(get_db)):
     """Delete a match"""
     try:
-        conn = get_db_connection()
         cursor = conn.cursor()
         
         query = "DELETE FROM matches WHERE match_id = %s"
         cursor.execute(query, (match_id,))
         
+        bump_table_versions(cursor, ["matches"])
         conn.commit()
         cursor.close()
-        conn.close()
         
         return {"message": "Match deleted successfully"}
         
@@ -982,10 +1726,10 @@ async def delete_match(match_id: str):
 
 # CRUD endpoints for players
 @app.get("/api/players")
-async def get_players():
+@db_executor.offload
+def get_players(conn=Depends(get_db)):
     """Get all players from database"""
     try:
-        conn = get_db_connection()
         cursor = conn.cursor(dictionary=True)
         
         query = "SELECT * FROM players ORDER BY name"
@@ -993,7 +1737,6 @@ async def get_players():
         results = cursor.fetchall()
         
         cursor.close()
-        conn.close()
         
         return results
         
@@ -1001,10 +1744,10 @@ async def get_players():
         raise HTTPException(status_code=500, detail=f"Database query failed: {str(e)}")
 
 @app.get("/api/players/{player_id}")
-async def get_player(player_id: str):
+@db_executor.offload
+def get_player(player_id: str, conn=Depends(get_db)):
     """Get a single player by ID"""
     try:
-        conn = get_db_connection()
         cursor = conn.cursor(dictionary=True)
         
         query = "SELECT * FROM players WHERE player_id = %s"
@@ -1012,7 +1755,6 @@ async def get_player(player_id: str):
         result = cursor.fetchone()
         
         cursor.close()
-        conn.close()
         
         if result:
             return result
@@ -1025,10 +1767,10 @@ async def get_player(player_id: str):
         raise HTTPException(status_code=500, detail=f"Database query failed: {str(e)}")
 
 @app.post("/api/players")
-async def create_player(player_data: Dict[str, Any]):
+@db_executor.offload
+def create_player(player_data: Dict[str, Any], conn=Depends(get_db)):
     """Create a new player"""
     try:
-        conn = get_db_connection()
         cursor = conn.cursor()
         
         query = """
@@ -1046,9 +1788,9 @@ async def create_player(player_data: Dict[str, Any]):
             player_data.get('team_id')
         ))
         
+        bump_table_versions(cursor, ["players"])
         conn.commit()
         cursor.close()
-        conn.close()
         
         return {"message": "Player created successfully", "player_id": player_data.get('player_id')}
         
@@ -1056,10 +1798,10 @@ async def create_player(player_data: Dict[str, Any]):
         raise HTTPException(status_code=500, detail=f"Database insert failed: {str(e)}")
 
 @app.put("/api/players/{player_id}")
-async def update_player(player_id: str, player_data: Dict[str, Any]):
+@db_executor.offload
+def update_player(player_id: str, player_data: Dict[str, Any], conn=Depends(get_db)):
     """Update a player"""
     try:
-        conn = get_db_connection()
         cursor = conn.cursor()
         
         query = """
@@ -1078,9 +1820,9 @@ async def update_player(player_id: str, player_data: Dict[str, Any]):
             player_id
         ))
         
+        bump_table_versions(cursor, ["players"])
         conn.commit()
         cursor.close()
-        conn.close()
         
         return {"message": "Player updated successfully"}
         
@@ -1088,18 +1830,18 @@ async def update_player(player_id: str, player_data: Dict[str, Any]):
         raise HTTPException(status_code=500, detail=f"Database update failed: {str(e)}")
 
 @app.delete("/api/players/{player_id}")
-async def delete_player(player_id: str):
+@db_executor.offload
+def delete_player(player_id: str, conn=Depends(get_db)):
     """Delete a player"""
     try:
-        conn = get_db_connection()
         cursor = conn.cursor()
         
         query = "DELETE FROM players WHERE player_id = %s"
         cursor.execute(query, (player_id,))
         
+        bump_table_versions(cursor, ["players"])
         conn.commit()
         cursor.close()
-        conn.close()
         
         return {"message": "Player deleted successfully"}
         
@@ -1112,10 +1854,7 @@ async def search_players(query: str, limit: int = 10):
     """Search players by name with autocomplete functionality"""
     try:
         # Fetch from Cricbuzz API - use the correct search endpoint
-        headers = get_rapidapi_headers()
-        response = requests.get(f"{BASE_URL}stats/v1/player/search", 
-                              headers=headers, 
-                              params={"plrN": query})
+        response = await rapidapi.get("stats/v1/player/search", params={"plrN": query})
         
         if response.status_code == 200:
             api_data = response.json()
@@ -1136,8 +1875,7 @@ async def get_player_info(player_id: str):
     """Get detailed player information"""
     try:
         # Fetch from API - use player info endpoint
-        headers = get_rapidapi_headers()
-        response = requests.get(f"{BASE_URL}stats/v1/player/{player_id}", headers=headers)
+        response = await rapidapi.get(f"stats/v1/player/{player_id}")
         
         if response.status_code == 200:
             player_data = response.json()
@@ -1153,8 +1891,7 @@ async def get_player_batting_stats(player_id: str):
     """Get detailed batting statistics for a player"""
     try:
         # Fetch from API - use batting stats endpoint
-        headers = get_rapidapi_headers()
-        response = requests.get(f"{BASE_URL}stats/v1/player/{player_id}/batting", headers=headers)
+        response = await rapidapi.get(f"stats/v1/player/{player_id}/batting")
         
         if response.status_code == 200:
             batting_data = response.json()
@@ -1170,8 +1907,7 @@ async def get_player_bowling_stats(player_id: str):
     """Get detailed bowling statistics for a player"""
     try:
         # Fetch from API - use bowling stats endpoint
-        headers = get_rapidapi_headers()
-        response = requests.get(f"{BASE_URL}stats/v1/player/{player_id}/bowling", headers=headers)
+        response = await rapidapi.get(f"stats/v1/player/{player_id}/bowling")
         
         if response.status_code == 200:
             bowling_data = response.json()
@@ -1187,8 +1923,7 @@ async def get_player_teams(player_id: str):
     """Get teams played for by a player"""
     try:
         # Fetch from API
-        headers = get_rapidapi_headers()
-        response = requests.get(f"{BASE_URL}stats/v1/player/{player_id}/teams", headers=headers)
+        response = await rapidapi.get(f"stats/v1/player/{player_id}/teams")
         
         if response.status_code == 200:
             teams_data = response.json()
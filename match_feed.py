@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Match Feed - Diff normalized match lists and push the changes to subscribers
+One upstream poll of the live feed is fanned out to every connected viewer.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+
+# Fields that move during a match; anything else changing is sent as a full match
+DELTA_FIELDS = ("matchScore", "state", "status")
+
+
+def index_matches(matches):
+    """Key a normalized match list by matchId"""
+    return {str(match.get("matchId", "")): match for match in matches if match.get("matchId")}
+
+
+def diff_matches(old_matches, new_matches):
+    """Compare two match lists keyed by matchId
+
+    Returns {"added": [match], "changed": [delta], "removed": [matchId]} where
+    each delta holds matchId plus only the DELTA_FIELDS whose values changed.
+    Matches that changed outside DELTA_FIELDS are resent whole under "added".
+    """
+    old = index_matches(old_matches)
+    new = index_matches(new_matches)
+
+    added, changed = [], []
+    for match_id, match in new.items():
+        previous = old.get(match_id)
+        if previous is None:
+            added.append(match)
+            continue
+        if previous == match:
+            continue
+        delta = {field: match.get(field) for field in DELTA_FIELDS if previous.get(field) != match.get(field)}
+        other_fields = set(previous) | set(match)
+        if any(previous.get(field) != match.get(field) for field in other_fields.difference(DELTA_FIELDS)):
+            # Something beyond the score moved (e.g. venue fix-up); resend the whole match
+            added.append(match)
+            continue
+        delta["matchId"] = match_id
+        changed.append(delta)
+
+    removed = [match_id for match_id in old if match_id not in new]
+    return {"added": added, "changed": changed, "removed": removed}
+
+
+def apply_match_changes(matches, changes):
+    """Apply a diff_matches result to a match list and return the updated list"""
+    current = index_matches(matches)
+    for match_id in changes.get("removed", []):
+        current.pop(str(match_id), None)
+    for match in changes.get("added", []):
+        current[str(match.get("matchId", ""))] = match
+    for delta in changes.get("changed", []):
+        match_id = str(delta.get("matchId", ""))
+        if match_id in current:
+            current[match_id] = {**current[match_id], **delta}
+    return list(current.values())
+
+
+def has_changes(changes):
+    """True if a diff contains anything"""
+    return bool(changes["added"] or changes["changed"] or changes["removed"])
+
+
+class LiveBroadcaster:
+    """Fans live-match changes out to subscriber queues
+
+    Call update() with each fresh payload; subscribers receive only the
+    matches that were added, changed or removed since the previous one.
+    """
+
+    def __init__(self, queue_size=32, history_size=32):
+        self.queue_size = queue_size
+        self.matches = None  # last published match list (None until the first payload)
+        # Millisecond timestamps, so an event id from before a restart is never mistaken for a current one
+        self.version = int(time.time() * 1000)
+        self._history = deque(maxlen=history_size)  # (previous version, event) for reconnects (Last-Event-ID)
+        self._subscribers = set()
+
+        # Metrics
+        self.events_published = 0
+        self.slow_subscribers_dropped = 0
+
+    def subscribe(self):
+        """Register a new subscriber and return its event queue"""
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue):
+        """Forget a subscriber (e.g. after the client disconnected)"""
+        self._subscribers.discard(queue)
+
+    def seed(self, data):
+        """Set the baseline without publishing (first payload seen, e.g. from cache)"""
+        if self.matches is None:
+            self.matches = list(data.get("matches", [])) if isinstance(data, dict) else []
+
+    def update(self, data):
+        """Diff a fresh payload against the baseline and publish any changes"""
+        matches = list(data.get("matches", [])) if isinstance(data, dict) else []
+        if self.matches is None:
+            self.matches = matches
+            return None
+
+        changes = diff_matches(self.matches, matches)
+        self.matches = matches
+        if not has_changes(changes):
+            return None
+
+        previous = self.version
+        self.version = max(int(time.time() * 1000), self.version + 1)
+        event = {"version": self.version, **changes}
+        self._history.append((previous, event))
+        self.publish(event)
+        return event
+
+    def events_since(self, version):
+        """Events published after version, oldest first
+
+        None if version is unknown (another process, or aged out of the
+        history): the subscriber needs a full snapshot instead.
+        """
+        if version == self.version:
+            return []
+        history = list(self._history)
+        for position, (previous, _) in enumerate(history):
+            if previous == version:
+                return [event for _, event in history[position:]]
+        return None
+
+    def publish(self, event):
+        """Queue an event for every subscriber, dropping ones that can't keep up"""
+        self.events_published += 1
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Replace its backlog with an end-of-stream marker; the client
+                # reconnects and starts again from a fresh snapshot
+                self._subscribers.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+                self.slow_subscribers_dropped += 1
+
+    def stats(self):
+        """Return broadcast metrics"""
+        return {
+            "subscribers": len(self._subscribers),
+            "version": self.version,
+            "tracked_matches": len(self.matches or []),
+            "events_published": self.events_published,
+            "slow_subscribers_dropped": self.slow_subscribers_dropped,
+        }
+
+
+class SnapshotStore:
+    """Versioned match-list snapshots per cache key for ?since= delta requests
+
+    Versions are millisecond timestamps (strictly increasing), so a version
+    handed out before a restart is simply unknown and gets a full payload.
+    """
+
+    def __init__(self, history_size=16):
+        self.history_size = history_size
+        self._history = {}  # cache_key -> OrderedDict(version -> matches)
+        self._latest = {}  # cache_key -> payload object last recorded
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.delta_responses = 0
+        self.full_responses = 0
+
+    def record(self, cache_key, data):
+        """Register the payload currently served for cache_key and return its version"""
+        with self._lock:
+            history = self._history.setdefault(cache_key, OrderedDict())
+            if history and self._latest.get(cache_key) is data:
+                return next(reversed(history))
+
+            matches = list(data.get("matches", [])) if isinstance(data, dict) else []
+            if history:
+                latest_version, latest_matches = next(reversed(history.items()))
+                if latest_matches == matches:
+                    self._latest[cache_key] = data
+                    return latest_version
+                version = max(int(time.time() * 1000), latest_version + 1)
+            else:
+                version = int(time.time() * 1000)
+
+            history[version] = matches
+            while len(history) > self.history_size:
+                history.popitem(last=False)
+            self._latest[cache_key] = data
+            return version
+
+    def delta(self, cache_key, since):
+        """Changes from version since to the latest snapshot
+
+        Falls back to the full match list ("full": True) when since is unknown
+        or has aged out of the history.
+        """
+        with self._lock:
+            history = self._history.get(cache_key)
+            if not history:
+                return None
+            version, matches = next(reversed(history.items()))
+            base = history.get(since)
+            if base is None:
+                self.full_responses += 1
+                return {"version": version, "since": since, "full": True, "matches": matches}
+            self.delta_responses += 1
+
+        changes = diff_matches(base, matches) if since != version else {"added": [], "changed": [], "removed": []}
+        return {"version": version, "since": since, "full": False, **changes}
+
+    def stats(self):
+        """Return snapshot metrics"""
+        with self._lock:
+            return {
+                "keys": {key: len(history) for key, history in self._history.items()},
+                "delta_responses": self.delta_responses,
+                "full_responses": self.full_responses,
+            }
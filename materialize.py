@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Materialized Summaries - Pre-aggregated batting tables for the heavy analytics queries
+Rebuilt per affected player from match_scorecards + matches, so a populate step
+only re-aggregates the players whose matches it touched.
+"""
+
+from partnerships import PARTNERSHIPS_TABLE, ensure_partnerships_table, refresh_partnerships
+
+# Read by queries 13, 16/19/23/25 and 24 instead of scanning match_scorecards
+PLAYER_SUMMARY_TABLE = "player_batting_summary"
+PARTNERSHIP_SUMMARY_TABLE = "partnership_summary"
+SUMMARY_TABLES = (PARTNERSHIPS_TABLE, PLAYER_SUMMARY_TABLE, PARTNERSHIP_SUMMARY_TABLE)
+
+# IN (...) lists are sent in chunks of this many ids
+ID_CHUNK_SIZE = 500
+
+# One row per player per calendar month of the match start date. Sums and counts
+# (not averages) are stored so months roll up exactly into quarters and years;
+# the qualified_* columns only cover innings of 10+ balls (query 19).
+PLAYER_SUMMARY_DDL = """
+CREATE TABLE IF NOT EXISTS player_batting_summary (
+    player_id INT NOT NULL,
+    match_year SMALLINT NOT NULL,
+    match_quarter TINYINT NOT NULL,
+    match_month TINYINT NOT NULL,
+    matches INT NOT NULL DEFAULT 0,
+    innings INT NOT NULL DEFAULT 0,
+    runs_total BIGINT NOT NULL DEFAULT 0,
+    runs_count INT NOT NULL DEFAULT 0,
+    strike_rate_total DECIMAL(16,2) NOT NULL DEFAULT 0,
+    strike_rate_count INT NOT NULL DEFAULT 0,
+    fifties INT NOT NULL DEFAULT 0,
+    qualified_innings INT NOT NULL DEFAULT 0,
+    qualified_runs_total BIGINT NOT NULL DEFAULT 0,
+    qualified_runs_count INT NOT NULL DEFAULT 0,
+    qualified_runs_squares BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (player_id, match_year, match_month),
+    INDEX idx_period (match_year, match_month)
+)
+"""
+
+# One row per pair of batsmen who batted at adjacent positions (player1_id < player2_id)
+PARTNERSHIP_SUMMARY_DDL = """
+CREATE TABLE IF NOT EXISTS partnership_summary (
+    player1_id INT NOT NULL,
+    player2_id INT NOT NULL,
+    partnerships INT NOT NULL DEFAULT 0,
+    runs_total BIGINT NOT NULL DEFAULT 0,
+    runs_count INT NOT NULL DEFAULT 0,
+    highest_runs INT,
+    fifty_plus INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (player1_id, player2_id),
+    INDEX idx_player2 (player2_id)
+)
+"""
+
+PLAYER_SUMMARY_INSERT = """
+INSERT INTO player_batting_summary (
+    player_id, match_year, match_quarter, match_month, matches, innings,
+    runs_total, runs_count, strike_rate_total, strike_rate_count, fifties,
+    qualified_innings, qualified_runs_total, qualified_runs_count, qualified_runs_squares
+)
+SELECT
+    ms.player_id,
+    YEAR(m.start_datetime),
+    QUARTER(m.start_datetime),
+    MONTH(m.start_datetime),
+    COUNT(DISTINCT ms.match_id),
+    COUNT(ms.innings_id),
+    COALESCE(SUM(ms.runs), 0),
+    COUNT(ms.runs),
+    COALESCE(SUM(ms.strike_rate), 0),
+    COUNT(ms.strike_rate),
+    COALESCE(SUM(ms.runs >= 50), 0),
+    COALESCE(SUM(ms.balls >= 10 AND ms.innings_id IS NOT NULL), 0),
+    COALESCE(SUM(CASE WHEN ms.balls >= 10 THEN ms.runs END), 0),
+    COUNT(CASE WHEN ms.balls >= 10 THEN ms.runs END),
+    COALESCE(SUM(CASE WHEN ms.balls >= 10 THEN ms.runs * ms.runs END), 0)
+FROM match_scorecards ms
+JOIN matches m ON ms.match_id = m.match_id
+WHERE m.start_datetime IS NOT NULL AND ms.player_id IS NOT NULL {player_filter}
+GROUP BY ms.player_id, YEAR(m.start_datetime), QUARTER(m.start_datetime), MONTH(m.start_datetime)
+ON DUPLICATE KEY UPDATE
+    matches = VALUES(matches),
+    innings = VALUES(innings),
+    runs_total = VALUES(runs_total),
+    runs_count = VALUES(runs_count),
+    strike_rate_total = VALUES(strike_rate_total),
+    strike_rate_count = VALUES(strike_rate_count),
+    fifties = VALUES(fifties),
+    qualified_innings = VALUES(qualified_innings),
+    qualified_runs_total = VALUES(qualified_runs_total),
+    qualified_runs_count = VALUES(qualified_runs_count),
+    qualified_runs_squares = VALUES(qualified_runs_squares)
+"""
+
+# A pair is re-aggregated in full whenever either player is affected, so the
+# upsert writes the same values if both players land in different chunks
+PARTNERSHIP_SUMMARY_INSERT = """
+INSERT INTO partnership_summary (player1_id, player2_id, partnerships, runs_total, runs_count, highest_runs, fifty_plus)
+SELECT
+    LEAST(bp.player1_id, bp.player2_id),
+    GREATEST(bp.player1_id, bp.player2_id),
+    COUNT(*),
+    COALESCE(SUM(bp.partnership_runs), 0),
+    COUNT(bp.partnership_runs),
+    MAX(bp.partnership_runs),
+    SUM(CASE WHEN bp.partnership_runs >= 50 THEN 1 ELSE 0 END)
+FROM batting_partnerships bp
+WHERE bp.player1_id <> bp.player2_id {pair_filter}
+GROUP BY LEAST(bp.player1_id, bp.player2_id), GREATEST(bp.player1_id, bp.player2_id)
+ON DUPLICATE KEY UPDATE
+    partnerships = VALUES(partnerships),
+    runs_total = VALUES(runs_total),
+    runs_count = VALUES(runs_count),
+    highest_runs = VALUES(highest_runs),
+    fifty_plus = VALUES(fifty_plus)
+"""
+
+
+def ensure_summary_tables(cursor):
+    """Create the summary tables if needed"""
+    ensure_partnerships_table(cursor)
+    cursor.execute(PLAYER_SUMMARY_DDL)
+    cursor.execute(PARTNERSHIP_SUMMARY_DDL)
+
+
+def needs_rebuild(cursor):
+    """True if there are scorecards but nothing has been materialized yet (e.g. after an import)"""
+    cursor.execute(f"""
+    SELECT EXISTS(SELECT 1 FROM match_scorecards),
+           EXISTS(SELECT 1 FROM {PLAYER_SUMMARY_TABLE}),
+           EXISTS(SELECT 1 FROM {PARTNERSHIPS_TABLE})
+    """)
+    has_scorecards, has_summary, has_partnerships = cursor.fetchone()
+    return bool(has_scorecards) and not (has_summary and has_partnerships)
+
+
+def _chunks(ids):
+    ids = sorted(ids)
+    for start in range(0, len(ids), ID_CHUNK_SIZE):
+        yield ids[start:start + ID_CHUNK_SIZE]
+
+
+def _placeholders(ids):
+    return ", ".join(["%s"] * len(ids))
+
+
+def affected_players(cursor, match_ids):
+    """Players with scorecard rows in any of match_ids"""
+    players = set()
+    for chunk in _chunks(match_ids):
+        cursor.execute(f"""
+        SELECT DISTINCT player_id FROM match_scorecards
+        WHERE match_id IN ({_placeholders(chunk)}) AND player_id IS NOT NULL
+        """, chunk)
+        players.update(player_id for (player_id,) in cursor.fetchall())
+    return players
+
+
+def rebuild_summaries(cursor):
+    """Recompute partnerships and re-aggregate both summary tables from scratch"""
+    refresh_partnerships(cursor)
+    cursor.execute(f"DELETE FROM {PLAYER_SUMMARY_TABLE}")
+    cursor.execute(PLAYER_SUMMARY_INSERT.format(player_filter=""))
+    cursor.execute(f"DELETE FROM {PARTNERSHIP_SUMMARY_TABLE}")
+    cursor.execute(PARTNERSHIP_SUMMARY_INSERT.format(pair_filter=""))
+
+
+def refresh_players(cursor, player_ids):
+    """Re-aggregate every summary row of player_ids (all their months and partners)"""
+    for chunk in _chunks(player_ids):
+        placeholders = _placeholders(chunk)
+        cursor.execute(f"DELETE FROM {PLAYER_SUMMARY_TABLE} WHERE player_id IN ({placeholders})", chunk)
+        cursor.execute(PLAYER_SUMMARY_INSERT.format(player_filter=f"AND ms.player_id IN ({placeholders})"), chunk)
+
+        cursor.execute(f"""
+        DELETE FROM {PARTNERSHIP_SUMMARY_TABLE}
+        WHERE player1_id IN ({placeholders}) OR player2_id IN ({placeholders})
+        """, chunk + chunk)
+        cursor.execute(
+            PARTNERSHIP_SUMMARY_INSERT.format(
+                pair_filter=f"AND (bp.player1_id IN ({placeholders}) OR bp.player2_id IN ({placeholders}))"
+            ),
+            chunk + chunk
+        )
+
+
+def refresh_summaries(cursor, match_ids=None):
+    """Bring the summaries up to date after writes to match_ids (None rebuilds everything)
+
+    Runs inside the caller's transaction; commit together with the writes.
+    Returns the number of players re-aggregated (None for a full rebuild).
+    """
+    if match_ids is None:
+        rebuild_summaries(cursor)
+        return None
+    refresh_partnerships(cursor, match_ids)
+    players = affected_players(cursor, match_ids)
+    refresh_players(cursor, players)
+    return len(players)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+In-Process Cache - LRU/TTL tier holding decoded API payloads in memory
+Sits in front of the MySQL api_cache table so hot keys never touch the database.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Thread-safe LRU cache bounded by total payload bytes and entry count
+
+    Each entry has a soft TTL (fresh until) and a hard TTL (kept until); between
+    the two the entry is stale but still servable while it is revalidated.
+    An optional meta value (e.g. HTTP validators) travels with each entry.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, max_entries=1024):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (value, fresh_until, expires_at, size, meta)
+        self._lock = threading.Lock()
+        self._bytes = 0
+
+        # Metrics
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def lookup(self, key):
+        """Return (value, is_fresh, meta), or None if missing or past its hard TTL"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, fresh_until, expires_at, size, meta = entry
+            now = time.monotonic()
+            if now >= expires_at:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            if now < fresh_until:
+                self.hits += 1
+                return value, True, meta
+            self.stale_hits += 1
+            return value, False, meta
+
+    def get(self, key):
+        """Return the cached value only while it is fresh"""
+        found = self.lookup(key)
+        if found is None or not found[1]:
+            return None
+        return found[0]
+
+    def set(self, key, value, ttl_seconds, size=None, hard_ttl_seconds=None, meta=None):
+        """Store a decoded value; size is the payload's serialized byte length
+
+        ttl_seconds is the soft TTL; hard_ttl_seconds (default: same) bounds
+        how long the value may still be served stale.
+        """
+        if size is None:
+            size = len(json.dumps(value, default=str))
+        if hard_ttl_seconds is None:
+            hard_ttl_seconds = ttl_seconds
+        hard_ttl_seconds = max(hard_ttl_seconds, ttl_seconds)
+        if hard_ttl_seconds <= 0 or size > self.max_bytes:
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, now + ttl_seconds, now + hard_ttl_seconds, size, meta)
+            self._bytes += size
+
+            while self._bytes > self.max_bytes or len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def delete(self, key):
+        """Drop a key if present"""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key):
+        size = self._entries.pop(key)[3]
+        self._bytes -= size
+
+    def stats(self):
+        """Return cache metrics"""
+        with self._lock:
+            served = self.hits + self.stale_hits
+            lookups = served + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "hit_ratio": round(served / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
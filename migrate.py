@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Schema Migrations - Versioned, reversible schema changes kept in migrations/
+Each migrations/NNNN_name.py defines upgrade(cursor) and downgrade(cursor);
+applied versions are recorded in the schema_migrations table.
+
+Usage:
+    python migrate.py status
+    python migrate.py up [--to VERSION] [--timings [--timings-file PATH]]
+    python migrate.py down --to VERSION [--timings [--timings-file PATH]]
+"""
+
+import argparse
+import glob
+import importlib.util
+import json
+import os
+import re
+import sys
+
+import mysql.connector
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+MIGRATION_FILE = re.compile(r"^(\d{4})_(\w+)\.py$")
+
+
+def ensure_migrations_table(cursor):
+    """Create the schema_migrations and schema_migration_indexes tables if needed"""
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INT PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+    # Indexes a migration actually created; only these are dropped on downgrade
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS schema_migration_indexes (
+        table_name VARCHAR(64) NOT NULL,
+        index_name VARCHAR(64) NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (table_name, index_name)
+    )
+    """)
+
+
+def load_migrations():
+    """All migrations in migrations/ as (version, name, module), oldest first"""
+    migrations = []
+    for path in sorted(glob.glob(os.path.join(MIGRATIONS_DIR, "*.py"))):
+        match = MIGRATION_FILE.match(os.path.basename(path))
+        if not match:
+            continue
+        spec = importlib.util.spec_from_file_location(f"migration_{match.group(1)}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        migrations.append((int(match.group(1)), match.group(2), module))
+    return migrations
+
+
+def applied_versions(cursor):
+    cursor.execute("SELECT version FROM schema_migrations")
+    return {version for (version,) in cursor.fetchall()}
+
+
+def table_columns(cursor, table):
+    """Column names of table (empty if it doesn't exist)"""
+    cursor.execute("""
+    SELECT COLUMN_NAME FROM information_schema.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+    """, (table,))
+    return {column for (column,) in cursor.fetchall()}
+
+
+def table_indexes(cursor, table):
+    """Indexes of table as {index_name: (column, ...)}"""
+    cursor.execute("""
+    SELECT INDEX_NAME, COLUMN_NAME FROM information_schema.STATISTICS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+    ORDER BY INDEX_NAME, SEQ_IN_INDEX
+    """, (table,))
+    indexes = {}
+    for index_name, column in cursor.fetchall():
+        indexes.setdefault(index_name, []).append(column)
+    return {name: tuple(columns) for name, columns in indexes.items()}
+
+
+def covering_index(indexes, columns):
+    """Name of an existing index whose leading columns are columns, if any"""
+    columns = tuple(columns)
+    for name, existing in indexes.items():
+        if existing[:len(columns)] == columns:
+            return name
+    return None
+
+
+def create_index(cursor, table, name, columns):
+    """CREATE INDEX unless the table/columns are missing or an equivalent index exists"""
+    missing = set(columns) - table_columns(cursor, table)
+    if missing:
+        print(f"  skip {table}.{name}: missing column(s) {', '.join(sorted(missing))}")
+        return False
+    indexes = table_indexes(cursor, table)
+    existing = name if name in indexes else covering_index(indexes, columns)
+    if existing:
+        print(f"  skip {table}.{name}: covered by {existing}")
+        return False
+    cursor.execute(f"CREATE INDEX {name} ON {table} ({', '.join(columns)})")
+    cursor.execute("INSERT IGNORE INTO schema_migration_indexes (table_name, index_name) VALUES (%s, %s)",
+                   (table, name))
+    print(f"  created {table}.{name} ({', '.join(columns)})")
+    return True
+
+
+def drop_index(cursor, table, name):
+    """DROP INDEX if a migration created it (pre-existing and foreign-key-backing indexes are kept)"""
+    cursor.execute("SELECT 1 FROM schema_migration_indexes WHERE table_name = %s AND index_name = %s",
+                   (table, name))
+    created = cursor.fetchall()
+    if not created or name not in table_indexes(cursor, table):
+        if created:
+            cursor.execute("DELETE FROM schema_migration_indexes WHERE table_name = %s AND index_name = %s",
+                           (table, name))
+        return False
+    try:
+        cursor.execute(f"DROP INDEX {name} ON {table}")
+    except mysql.connector.Error as e:
+        print(f"  kept {table}.{name}: {e}")
+        return False
+    cursor.execute("DELETE FROM schema_migration_indexes WHERE table_name = %s AND index_name = %s", (table, name))
+    print(f"  dropped {table}.{name}")
+    return True
+
+
+def migrate_up(cursor, target=None, reset=False):
+    """Apply pending migrations up to target (default: all)
+
+    reset forgets the recorded versions first, for use right after the
+    tables were dropped and recreated (setup/import); upgrades are idempotent.
+    """
+    ensure_migrations_table(cursor)
+    if reset:
+        cursor.execute("DELETE FROM schema_migrations")
+        cursor.execute("DELETE FROM schema_migration_indexes")
+    applied = applied_versions(cursor)
+    for version, name, module in load_migrations():
+        if version in applied or (target is not None and version > target):
+            continue
+        print(f"Applying migration {version:04d}_{name}")
+        module.upgrade(cursor)
+        cursor.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)", (version, name))
+
+
+def migrate_down(cursor, target):
+    """Revert applied migrations newer than target, newest first"""
+    ensure_migrations_table(cursor)
+    applied = applied_versions(cursor)
+    for version, name, module in reversed(load_migrations()):
+        if version not in applied or version <= target:
+            continue
+        print(f"Reverting migration {version:04d}_{name}")
+        module.downgrade(cursor)
+        cursor.execute("DELETE FROM schema_migrations WHERE version = %s", (version,))
+
+
+def main():
+    from config import DB_CONFIG
+    from index_advisor import time_queries
+    from sql_queries import get_all_queries
+
+    parser = argparse.ArgumentParser(description="Apply or revert schema migrations")
+    parser.add_argument("command", choices=["status", "up", "down"])
+    parser.add_argument("--to", type=int, dest="target", help="Target version (required for down; 0 reverts all)")
+    parser.add_argument("--timings", action="store_true",
+                        help="Time the analytics queries before and after the change")
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs per query for --timings")
+    parser.add_argument("--timings-file", metavar="PATH",
+                        help="Also write the --timings results as JSON (e.g. benchmarks/migration_timings.json)")
+    args = parser.parse_args()
+
+    if args.command == "down" and args.target is None:
+        parser.error("down requires --to VERSION")
+
+    connection = mysql.connector.connect(**DB_CONFIG)
+    cursor = connection.cursor()
+    ensure_migrations_table(cursor)
+
+    if args.command == "status":
+        applied = applied_versions(cursor)
+        for version, name, _ in load_migrations():
+            print(f"{'[x]' if version in applied else '[ ]'} {version:04d}_{name}")
+        return 0
+
+    queries = get_all_queries()
+    before = time_queries(cursor, queries, args.runs) if args.timings else None
+
+    if args.command == "up":
+        migrate_up(cursor, args.target)
+    else:
+        migrate_down(cursor, args.target)
+    connection.commit()
+
+    if before is not None:
+        after = time_queries(cursor, queries, args.runs)
+        print(f"\n{'#':>3} {'before ms':>10} {'after ms':>10} {'speedup':>8}  title")
+        for number in sorted(queries):
+            speedup = before[number] / after[number] if after[number] else 0
+            print(f"{number:>3} {before[number]:>10.2f} {after[number]:>10.2f} {speedup:>7.2f}x  "
+                  f"{queries[number]['title']}")
+        if args.timings_file:
+            report = {
+                "command": args.command,
+                "target": args.target,
+                "applied": sorted(applied_versions(cursor)),
+                "runs": args.runs,
+                "queries": {
+                    str(number): {"title": queries[number]['title'], "before_ms": round(before[number], 3),
+                                  "after_ms": round(after[number], 3)}
+                    for number in sorted(queries)
+                },
+            }
+            with open(args.timings_file, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+            print(f"\nTimings written to {args.timings_file}")
+
+    cursor.close()
+    connection.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+"""
+Composite and covering indexes for the analytics queries (proposed by index_advisor.py)
+"""
+
+from migrate import create_index, drop_index
+
+# (table, index name, columns); skipped when a column is missing or an index
+# with the same leading columns already exists, and then left alone by downgrade
+INDEXES = [
+    # Queries 5/10/12/22: winner_id IS NOT NULL, 22 adds a start_datetime range, 10 orders by it
+    ("matches", "idx_matches_winner_start", ("winner_id", "start_datetime")),
+    # Query 2: start_datetime range ordered by start_datetime (the populate schema has no date index)
+    ("matches", "idx_matches_start", ("start_datetime",)),
+    # Query 17: covering - grouped by toss_decision, compares winner_id with toss_winner_id
+    ("matches", "idx_matches_toss", ("toss_decision", "winner_id", "toss_winner_id")),
+    # Queries 6/9/14: role filters and GROUP BY role
+    ("players", "idx_players_role", ("role",)),
+    # Queries 11/20: GROUP BY (player_id, format) when player_stats has a surrogate key
+    ("player_stats", "idx_player_stats_player_format", ("player_id", "format")),
+    # Query 3: format = 'ODI' AND runs > 0 ORDER BY runs DESC LIMIT 10
+    ("player_stats", "idx_player_stats_format_runs", ("format", "runs")),
+    # Query 8: year = '2024' ORDER BY start_date
+    ("series", "idx_series_year_start", ("year", "start_date")),
+    # Partnership pass: ORDER BY match_id, innings_id, batting_position
+    ("match_scorecards", "idx_scorecards_innings_position", ("match_id", "innings_id", "batting_position")),
+]
+
+
+def upgrade(cursor):
+    for table, name, columns in INDEXES:
+        create_index(cursor, table, name, columns)
+
+
+def downgrade(cursor):
+    for table, name, _ in reversed(INDEXES):
+        drop_index(cursor, table, name)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Batting Partnerships - Adjacent-position partnerships derived in one ordered pass per innings
+Replaces the match_scorecards self-join (quadratic per innings) with a linear scan.
+"""
+
+PARTNERSHIPS_TABLE = "batting_partnerships"
+
+# IN (...) lists are sent in chunks of this many match ids
+MATCH_CHUNK_SIZE = 200
+
+# One row per pair of batsmen at consecutive batting positions in an innings;
+# player1 is the one at the lower position. The key is a surrogate: scorecards
+# can list a batsman twice in an innings (the bundled backup does), and the
+# self-join this replaces counted each such pair every time.
+PARTNERSHIPS_DDL = """
+CREATE TABLE IF NOT EXISTS batting_partnerships (
+    partnership_id BIGINT NOT NULL AUTO_INCREMENT,
+    match_id INT NOT NULL,
+    innings_id INT NOT NULL,
+    batting_position INT NOT NULL,
+    player1_id INT NOT NULL,
+    player2_id INT NOT NULL,
+    player1_runs INT,
+    player2_runs INT,
+    partnership_runs INT,
+    PRIMARY KEY (partnership_id),
+    INDEX idx_match_innings (match_id, innings_id),
+    INDEX idx_partnership_runs (partnership_runs),
+    INDEX idx_player1 (player1_id),
+    INDEX idx_player2 (player2_id)
+)
+"""
+
+SCORECARD_ROWS_QUERY = """
+SELECT match_id, innings_id, batting_position, player_id, runs
+FROM match_scorecards
+WHERE innings_id IS NOT NULL AND batting_position IS NOT NULL AND player_id IS NOT NULL {match_filter}
+ORDER BY match_id, innings_id, batting_position, player_id
+"""
+
+PARTNERSHIP_INSERT = """
+INSERT INTO batting_partnerships (
+    match_id, innings_id, batting_position, player1_id, player2_id,
+    player1_runs, player2_runs, partnership_runs
+)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+
+def ensure_partnerships_table(cursor):
+    """Create the batting_partnerships table if needed
+
+    A table from before the surrogate key is dropped first; it only holds
+    derived rows, and an empty table is rebuilt by the next refresh.
+    """
+    cursor.execute("""
+    SELECT COLUMN_NAME FROM information_schema.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+    """, (PARTNERSHIPS_TABLE,))
+    columns = {column for (column,) in cursor.fetchall()}
+    if columns and "partnership_id" not in columns:
+        cursor.execute(f"DROP TABLE {PARTNERSHIPS_TABLE}")
+    cursor.execute(PARTNERSHIPS_DDL)
+
+
+def _partnership(first, second):
+    match_id, innings_id, position, player1_id, runs1 = first
+    player2_id, runs2 = second[3], second[4]
+    total = None if runs1 is None or runs2 is None else runs1 + runs2
+    return (match_id, innings_id, position, player1_id, player2_id, runs1, runs2, total)
+
+
+def compute_partnerships(rows):
+    """Yield partnership rows from scorecard rows sorted by (match_id, innings_id, batting_position)
+
+    rows are (match_id, innings_id, batting_position, player_id, runs) tuples.
+    Pairs the same rows as the self-join on ABS(position difference) = 1,
+    each once; batsmen sharing a position are each paired with every batsman
+    one position up.
+    """
+    innings = None
+    previous = []  # rows at the position before the current one
+    current = []   # rows at the current position
+    for row in rows:
+        if (row[0], row[1]) != innings:
+            innings, previous, current = (row[0], row[1]), [], [row]
+            continue
+        if row[2] != current[0][2]:
+            previous, current = current, []
+        current.append(row)
+        if previous and row[2] - previous[0][2] == 1:
+            for partner in previous:
+                yield _partnership(partner, row)
+
+
+def _store(cursor, match_filter="", params=()):
+    cursor.execute(SCORECARD_ROWS_QUERY.format(match_filter=match_filter), params)
+    partnerships = list(compute_partnerships(cursor.fetchall()))
+    if partnerships:
+        cursor.executemany(PARTNERSHIP_INSERT, partnerships)
+    return len(partnerships)
+
+
+def refresh_partnerships(cursor, match_ids=None):
+    """Recompute the partnerships of match_ids (None recomputes every match)
+
+    Runs inside the caller's transaction. Returns the number of partnerships written.
+    """
+    if match_ids is None:
+        cursor.execute(f"DELETE FROM {PARTNERSHIPS_TABLE}")
+        return _store(cursor)
+
+    written = 0
+    match_ids = sorted(match_ids)
+    for start in range(0, len(match_ids), MATCH_CHUNK_SIZE):
+        chunk = match_ids[start:start + MATCH_CHUNK_SIZE]
+        placeholders = ", ".join(["%s"] * len(chunk))
+        cursor.execute(f"DELETE FROM {PARTNERSHIPS_TABLE} WHERE match_id IN ({placeholders})", chunk)
+        written += _store(cursor, f"AND match_id IN ({placeholders})", chunk)
+    return written
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Query Result Cache - Analytics results kept until a table they read changes
+Entries are tagged with the table_versions they were computed against.
+"""
+
+import threading
+import time
+
+# Queries whose result depends on the clock as well as on the data
+TIME_FUNCTIONS = ("NOW()", "CURDATE()", "CURRENT_DATE", "CURRENT_TIMESTAMP", "SYSDATE()")
+
+
+def is_time_dependent(query):
+    """True if the query's result changes with the current date/time"""
+    upper = query.upper()
+    return any(function in upper for function in TIME_FUNCTIONS)
+
+
+class QueryResultCache:
+    """Result rows per query number, valid while the dependency versions match
+
+    Time-dependent queries (NOW(), CURDATE()...) additionally expire after
+    time_dependent_max_age seconds.
+    """
+
+    def __init__(self, max_age_seconds=86400, time_dependent_max_age=3600):
+        self.max_age_seconds = max_age_seconds
+        self.time_dependent_max_age = time_dependent_max_age
+        self._entries = {}  # query_number -> (versions, stored_at, max_age, columns, rows)
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, query_number, versions):
+        """Return (columns, rows) if cached against exactly these versions"""
+        with self._lock:
+            entry = self._entries.get(query_number)
+            if entry is None:
+                self.misses += 1
+                return None
+            cached_versions, stored_at, max_age, columns, rows = entry
+            if cached_versions != versions:
+                del self._entries[query_number]
+                self.invalidations += 1
+                self.misses += 1
+                return None
+            if time.monotonic() - stored_at > max_age:
+                del self._entries[query_number]
+                self.misses += 1
+                return None
+            self.hits += 1
+            return columns, rows
+
+    def set(self, query_number, versions, columns, rows, query=""):
+        """Store a result computed against versions"""
+        max_age = self.time_dependent_max_age if is_time_dependent(query) else self.max_age_seconds
+        with self._lock:
+            self._entries[query_number] = (dict(versions), time.monotonic(), max_age, list(columns), rows)
+
+    def clear(self):
+        """Drop every cached result"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return cache metrics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "cached_rows": sum(len(entry[4]) for entry in self._entries.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
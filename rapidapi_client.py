@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+RapidAPI Client - Shared async HTTP client for Cricbuzz endpoints
+Keeps connections alive across requests, uses HTTP/2 when the h2 package is
+installed and retries transient failures with jittered exponential backoff.
+"""
+
+import asyncio
+import random
+
+import httpx
+
+try:
+    import h2  # noqa: F401 - only needed so httpx can negotiate HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Responses worth retrying; 429 is left alone because RapidAPI uses it for quota exhaustion
+RETRY_STATUS_CODES = {500, 502, 503, 504}
+
+
+class RapidAPIClient:
+    """Lazily created httpx.AsyncClient shared by every route that calls RapidAPI"""
+
+    def __init__(self, base_url, headers, max_connections=20, max_keepalive_connections=10,
+                 keepalive_expiry=30.0, connect_timeout=5.0, read_timeout=15.0,
+                 max_retries=3, backoff_base=0.5, backoff_max=8.0, on_request=None):
+        self.base_url = base_url
+        self.headers = headers
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.on_request = on_request  # Called for every request sent (retries included), e.g. a quota counter
+        self._client = None
+
+        # Metrics
+        self.requests_sent = 0
+        self.retries = 0
+        self.failures = 0
+
+    @property
+    def client(self):
+        """The underlying httpx client, created on first use inside the event loop"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.headers,
+                http2=HTTP2_AVAILABLE,
+                limits=self.limits,
+                timeout=self.timeout,
+            )
+        return self._client
+
+    def _backoff(self, attempt):
+        """Full-jitter exponential backoff delay for the given retry attempt"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def get(self, endpoint, params=None):
+        """GET an endpoint relative to base_url, retrying transient errors"""
+        attempt = 0
+        while True:
+            try:
+                self.requests_sent += 1
+                if self.on_request is not None:
+                    self.on_request()
+                response = await self.client.get(endpoint, params=params)
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                    return response
+            except httpx.TransportError:
+                if attempt >= self.max_retries:
+                    self.failures += 1
+                    raise
+            self.retries += 1
+            await asyncio.sleep(self._backoff(attempt))
+            attempt += 1
+
+    async def aclose(self):
+        """Close pooled connections (called on application shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self):
+        """Return client metrics"""
+        return {
+            "http2": HTTP2_AVAILABLE,
+            "max_connections": self.limits.max_connections,
+            "requests_sent": self.requests_sent,
+            "retries": self.retries,
+            "failures": self.failures,
+        }
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Refresh Scheduler - Proactively re-fetch hot RapidAPI endpoints before they go stale
+Runs inside the FastAPI lifespan so user requests almost always hit a warm cache.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+
+
+class QuotaBudget:
+    """Sliding-window count of upstream API calls shared by users and the scheduler"""
+
+    def __init__(self, max_calls=100, window_seconds=3600):
+        self.max_calls = max_calls
+        self.window_seconds = window_seconds
+        self._calls = deque()
+        self._lock = threading.Lock()
+
+    def _trim(self, now):
+        while self._calls and now - self._calls[0] >= self.window_seconds:
+            self._calls.popleft()
+
+    def record(self):
+        """Count one upstream call"""
+        with self._lock:
+            now = time.monotonic()
+            self._trim(now)
+            self._calls.append(now)
+
+    def remaining(self):
+        """Calls left in the current window"""
+        with self._lock:
+            self._trim(time.monotonic())
+            return max(0, self.max_calls - len(self._calls))
+
+    def stats(self):
+        """Return budget metrics"""
+        return {
+            "max_calls": self.max_calls,
+            "window_seconds": self.window_seconds,
+            "remaining": self.remaining(),
+        }
+
+
+class RefreshJob:
+    """One cache key kept warm by the scheduler"""
+
+    def __init__(self, cache_key, endpoint, ttl_seconds, hard_ttl_seconds=None, priority=10):
+        self.cache_key = cache_key
+        self.endpoint = endpoint
+        self.ttl_seconds = ttl_seconds
+        self.hard_ttl_seconds = hard_ttl_seconds
+        self.priority = priority  # lower runs first
+        self.base_priority = priority
+        self.next_run = 0.0
+        self.idle_polls = 0  # consecutive refreshes that found nothing worth polling for
+        self.refreshes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.skipped_for_budget = 0
+
+
+class RefreshScheduler:
+    """Runs due RefreshJobs in priority order while the quota budget allows
+
+    refresh_func(job) performs the fetch and returns the new payload; it must
+    raise on an upstream failure (quota exceeded included) so the job backs off.
+    peek_func(job) returns seconds until the cached entry goes stale (None if
+    absent) so a restart doesn't re-fetch keys that are still fresh.
+    interval_func(job, data) may return a custom delay until the next run,
+    which is how the live feed speeds up or backs off.
+    """
+
+    def __init__(self, jobs, refresh_func, budget, peek_func=None, interval_func=None,
+                 refresh_ahead=0.8, reserve_calls=10, tick_seconds=5.0):
+        self.jobs = {job.cache_key: job for job in jobs}
+        self.refresh_func = refresh_func
+        self.peek_func = peek_func
+        self.interval_func = interval_func
+        self.budget = budget
+        self.refresh_ahead = refresh_ahead
+        self.reserve_calls = reserve_calls  # left for on-demand user requests
+        self.tick_seconds = tick_seconds
+        self._task = None
+        self._wakeup = asyncio.Event()
+
+    def _default_delay(self, job):
+        """Refresh shortly before the soft TTL, with jitter so keys don't align"""
+        return job.ttl_seconds * self.refresh_ahead * random.uniform(0.95, 1.0)
+
+    async def _initial_schedule(self):
+        now = time.monotonic()
+        for job in self.jobs.values():
+            remaining = None
+            if self.peek_func is not None:
+                try:
+                    remaining = await self.peek_func(job)
+                except Exception as e:
+                    print(f"Scheduler peek failed for {job.cache_key}: {e}")
+            if remaining is None:
+                job.next_run = now
+            else:
+                lead = job.ttl_seconds * (1 - self.refresh_ahead)
+                job.next_run = now + max(0.0, remaining - lead)
+
+    async def run_job(self, job):
+        """Refresh one job now and schedule its next run"""
+        try:
+            data = await self.refresh_func(job)
+            job.refreshes += 1
+            job.consecutive_failures = 0
+        except Exception as e:
+            job.failures += 1
+            job.consecutive_failures += 1
+            print(f"Scheduled refresh failed for {job.cache_key}: {e}")
+            # Back off up to the hard TTL: the stale entry is served until then,
+            # and a short soft TTL (the live feed's) would otherwise keep the
+            # retries on a fixed, fast cadence
+            retry_in = 60 * (2 ** min(job.consecutive_failures - 1, 5))
+            job.next_run = time.monotonic() + min(max(job.ttl_seconds, job.hard_ttl_seconds or 0), retry_in)
+            return
+
+        delay = None
+        if self.interval_func is not None:
+            delay = self.interval_func(job, data)
+        if delay is None:
+            delay = self._default_delay(job)
+        job.next_run = time.monotonic() + delay
+
+    async def _loop(self):
+        await self._initial_schedule()
+        while True:
+            now = time.monotonic()
+            due = sorted(
+                (job for job in self.jobs.values() if job.next_run <= now),
+                key=lambda job: (job.priority, job.next_run),
+            )
+            for job in due:
+                if self.budget.remaining() <= self.reserve_calls:
+                    # Out of budget: try again later, keep the rest for user requests
+                    job.skipped_for_budget += 1
+                    job.next_run = now + self.tick_seconds * 6
+                    continue
+                await self.run_job(job)
+
+            upcoming = [job.next_run for job in self.jobs.values()]
+            sleep_for = min(upcoming) - time.monotonic() if upcoming else self.tick_seconds
+            sleep_for = min(max(sleep_for, 0.5), self.tick_seconds * 12)
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=sleep_for)
+            except asyncio.TimeoutError:
+                pass
+
+    def wake(self):
+        """Re-evaluate schedules immediately (after a job's next_run was changed)"""
+        self._wakeup.set()
+
+    def start(self):
+        """Start the scheduler task on the running event loop"""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._loop())
+
+    async def stop(self):
+        """Cancel the scheduler task"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self):
+        """Return per-job scheduling metrics"""
+        now = time.monotonic()
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "budget": self.budget.stats(),
+            "jobs": {
+                job.cache_key: {
+                    "endpoint": job.endpoint,
+                    "priority": job.priority,
+                    "next_run_in_seconds": round(max(0.0, job.next_run - now), 1),
+                    "refreshes": job.refreshes,
+                    "failures": job.failures,
+                    "skipped_for_budget": job.skipped_for_budget,
+                }
+                for job in self.jobs.values()
+            },
+        }
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Response Archive - Raw RapidAPI responses kept on disk for offline rebuilds
+Bodies are stored gzip-compressed under the SHA-256 of their content, so an
+unchanged response fetched again costs one index line, not another copy.
+index.jsonl records every fetch as endpoint, params, fetch time and digest.
+
+Usage:
+    python response_archive.py stats
+    python response_archive.py list [--endpoint /matches/v1/recent]
+    python response_archive.py prune --days 30
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+import threading
+from datetime import datetime, timedelta
+
+DEFAULT_ARCHIVE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "response_archive")
+INDEX_FILE = "index.jsonl"
+
+
+def request_key(endpoint, params=None):
+    """Stable key for an endpoint and its query params"""
+    return f"{endpoint}?{json.dumps(params or {}, sort_keys=True, separators=(',', ':'))}"
+
+
+class ResponseArchive:
+    """Content-addressed store of response bodies plus an append-only fetch index (thread-safe)"""
+
+    def __init__(self, directory=DEFAULT_ARCHIVE_DIR):
+        self.directory = directory
+        self.index_path = os.path.join(directory, INDEX_FILE)
+        self._lock = threading.Lock()
+        self._index = None  # request key -> [(fetched_at, digest), ...] oldest first
+
+    def _object_path(self, digest):
+        return os.path.join(self.directory, "objects", digest[:2], f"{digest}.json.gz")
+
+    def _load_index(self):
+        if self._index is not None:
+            return self._index
+        self._index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    key = request_key(entry["endpoint"], entry["params"])
+                    self._index.setdefault(key, []).append((entry["fetched_at"], entry["sha256"]))
+            for fetches in self._index.values():
+                fetches.sort()
+        return self._index
+
+    def store(self, endpoint, params, body, fetched_at=None):
+        """Archive one raw response body (bytes) and return its digest"""
+        digest = hashlib.sha256(body).hexdigest()
+        fetched_at = fetched_at or datetime.now().isoformat(timespec="seconds")
+        path = self._object_path(digest)
+        with self._lock:
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                temporary = f"{path}.{threading.get_ident()}.tmp"
+                with open(temporary, "wb") as f:
+                    f.write(gzip.compress(body, mtime=0))
+                os.replace(temporary, path)
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"endpoint": endpoint, "params": params or {},
+                                    "fetched_at": fetched_at, "sha256": digest}) + "\n")
+            # Writing only appends; the index is parsed when something is read
+            if self._index is not None:
+                fetches = self._index.setdefault(request_key(endpoint, params), [])
+                fetches.append((fetched_at, digest))
+                fetches.sort()
+        return digest
+
+    def lookup(self, endpoint, params=None, as_of=None):
+        """(fetched_at, digest) of the latest fetch at or before as_of (ISO time), or None"""
+        with self._lock:
+            fetches = self._load_index().get(request_key(endpoint, params), [])
+            if as_of:
+                fetches = [fetch for fetch in fetches if fetch[0] <= as_of]
+            return fetches[-1] if fetches else None
+
+    def read(self, digest):
+        """Raw body bytes of an archived response"""
+        with gzip.open(self._object_path(digest), "rb") as f:
+            return f.read()
+
+    def load(self, endpoint, params=None, as_of=None):
+        """Parsed JSON of the archived response for the request, or None if it was never fetched"""
+        fetch = self.lookup(endpoint, params, as_of)
+        if fetch is None:
+            return None
+        try:
+            return json.loads(self.read(fetch[1]))
+        except (OSError, ValueError) as e:
+            print(f"Archived response {fetch[1][:12]} for {endpoint} is unreadable: {e}")
+            return None
+
+    def prune(self, older_than):
+        """Forget fetches before older_than (ISO time), keeping each request's latest one
+
+        Rewrites the index and deletes bodies no remaining fetch refers to.
+        Returns (fetches removed, bodies removed).
+        """
+        if not os.path.exists(self.index_path):
+            return 0, 0
+        with self._lock:
+            self._index = None
+            index = self._load_index()
+            kept = {key: [fetch for fetch in fetches[:-1] if fetch[0] >= older_than] + fetches[-1:]
+                    for key, fetches in index.items()}
+            removed_fetches = sum(len(fetches) for fetches in index.values()) - sum(map(len, kept.values()))
+
+            with open(self.index_path, encoding="utf-8") as f:
+                entries = [json.loads(line) for line in f if line.strip()]
+            keep = {(key, fetch) for key, fetches in kept.items() for fetch in fetches}
+            temporary = f"{self.index_path}.tmp"
+            with open(temporary, "w", encoding="utf-8") as f:
+                for entry in entries:
+                    fetch = (entry["fetched_at"], entry["sha256"])
+                    if (request_key(entry["endpoint"], entry["params"]), fetch) in keep:
+                        f.write(json.dumps(entry) + "\n")
+            os.replace(temporary, self.index_path)
+            self._index = kept
+
+            referenced = {digest for fetches in kept.values() for _, digest in fetches}
+            removed_bodies = 0
+            for digest in {digest for fetches in index.values() for _, digest in fetches} - referenced:
+                try:
+                    os.remove(self._object_path(digest))
+                    removed_bodies += 1
+                except FileNotFoundError:
+                    pass
+        return removed_fetches, removed_bodies
+
+    def stats(self):
+        """Requests, fetches, stored bodies and their compressed size"""
+        with self._lock:
+            index = self._load_index()
+            digests = {digest for fetches in index.values() for _, digest in fetches}
+        stored_bytes = sum(os.path.getsize(self._object_path(digest)) for digest in digests
+                           if os.path.exists(self._object_path(digest)))
+        return {
+            "requests": len(index),
+            "fetches": sum(len(fetches) for fetches in index.values()),
+            "objects": len(digests),
+            "stored_bytes": stored_bytes,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the raw RapidAPI response archive")
+    parser.add_argument("command", choices=["stats", "list", "prune"])
+    parser.add_argument("--directory", default=DEFAULT_ARCHIVE_DIR)
+    parser.add_argument("--endpoint", help="Only list requests to this endpoint")
+    parser.add_argument("--days", type=int, default=30,
+                        help="prune: drop fetches older than this many days (each request keeps its latest)")
+    args = parser.parse_args()
+
+    archive = ResponseArchive(args.directory)
+    if args.command == "prune":
+        older_than = (datetime.now() - timedelta(days=args.days)).isoformat(timespec="seconds")
+        fetches, bodies = archive.prune(older_than)
+        print(f"Removed {fetches} fetches and {bodies} stored bodies older than {older_than}")
+        return 0
+    if args.command == "stats":
+        stats = archive.stats()
+        print(f"{stats['requests']} requests, {stats['fetches']} fetches, "
+              f"{stats['objects']} stored bodies ({stats['stored_bytes'] / 1024:.1f} KB compressed)")
+        return 0
+
+    for key, fetches in sorted(archive._load_index().items()):
+        if args.endpoint and not key.startswith(f"{args.endpoint}?"):
+            continue
+        print(f"{key}  {len(fetches)} fetch(es), latest {fetches[-1][0]} {fetches[-1][1][:12]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
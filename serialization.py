@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Serialization - Pluggable JSON backend for API responses and cache blobs
+Uses orjson when it is installed and falls back to the stdlib json module.
+"""
+
+import datetime
+import decimal
+import json
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _default(obj):
+    """Encode the non-JSON types MySQL rows contain the way FastAPI's encoder does"""
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, datetime.timedelta):
+        return obj.total_seconds()
+    if isinstance(obj, (bytes, bytearray)):
+        return obj.decode("utf-8", errors="replace")
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class StdlibBackend:
+    """json module backend (always available)"""
+
+    name = "json"
+
+    def dumps(self, obj, sort_keys=False):
+        return json.dumps(obj, default=_default, sort_keys=sort_keys, ensure_ascii=False,
+                          separators=(",", ":")).encode("utf-8")
+
+    def loads(self, data):
+        return json.loads(data)
+
+
+class OrjsonBackend:
+    """orjson backend: serializes straight to bytes, several times faster on large row lists"""
+
+    name = "orjson"
+
+    def dumps(self, obj, sort_keys=False):
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=_default, option=option)
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+
+BACKENDS = {"json": StdlibBackend}
+if ORJSON_AVAILABLE:
+    BACKENDS["orjson"] = OrjsonBackend
+
+_backend = OrjsonBackend() if ORJSON_AVAILABLE else StdlibBackend()
+
+
+def set_backend(name):
+    """Select the JSON backend by name ("orjson" or "json")"""
+    global _backend
+    if name not in BACKENDS:
+        print(f"JSON backend '{name}' is not available, keeping {_backend.name}")
+        return
+    _backend = BACKENDS[name]()
+
+
+def backend_name():
+    """Name of the active JSON backend"""
+    return _backend.name
+
+
+def dumps_bytes(obj, sort_keys=False):
+    """Serialize obj to compact UTF-8 JSON bytes"""
+    return _backend.dumps(obj, sort_keys=sort_keys)
+
+
+def dumps(obj, sort_keys=False):
+    """Serialize obj to a compact JSON string (for TEXT columns)"""
+    return _backend.dumps(obj, sort_keys=sort_keys).decode("utf-8")
+
+
+def loads(data):
+    """Parse JSON from str or bytes"""
+    return _backend.loads(data)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Single-Flight - Coalesce concurrent async calls for the same key into one
+"""
+
+import asyncio
+
+
+class SingleFlight:
+    """Runs at most one in-flight call per key; concurrent callers share its result"""
+
+    def __init__(self):
+        self._inflight = {}  # key -> asyncio.Task
+
+        # Metrics
+        self.leaders = 0
+        self.coalesced_waiters = 0
+
+    async def do(self, key, func):
+        """Await func() for key, joining an already running call if there is one
+
+        The shared call runs as its own task, so a caller that disconnects
+        (and is cancelled) does not cancel the fetch the other waiters need.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda finished: self._finish(key, finished))
+            self.leaders += 1
+        else:
+            self.coalesced_waiters += 1
+        return await asyncio.shield(task)
+
+    def in_flight(self, key):
+        """True while a call for key is running"""
+        return key in self._inflight
+
+    def after(self, key, callback):
+        """Call callback() once the in-flight call for key has finished (now if there is none)
+
+        Callbacks run after the key is released, so they may start a new call for it.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            callback()
+        else:
+            task.add_done_callback(lambda finished: callback())
+
+    def _finish(self, key, task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved in case every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self):
+        """Return coalescing metrics"""
+        return {
+            "leaders": self.leaders,
+            "coalesced_waiters": self.coalesced_waiters,
+            "in_flight": len(self._inflight),
+        }
@@ -4,12 +4,13 @@ Corrected SQL Queries - Match original questions exactly
 """
 
 def get_all_queries():
-    """Get all 25 corrected SQL queries"""
+    """Get all 25 corrected SQL queries ("tables" lists what each one reads, for result caching)"""
     return {
         1: {
             "title": "Indian Players with Roles and Styles",
             "description": "Find all players who represent India. Display their full name, playing role, batting style, and bowling style.",
             "category": "Beginner",
+            "tables": ["players", "teams"],
             "query": """
                 SELECT 
                     p.name AS 'Full Name',
@@ -26,6 +27,7 @@ def get_all_queries():
             "title": "Recent Matches with Venue Details",
             "description": "Show all cricket matches that were played in the last few days. Include the match description, both team names, venue name with city, and the match date. Sort by most recent matches first.",
             "category": "Beginner",
+            "tables": ["matches", "teams", "venues"],
             "query": """
                 SELECT 
                     m.match_desc AS 'Match Description',
@@ -46,6 +48,7 @@ def get_all_queries():
             "title": "Top 10 ODI Run Scorers",
             "description": "List the top 10 highest run scorers in ODI cricket. Show player name, total runs scored, batting average, and number of centuries. Display the highest run scorer first.",
             "category": "Beginner",
+            "tables": ["player_stats", "players"],
             "query": """
                 SELECT 
                     p.name AS 'Player Name',
@@ -63,6 +66,7 @@ def get_all_queries():
             "title": "High-Capacity Venues",
             "description": "Display all cricket venues that have a seating capacity of more than 30,000 spectators. Show venue name, city, country, and capacity. Order by largest capacity first.",
             "category": "Beginner",
+            "tables": ["venues"],
             "query": """
                 SELECT 
                     v.name AS 'Venue Name',
@@ -78,6 +82,7 @@ def get_all_queries():
             "title": "Team Win Counts",
             "description": "Calculate how many matches each team has won. Show team name and total number of wins. Display teams with the most wins first.",
             "category": "Beginner",
+            "tables": ["matches", "teams"],
             "query": """
                 SELECT 
                     t.name AS 'Team Name',
@@ -93,6 +98,7 @@ def get_all_queries():
             "title": "Player Role Distribution",
             "description": "Count how many players belong to each playing role (like Batsman, Bowler, All-rounder, Wicket-keeper). Show the role and count of players for each role.",
             "category": "Beginner",
+            "tables": ["players"],
             "query": """
                 SELECT 
                     p.role AS 'Playing Role',
@@ -107,6 +113,7 @@ def get_all_queries():
             "title": "Highest Scores by Format",
             "description": "Find the highest individual batting score achieved in each cricket format (Test, ODI, T20I). Display the format and the highest score for that format.",
             "category": "Beginner",
+            "tables": ["player_stats"],
             "query": """
                 SELECT 
                     ps.format AS 'Cricket Format',
@@ -121,6 +128,7 @@ def get_all_queries():
             "title": "2024 Cricket Series",
             "description": "Show all cricket series that started in the year 2024. Include series name, host country, match type, start date, and total number of matches planned.",
             "category": "Beginner",
+            "tables": ["series"],
             "query": """
                 SELECT 
                     s.name AS 'Series Name',
@@ -137,6 +145,7 @@ def get_all_queries():
             "title": "All-Rounder Players",
             "description": "Find all-rounder players who have scored more than 1000 runs AND taken more than 50 wickets in their career. Display player name, total runs, total wickets, and the cricket format.",
             "category": "Intermediate",
+            "tables": ["player_stats", "players"],
             "query": """
                 SELECT 
                     p.name AS 'Player Name',
@@ -155,6 +164,7 @@ def get_all_queries():
             "title": "Recent Completed Matches",
             "description": "Get details of the last 20 completed matches. Show match description, both team names, winning team, victory margin, victory type (runs/wickets), and venue name. Display most recent matches first.",
             "category": "Intermediate",
+            "tables": ["matches", "teams", "venues"],
             "query": """
                 SELECT 
                     m.match_desc AS 'Match Description',
@@ -186,6 +196,7 @@ def get_all_queries():
             "title": "Multi-Format Player Performance",
             "description": "Compare each player's performance across different cricket formats. For players who have played at least 2 different formats, show their total runs in Test cricket, ODI cricket, and T20I cricket, along with their overall batting average across all formats.",
             "category": "Intermediate",
+            "tables": ["player_stats", "players"],
             "query": """
                 SELECT 
                     p.name AS 'Player Name',
@@ -205,6 +216,7 @@ def get_all_queries():
             "title": "Home vs Away Performance",
             "description": "Analyze each international team's performance when playing at home versus playing away. Determine whether each team played at home or away based on whether the venue country matches the team's country. Count wins for each team in both home and away conditions.",
             "category": "Intermediate",
+            "tables": ["matches", "teams", "venues"],
             "query": """
                 SELECT 
                     t.name AS 'Team Name',
@@ -229,26 +241,25 @@ def get_all_queries():
             "title": "Batting Partnerships",
             "description": "Identify batting partnerships where two consecutive batsmen (batting positions next to each other) scored a combined total of 100 or more runs in the same innings. Show both player names, their combined partnership runs, and which innings it occurred in.",
             "category": "Intermediate",
+            "tables": ["batting_partnerships", "players"],
             "query": """
                 SELECT 
                     p1.name AS 'Batsman 1 Name',
                     p2.name AS 'Batsman 2 Name',
-                    (ms1.runs + ms2.runs) AS 'Combined Partnership Runs',
-                    ms1.innings_id AS 'Which Innings It Occurred In'
-                FROM match_scorecards ms1
-                JOIN match_scorecards ms2 ON ms1.match_id = ms2.match_id 
-                    AND ms1.innings_id = ms2.innings_id
-                    AND ABS(ms1.batting_position - ms2.batting_position) = 1
-                JOIN players p1 ON ms1.player_id = p1.player_id
-                JOIN players p2 ON ms2.player_id = p2.player_id
-                WHERE (ms1.runs + ms2.runs) >= 100
-                ORDER BY (ms1.runs + ms2.runs) DESC;
+                    bp.partnership_runs AS 'Combined Partnership Runs',
+                    bp.innings_id AS 'Which Innings It Occurred In'
+                FROM batting_partnerships bp
+                JOIN players p1 ON bp.player1_id = p1.player_id
+                JOIN players p2 ON bp.player2_id = p2.player_id
+                WHERE bp.partnership_runs >= 100
+                ORDER BY bp.partnership_runs DESC;
             """
         },
         14: {
             "title": "Venue Bowling Performance",
             "description": "Examine bowling performance at different venues. For bowlers who have played at least 3 matches at the same venue, calculate their average economy rate, total wickets taken, and number of matches played at each venue. Focus on bowlers who bowled at least 4 overs in each match.",
             "category": "Intermediate",
+            "tables": ["matches", "player_stats", "players", "venues"],
             "query": """
                 SELECT 
                     p.name AS 'Bowler Name',
@@ -270,6 +281,7 @@ def get_all_queries():
             "title": "Close Match Performance",
             "description": "Identify players who perform exceptionally well in close matches. A close match is defined as one decided by less than 50 runs OR less than 5 wickets. For these close matches, calculate each player's average runs scored, total close matches played, and how many of those close matches their team won when they batted.",
             "category": "Intermediate",
+            "tables": ["match_scorecards", "matches", "players"],
             "query": """
                 SELECT 
                     p.name AS 'Player Name',
@@ -305,26 +317,27 @@ def get_all_queries():
             "title": "Yearly Performance Trends",
             "description": "Track how players' batting performance changes over different years. For matches since 2020, show each player's average runs per match and average strike rate for each year. Only include players who played at least 5 matches in that year.",
             "category": "Intermediate",
+            "tables": ["player_batting_summary", "players"],
             "query": """
                 SELECT 
                     p.name AS 'Player Name',
-                    YEAR(m.start_datetime) AS 'Year',
-                    COUNT(DISTINCT m.match_id) AS 'Matches Played',
-                    AVG(ms.runs) AS 'Average Runs per Match',
-                    AVG(ms.strike_rate) AS 'Average Strike Rate for Each Year'
-                FROM matches m
-                JOIN match_scorecards ms ON m.match_id = ms.match_id
-                JOIN players p ON ms.player_id = p.player_id
-                WHERE YEAR(m.start_datetime) >= 2020
-                GROUP BY p.player_id, p.name, YEAR(m.start_datetime)
-                HAVING COUNT(DISTINCT m.match_id) >= 3
-                ORDER BY p.name, YEAR(m.start_datetime);
+                    s.match_year AS 'Year',
+                    SUM(s.matches) AS 'Matches Played',
+                    SUM(s.runs_total) / SUM(s.runs_count) AS 'Average Runs per Match',
+                    SUM(s.strike_rate_total) / SUM(s.strike_rate_count) AS 'Average Strike Rate for Each Year'
+                FROM player_batting_summary s
+                JOIN players p ON s.player_id = p.player_id
+                WHERE s.match_year >= 2020
+                GROUP BY p.player_id, p.name, s.match_year
+                HAVING SUM(s.matches) >= 3
+                ORDER BY p.name, s.match_year;
             """
         },
         17: {
             "title": "Toss Advantage Analysis",
             "description": "Investigate whether winning the toss gives teams an advantage in winning matches. Calculate what percentage of matches are won by the team that wins the toss, broken down by their toss decision (choosing to bat first or bowl first).",
             "category": "Advanced",
+            "tables": ["matches"],
             "query": """
                 SELECT 
                     m.toss_decision AS 'Toss Decision',
@@ -341,6 +354,7 @@ def get_all_queries():
             "title": "Most Economical Bowlers",
             "description": "Find the most economical bowlers in limited-overs cricket (ODI and T20 formats). Calculate each bowler's overall economy rate and total wickets taken. Only consider bowlers who have bowled in at least 10 matches and bowled at least 2 overs per match on average.",
             "category": "Advanced",
+            "tables": ["player_stats", "players"],
             "query": """
                 SELECT 
                     p.name AS 'Bowler Name',
@@ -362,27 +376,30 @@ def get_all_queries():
             "title": "Consistent Batsmen Analysis",
             "description": "Determine which batsmen are most consistent in their scoring. Calculate the average runs scored and the standard deviation of runs for each player. Only include players who have faced at least 10 balls per innings and played since 2022. A lower standard deviation indicates more consistent performance.",
             "category": "Advanced",
+            "tables": ["player_batting_summary", "players"],
             "query": """
                 SELECT 
                     p.name AS 'Player Name',
-                    COUNT(ms.innings_id) AS 'Innings',
-                    AVG(ms.runs) AS 'Average Runs Scored',
-                    STDDEV(ms.runs) AS 'Standard Deviation of Runs',
-                    ROUND(STDDEV(ms.runs) / AVG(ms.runs), 2) AS 'Consistency Ratio'
-                FROM match_scorecards ms
-                JOIN players p ON ms.player_id = p.player_id
-                JOIN matches m ON ms.match_id = m.match_id
-                WHERE ms.balls >= 10 
-                  AND YEAR(m.start_datetime) >= 2022
+                    SUM(s.qualified_innings) AS 'Innings',
+                    SUM(s.qualified_runs_total) / SUM(s.qualified_runs_count) AS 'Average Runs Scored',
+                    SQRT(GREATEST(SUM(s.qualified_runs_squares) * 1e0 / SUM(s.qualified_runs_count)
+                        - POW(SUM(s.qualified_runs_total) * 1e0 / SUM(s.qualified_runs_count), 2), 0)) AS 'Standard Deviation of Runs',
+                    ROUND(SQRT(GREATEST(SUM(s.qualified_runs_squares) * 1e0 / SUM(s.qualified_runs_count)
+                        - POW(SUM(s.qualified_runs_total) * 1e0 / SUM(s.qualified_runs_count), 2), 0))
+                        / (SUM(s.qualified_runs_total) / SUM(s.qualified_runs_count)), 2) AS 'Consistency Ratio'
+                FROM player_batting_summary s
+                JOIN players p ON s.player_id = p.player_id
+                WHERE s.match_year >= 2022
                 GROUP BY p.player_id, p.name
-                HAVING COUNT(ms.innings_id) >= 5
-                ORDER BY STDDEV(ms.runs) / AVG(ms.runs) ASC;
+                HAVING SUM(s.qualified_innings) >= 5
+                ORDER BY `Consistency Ratio` ASC;
             """
         },
         20: {
             "title": "Format-wise Performance Analysis",
             "description": "Analyze how many matches each player has played in different cricket formats and their batting average in each format. Show the count of Test matches, ODI matches, and T20 matches for each player, along with their respective batting averages. Only include players who have played at least 20 total matches across all formats.",
             "category": "Advanced",
+            "tables": ["player_stats", "players"],
             "query": """
                 SELECT 
                     p.name AS 'Player Name',
@@ -404,6 +421,7 @@ def get_all_queries():
             "title": "Comprehensive Performance Ranking",
             "description": "Create a comprehensive performance ranking system for players. Combine their batting performance (runs scored, batting average, strike rate), bowling performance (wickets taken, bowling average, economy rate), and fielding performance (catches, stumpings) into a single weighted score.",
             "category": "Advanced",
+            "tables": ["player_stats", "players"],
             "query": """
                 SELECT 
                     p.name AS 'Player Name',
@@ -433,6 +451,7 @@ def get_all_queries():
             "title": "Head-to-Head Match Analysis",
             "description": "Build a head-to-head match prediction analysis between teams. For each pair of teams that have played at least 5 matches against each other in the last 3 years, calculate total matches played between them, wins for each team, and overall win percentage for each team in this head-to-head record.",
             "category": "Advanced",
+            "tables": ["matches", "teams"],
             "query": """
                 SELECT 
                     t1.name AS 'Team 1',
@@ -456,72 +475,68 @@ def get_all_queries():
             "title": "Recent Form Analysis",
             "description": "Analyze recent player form and momentum. For each player's last 10 batting performances, calculate average runs in their last 5 matches vs their last 10 matches, recent strike rate trends, and number of scores above 50 in recent matches.",
             "category": "Advanced",
+            "tables": ["player_batting_summary", "players"],
             "query": """
                 SELECT 
                     p.name AS 'Player Name',
-                    COUNT(ms.innings_id) AS 'Recent Innings',
-                    AVG(ms.runs) AS 'Average Runs',
-                    AVG(ms.strike_rate) AS 'Average Strike Rate',
-                    SUM(CASE WHEN ms.runs >= 50 THEN 1 ELSE 0 END) AS 'Scores Above 50',
-                    ROUND((SUM(CASE WHEN ms.runs >= 50 THEN 1 ELSE 0 END) * 100.0 / COUNT(ms.innings_id)), 2) AS '50+ Score Percentage'
-                FROM match_scorecards ms
-                JOIN players p ON ms.player_id = p.player_id
-                JOIN matches m ON ms.match_id = m.match_id
-                WHERE m.start_datetime >= DATE_SUB(NOW(), INTERVAL 6 MONTH)
+                    SUM(s.innings) AS 'Recent Innings',
+                    SUM(s.runs_total) / SUM(s.runs_count) AS 'Average Runs',
+                    SUM(s.strike_rate_total) / SUM(s.strike_rate_count) AS 'Average Strike Rate',
+                    SUM(s.fifties) AS 'Scores Above 50',
+                    ROUND((SUM(s.fifties) * 100.0 / SUM(s.innings)), 2) AS '50+ Score Percentage'
+                FROM player_batting_summary s
+                JOIN players p ON s.player_id = p.player_id
+                WHERE s.match_year * 100 + s.match_month >= EXTRACT(YEAR_MONTH FROM DATE_SUB(NOW(), INTERVAL 6 MONTH))
                 GROUP BY p.player_id, p.name
-                HAVING COUNT(ms.innings_id) >= 5
-                ORDER BY AVG(ms.runs) DESC;
+                HAVING SUM(s.innings) >= 5
+                ORDER BY `Average Runs` DESC;
             """
         },
         24: {
             "title": "Successful Batting Partnerships",
             "description": "Study successful batting partnerships to identify the best player combinations. For pairs of players who have batted together as consecutive batsmen (positions differ by 1) in at least 5 partnerships, calculate their average partnership runs, count how many of their partnerships exceeded 50 runs, and find their highest partnership score.",
             "category": "Advanced",
+            "tables": ["partnership_summary", "players"],
             "query": """
                 SELECT 
                     p1.name AS 'Batsman 1',
                     p2.name AS 'Batsman 2',
-                    COUNT(*) AS 'Partnerships',
-                    AVG(ms1.runs + ms2.runs) AS 'Average Partnership Runs',
-                    MAX(ms1.runs + ms2.runs) AS 'Highest Partnership Score',
-                    SUM(CASE WHEN (ms1.runs + ms2.runs) >= 50 THEN 1 ELSE 0 END) AS 'Partnerships Exceeded 50 Runs',
-                    ROUND((SUM(CASE WHEN (ms1.runs + ms2.runs) >= 50 THEN 1 ELSE 0 END) * 100.0 / COUNT(*)), 2) AS 'Success Rate %'
-                FROM match_scorecards ms1
-                JOIN match_scorecards ms2 ON ms1.match_id = ms2.match_id 
-                    AND ms1.innings_id = ms2.innings_id
-                    AND ABS(ms1.batting_position - ms2.batting_position) = 1
-                JOIN players p1 ON ms1.player_id = p1.player_id
-                JOIN players p2 ON ms2.player_id = p2.player_id
-                WHERE p1.player_id < p2.player_id  -- Avoid duplicates
-                GROUP BY p1.player_id, p1.name, p2.player_id, p2.name
-                HAVING COUNT(*) >= 5
-                ORDER BY AVG(ms1.runs + ms2.runs) DESC;
+                    ps.partnerships AS 'Partnerships',
+                    ps.runs_total / ps.runs_count AS 'Average Partnership Runs',
+                    ps.highest_runs AS 'Highest Partnership Score',
+                    ps.fifty_plus AS 'Partnerships Exceeded 50 Runs',
+                    ROUND((ps.fifty_plus * 100.0 / ps.partnerships), 2) AS 'Success Rate %'
+                FROM partnership_summary ps
+                JOIN players p1 ON ps.player1_id = p1.player_id
+                JOIN players p2 ON ps.player2_id = p2.player_id
+                WHERE ps.partnerships >= 5
+                ORDER BY ps.runs_total / ps.runs_count DESC;
             """
         },
         25: {
             "title": "Player Performance Evolution",
             "description": "Perform a time-series analysis of player performance evolution. Track how each player's batting performance changes over time by calculating quarterly averages for runs and strike rate, and determining overall career trajectory over the last few years.",
             "category": "Advanced",
+            "tables": ["player_batting_summary", "players"],
             "query": """
                 SELECT 
                     p.name AS 'Player Name',
-                    YEAR(m.start_datetime) AS 'Year',
-                    QUARTER(m.start_datetime) AS 'Quarter',
-                    COUNT(ms.innings_id) AS 'Innings',
-                    AVG(ms.runs) AS 'Average Runs',
-                    AVG(ms.strike_rate) AS 'Average Strike Rate',
+                    s.match_year AS 'Year',
+                    s.match_quarter AS 'Quarter',
+                    SUM(s.innings) AS 'Innings',
+                    SUM(s.runs_total) / SUM(s.runs_count) AS 'Average Runs',
+                    SUM(s.strike_rate_total) / SUM(s.strike_rate_count) AS 'Average Strike Rate',
                     CASE 
-                        WHEN AVG(ms.runs) > LAG(AVG(ms.runs)) OVER (PARTITION BY p.player_id ORDER BY YEAR(m.start_datetime), QUARTER(m.start_datetime)) THEN 'Career Ascending'
-                        WHEN AVG(ms.runs) < LAG(AVG(ms.runs)) OVER (PARTITION BY p.player_id ORDER BY YEAR(m.start_datetime), QUARTER(m.start_datetime)) THEN 'Career Declining'
+                        WHEN SUM(s.runs_total) / SUM(s.runs_count) > LAG(SUM(s.runs_total) / SUM(s.runs_count)) OVER (PARTITION BY p.player_id ORDER BY s.match_year, s.match_quarter) THEN 'Career Ascending'
+                        WHEN SUM(s.runs_total) / SUM(s.runs_count) < LAG(SUM(s.runs_total) / SUM(s.runs_count)) OVER (PARTITION BY p.player_id ORDER BY s.match_year, s.match_quarter) THEN 'Career Declining'
                         ELSE 'Career Stable'
                     END AS 'Performance Category'
-                FROM match_scorecards ms
-                JOIN players p ON ms.player_id = p.player_id
-                JOIN matches m ON ms.match_id = m.match_id
-                WHERE m.start_datetime >= DATE_SUB(NOW(), INTERVAL 2 YEAR)
-                GROUP BY p.player_id, p.name, YEAR(m.start_datetime), QUARTER(m.start_datetime)
-                HAVING COUNT(ms.innings_id) >= 3
-                ORDER BY p.name, YEAR(m.start_datetime), QUARTER(m.start_datetime);
+                FROM player_batting_summary s
+                JOIN players p ON s.player_id = p.player_id
+                WHERE s.match_year * 100 + s.match_month >= EXTRACT(YEAR_MONTH FROM DATE_SUB(NOW(), INTERVAL 2 YEAR))
+                GROUP BY p.player_id, p.name, s.match_year, s.match_quarter
+                HAVING SUM(s.innings) >= 3
+                ORDER BY p.name, s.match_year, s.match_quarter;
             """
         }
     }
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Streaming Export - NDJSON/CSV row streams read from an unbuffered cursor in chunks
+Memory stays at one chunk of rows however large the result set is.
+"""
+
+import csv
+import io
+
+import serialization
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# Statements that produce a result set and never modify data
+READ_ONLY_PREFIXES = ("SELECT", "WITH", "SHOW", "DESCRIBE", "DESC", "EXPLAIN")
+
+
+def is_read_only(query):
+    """True for statements safe to export (SELECT / SHOW / DESCRIBE / EXPLAIN)"""
+    stripped = query.strip().rstrip(";").strip()
+    return bool(stripped) and ";" not in stripped and stripped.upper().startswith(READ_ONLY_PREFIXES)
+
+
+def encode_ndjson(columns, rows):
+    """One JSON object per row, newline-terminated"""
+    return b"".join(serialization.dumps_bytes(dict(zip(columns, row))) + b"\n" for row in rows)
+
+
+def encode_csv(rows, header=None):
+    """CSV lines for rows (optionally preceded by a header line)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header is not None:
+        writer.writerow(header)
+    writer.writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+async def stream_export(conn, cursor, fmt, run, chunk_rows=5000):
+    """Yield the cursor's result set as NDJSON or CSV, chunk_rows rows at a time
+
+    cursor must be unbuffered and already executed; run(func, *args) runs the
+    blocking fetches off the event loop. If the client goes away before the
+    last row, the connection still has unread rows on its socket, so it is
+    discarded rather than returned to the pool.
+    """
+    columns = [description[0] for description in cursor.description]
+    finished = False
+    try:
+        if fmt == "csv":
+            yield encode_csv([], header=columns)
+        while True:
+            rows = await run(cursor.fetchmany, chunk_rows)
+            if not rows:
+                break
+            yield encode_ndjson(columns, rows) if fmt == "ndjson" else encode_csv(rows)
+        finished = True
+    finally:
+        if finished:
+            cursor.close()
+            conn.close()
+        else:
+            conn.discard()
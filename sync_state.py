@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Sync State - Watermarks for incremental population runs
+Records what a previous run already fetched for good (completed matches'
+scorecards and toss, finished series) so the next run only asks the API
+for what is new or still changing. Watermarks are per-item sets, never
+date high-water marks: a match that overruns its scheduled end must still
+be picked up when it completes.
+"""
+
+# Entities tracked in sync_state
+SCORECARDS = "scorecards"  # item per match_id whose final scorecard is stored
+TOSS = "toss"              # item per match_id whose toss details were fetched
+SERIES = "series"          # item per series_id whose matches were all archived
+
+
+def ensure_sync_state(cursor):
+    """Create the sync_state table if needed"""
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS sync_state (
+        entity VARCHAR(64) NOT NULL,
+        item VARCHAR(64) NOT NULL,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        PRIMARY KEY (entity, item)
+    )
+    """)
+
+
+def synced_items(cursor, entity):
+    """Items of entity already synced, as strings"""
+    cursor.execute("SELECT item FROM sync_state WHERE entity = %s", (entity,))
+    return {item for (item,) in cursor.fetchall()}
+
+
+def mark_synced(cursor, entity, items):
+    """Record items of entity as synced"""
+    rows = sorted({(entity, str(item)) for item in items})
+    if rows:
+        cursor.executemany("INSERT IGNORE INTO sync_state (entity, item) VALUES (%s, %s)", rows)
+
+
+def clear_sync_state(cursor):
+    """Forget every watermark (the tables were dropped and recreated)"""
+    cursor.execute("DELETE FROM sync_state")
+
+
+def seed_sync_state(cursor):
+    """Reset the watermarks from the data already in the tables (after an import)
+
+    Completed matches that have scorecard rows count as synced; everything
+    else is fetched by the next incremental run.
+    """
+    clear_sync_state(cursor)
+    cursor.execute(f"""
+    INSERT IGNORE INTO sync_state (entity, item)
+    SELECT DISTINCT '{SCORECARDS}', CAST(s.match_id AS CHAR)
+    FROM match_scorecards s
+    JOIN matches m ON m.match_id = s.match_id
+    WHERE m.winner_id IS NOT NULL
+    """)
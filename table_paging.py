@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Table Paging - Keyset pagination, column projection and indexed sorting for table browsing
+Each page is one index range scan, no matter how deep into the table it is.
+"""
+
+import base64
+import threading
+
+import serialization
+
+_schema_cache = {}
+_schema_lock = threading.Lock()
+
+
+class PagingError(ValueError):
+    """Invalid paging request (unknown column, unsortable column, bad cursor)"""
+
+
+def load_table_schema(cursor, table_name):
+    """Columns, primary key and sortable (index-leading) columns of a table
+
+    cursor must be a dictionary cursor. Results are cached per table for the
+    life of the process.
+    """
+    with _schema_lock:
+        if table_name in _schema_cache:
+            return _schema_cache[table_name]
+
+    cursor.execute(f"DESCRIBE `{table_name}`")
+    columns = cursor.fetchall()
+
+    cursor.execute("""
+    SELECT INDEX_NAME, COLUMN_NAME, SEQ_IN_INDEX
+    FROM information_schema.STATISTICS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+    ORDER BY INDEX_NAME, SEQ_IN_INDEX
+    """, (table_name,))
+    index_rows = cursor.fetchall()
+
+    primary_key = [row['COLUMN_NAME'] for row in index_rows if row['INDEX_NAME'] == 'PRIMARY']
+    sortable = [row['COLUMN_NAME'] for row in index_rows if row['SEQ_IN_INDEX'] == 1]
+
+    schema = {
+        "columns": columns,
+        "names": [column['Field'] for column in columns],
+        "nullable": {column['Field'] for column in columns if column['Null'] == 'YES'},
+        "primary_key": primary_key,
+        "sortable": list(dict.fromkeys(sortable)),
+    }
+    with _schema_lock:
+        _schema_cache[table_name] = schema
+    return schema
+
+
+def forget_table_schema(table_name=None):
+    """Drop cached schema (after a migration changes columns or indexes)"""
+    with _schema_lock:
+        if table_name is None:
+            _schema_cache.clear()
+        else:
+            _schema_cache.pop(table_name, None)
+
+
+def encode_cursor(values):
+    """Opaque, URL-safe cursor for the last row of a page"""
+    return base64.urlsafe_b64encode(serialization.dumps_bytes(values)).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor_token):
+    """Inverse of encode_cursor"""
+    try:
+        padded = cursor_token + "=" * (-len(cursor_token) % 4)
+        values = serialization.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError):
+        raise PagingError("Invalid cursor")
+    if not isinstance(values, list):
+        raise PagingError("Invalid cursor")
+    return values
+
+
+def _quote(column):
+    return f"`{column}`"
+
+
+def _keyset_condition(sort_column, sort_nullable, primary_key, last_values, descending):
+    """WHERE clause selecting rows after last_values in (sort_column, primary key) order
+
+    MySQL sorts NULLs first ascending and last descending, which the
+    nullable branches below mirror.
+    """
+    op = "<" if descending else ">"
+    pk_row = "(" + ", ".join(_quote(column) for column in primary_key) + ")"
+    pk_params = ", ".join(["%s"] * len(primary_key))
+
+    if sort_column is None:
+        if len(last_values) != len(primary_key):
+            raise PagingError("Invalid cursor")
+        return f"{pk_row} {op} ({pk_params})", list(last_values)
+
+    if len(last_values) != len(primary_key) + 1:
+        raise PagingError("Invalid cursor")
+    last_sort, last_pk = last_values[0], list(last_values[1:])
+    sort_col = _quote(sort_column)
+
+    if last_sort is None:
+        clause = f"({sort_col} IS NULL AND {pk_row} {op} ({pk_params}))"
+        if not descending:
+            clause = f"({clause} OR {sort_col} IS NOT NULL)"
+        return clause, last_pk
+
+    clause = f"({sort_col} {op} %s OR ({sort_col} = %s AND {pk_row} {op} ({pk_params}))"
+    if descending and sort_nullable:
+        clause += f" OR {sort_col} IS NULL"
+    return clause + ")", [last_sort, last_sort] + last_pk
+
+
+def build_page_query(table_name, schema, columns=None, sort=None, descending=False,
+                     cursor_token=None, limit=100):
+    """SQL and params for one keyset page (fetch limit + 1 rows to detect more)
+
+    Returns (query, params, selected_columns). Primary key columns (and the
+    sort column) are always selected because the next cursor is built from them.
+    """
+    primary_key = schema["primary_key"]
+    if not primary_key:
+        raise PagingError(f"Table {table_name} has no primary key to page on")
+
+    if columns:
+        unknown = [column for column in columns if column not in schema["names"]]
+        if unknown:
+            raise PagingError(f"Unknown columns: {', '.join(unknown)}")
+    else:
+        columns = list(schema["names"])
+
+    if sort is not None and sort not in schema["sortable"]:
+        raise PagingError(f"Can only sort on indexed columns: {', '.join(schema['sortable'])}")
+    if sort in primary_key[:1]:
+        sort = None  # primary key order already
+
+    selected = list(dict.fromkeys(columns + ([sort] if sort else []) + primary_key))
+    order_columns = ([sort] if sort else []) + primary_key
+    direction = " DESC" if descending else ""
+
+    query = f"SELECT {', '.join(_quote(column) for column in selected)} FROM `{table_name}`"
+    params = []
+    if cursor_token:
+        condition, params = _keyset_condition(sort, sort in schema["nullable"], primary_key,
+                                              decode_cursor(cursor_token), descending)
+        query += f" WHERE {condition}"
+    query += " ORDER BY " + ", ".join(_quote(column) + direction for column in order_columns)
+    query += " LIMIT %s"
+    params.append(limit + 1)
+    return query, params, selected
+
+
+def next_cursor(row, schema, sort=None):
+    """Cursor continuing after row"""
+    primary_key = schema["primary_key"]
+    if sort in primary_key[:1]:
+        sort = None
+    values = ([row[sort]] if sort else []) + [row[column] for column in primary_key]
+    return encode_cursor(values)
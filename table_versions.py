@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Table Versions - Per-table change counters used to invalidate cached query results
+Writers bump the tables they modified in the same transaction as their writes.
+"""
+
+# Bumped by writes whose target tables are unknown (custom SQL, imports); every reader depends on it
+ALL_TABLES = "*"
+
+
+def ensure_table_versions(cursor):
+    """Create the table_versions table if needed"""
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS table_versions (
+        table_name VARCHAR(64) PRIMARY KEY,
+        version BIGINT NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    )
+    """)
+
+
+def bump_table_versions(cursor, tables):
+    """Increment the version of each table (call before committing the writes)"""
+    tables = sorted(set(tables))  # fixed lock order across writers
+    if not tables:
+        return
+    cursor.executemany("""
+    INSERT INTO table_versions (table_name, version) VALUES (%s, 1)
+    ON DUPLICATE KEY UPDATE version = version + 1
+    """, [(table,) for table in tables])
+
+
+def get_table_versions(cursor, tables):
+    """Current versions of tables (plus ALL_TABLES); missing rows count as 0
+
+    cursor must return tuples (not a dictionary cursor).
+    """
+    names = sorted(set(tables) | {ALL_TABLES})
+    placeholders = ", ".join(["%s"] * len(names))
+    cursor.execute(
+        f"SELECT table_name, version FROM table_versions WHERE table_name IN ({placeholders})",
+        names
+    )
+    versions = {name: 0 for name in names}
+    for table_name, version in cursor.fetchall():
+        versions[table_name] = version
+    return versions